@@ -68,6 +68,9 @@ __all__ = (
 
 T = TypeVar("T", bound=VoiceProtocol)
 
+# Maximum number of (channel, member) permissions cached by a guild
+PERMISSIONS_CACHE_SIZE = 4096
+
 if TYPE_CHECKING:
     from datetime import datetime
 
@@ -693,7 +696,37 @@ class GuildChannel:
         :class:`~discord.Permissions`
             The resolved permissions for the member or role.
         """
+        if isinstance(obj, Role):
+            return self._resolve_permissions(obj)
+
+        # Resolved member permissions are cached by the guild until roles change.
+        # Changes of the channel's overwrites or of the member's roles and timeout
+        # replace the objects below, which makes the cached entry outdated.
+        cache = getattr(self.guild, "_permissions_cache", None)
+        if cache is None:
+            return self._resolve_permissions(obj)
+
+        key = (self.id, obj.id)
+        overwrites = self._overwrites
+        roles = obj._roles
+        disabled_until = obj.communication_disabled_until
+        entry = cache.get(key)
+        if (
+            entry is not None
+            and entry[0] is overwrites
+            and entry[1] is roles
+            and entry[2] == disabled_until
+        ):
+            return Permissions(entry[3])
+
+        base = self._resolve_permissions(obj)
+        if len(cache) >= PERMISSIONS_CACHE_SIZE:
+            cache.clear()
+
+        cache[key] = (overwrites, roles, disabled_until, base.value)
+        return base
 
+    def _resolve_permissions(self, obj: Member | Role, /) -> Permissions:
         # The current cases can be explained as:
         # Guild owner get all permissions -- no questions asked. Otherwise...
         # The @everyone role gets the first application.
@@ -963,7 +996,7 @@ class GuildChannel:
         obj = cls(state=self._state, guild=self.guild, data=data)
 
         # temporarily add it to the cache
-        self.guild._channels[obj.id] = obj  # type: ignore
+        self.guild._add_channel(obj)  # type: ignore
         return obj
 
     async def clone(
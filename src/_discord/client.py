@@ -156,6 +156,24 @@ class Client:
         currently selected intents.
 
         .. versionadded:: 1.5
+    joined_member_ttl: Optional[:class:`float`]
+        If given, members that join a guild are cached for this many seconds,
+        regardless of ``member_cache_flags``. Members expire after
+        ``joined_member_ttl`` seconds and are then removed from the cache by a
+        timer (the client's own member is kept). Useful for keeping only the
+        recently joined members cached, when combined with
+        :meth:`MemberCacheFlags.none`.
+    dispatch_allowlist: Optional[Iterable[:class:`str`]]
+        Names of gateway events (e.g. ``"MESSAGE_CREATE"``) that are parsed and dispatched.
+        Other events are skipped right after being received, without updating the cache or
+        building any models, and are only counted in :attr:`ConnectionState.skipped_events`.
+        ``READY``, ``RESUMED``, ``GUILD_CREATE`` and ``GUILD_DELETE`` are always parsed.
+        Defaults to ``None`` (all events are parsed).
+    lazy_guilds: :class:`bool`
+        Whether channels, threads and members received with a guild are only
+        built into objects when first accessed. This makes connecting to many
+        large guilds faster and avoids building objects that are never used.
+        Defaults to ``False``.
     chunk_guilds_at_startup: :class:`bool`
         Indicates if :func:`.on_ready` should be delayed to chunk all guilds
         at start-up if necessary. This operation is incredibly slow for large
@@ -235,7 +253,10 @@ class Client:
             loop=self.loop,
         )
 
-        self._handlers: dict[str, Callable] = {"ready": self._handle_ready}
+        self._handlers: dict[str, Callable] = {
+            "ready": self._handle_ready,
+            "resumed": self._handle_ready,
+        }
 
         self._hooks: dict[str, Callable] = {
             "before_identify": self._call_before_identify_hook
@@ -302,6 +323,21 @@ class Client:
         ws = self.ws
         return float("nan") if not ws else ws.latency
 
+    @property
+    def session(self) -> dict[str, Any] | None:
+        """The gateway session of the connection, which can be passed to :meth:`connect`
+        to resume it. ``None`` if no session was established yet.
+        """
+        ws = self.ws
+        if ws is None or ws.session_id is None or ws.resume_gateway_url is None:
+            return None
+
+        return {
+            "session_id": ws.session_id,
+            "sequence": ws.sequence,
+            "resume_gateway_url": ws.resume_gateway_url,
+        }
+
     def is_ws_ratelimited(self) -> bool:
         """Whether the WebSocket is currently rate limited.
 
@@ -561,7 +597,9 @@ class Client:
         data = await self.http.static_login(token.strip(), bot)
         self._connection.user = ClientUser(state=self._connection, data=data)
 
-    async def connect(self, *, reconnect: bool = True) -> None:
+    async def connect(
+        self, *, reconnect: bool = True, session: dict[str, Any] | None = None
+    ) -> None:
         """|coro|
 
         Creates a WebSocket connection and lets the WebSocket listen
@@ -576,6 +614,9 @@ class Client:
             failure or a specific failure on Discord's part. Certain
             disconnects that lead to bad state will not be handled (such as
             invalid sharding payloads or bad tokens).
+        session: Optional[:class:`dict`]
+            A gateway session (see :attr:`session`) of a previous connection to RESUME,
+            instead of identifying. If the session is no longer valid, the client identifies.
 
         Raises
         ------
@@ -591,6 +632,14 @@ class Client:
             "initial": True,
             "shard_id": self.shard_id,
         }
+        if session is not None:
+            ws_params.update(
+                resume=True,
+                session=session["session_id"],
+                sequence=session["sequence"],
+                gateway=self.http.get_resume_gateway(session["resume_gateway_url"]),
+            )
+
         while not self.is_closed():
             try:
                 coro = DiscordWebSocket.from_client(self, **ws_params)
@@ -606,6 +655,9 @@ class Client:
                     resume=e.resume,
                     session=self.ws.session_id,
                 )
+                if not e.resume:
+                    # the URL of a resumed session is not used for identifying
+                    ws_params.pop("gateway", None)
                 continue
             except (
                 OSError,
@@ -657,10 +709,16 @@ class Client:
                     sequence=self.ws.sequence, resume=True, session=self.ws.session_id
                 )
 
-    async def close(self) -> None:
+    async def close(self, *, keep_session: bool = False) -> None:
         """|coro|
 
         Closes the connection to Discord.
+
+        Parameters
+        ----------
+        keep_session: :class:`bool`
+            Close the connection without invalidating the gateway session,
+            so it can be resumed (see :attr:`session`).
         """
         if self._closed:
             return
@@ -675,7 +733,8 @@ class Client:
                 pass
 
         if self.ws is not None and self.ws.open:
-            await self.ws.close(code=1000)
+            # closing with 1000 invalidates the session
+            await self.ws.close(code=4000 if keep_session else 1000)
 
         await self.http.close()
         self._ready.clear()
@@ -25,6 +25,7 @@ DEALINGS IN THE SOFTWARE.
 from __future__ import annotations
 
 import asyncio
+import collections
 import concurrent.futures
 import logging
 import struct
@@ -34,6 +35,7 @@ import time
 import traceback
 import zlib
 from collections import deque, namedtuple
+from typing import Any
 
 import aiohttp
 
@@ -52,6 +54,10 @@ __all__ = (
     "ReconnectWebSocket",
 )
 
+# Payloads of at least this many (compressed) bytes or characters are decoded in a thread
+DECODE_OFFLOAD_COMPRESSED_SIZE = 256 * 1024
+DECODE_OFFLOAD_SIZE = 1024 * 1024
+
 
 class ReconnectWebSocket(Exception):
     """Signals to safely reconnect the WebSocket."""
@@ -305,6 +311,10 @@ class DiscordWebSocket:
         self._close_code = None
         self._rate_limiter = GatewayRatelimiter()
         self.bot: bool = True
+        # names of dispatched events that are parsed (None = all) and counters of skipped ones
+        self._dispatch_allowlist = None
+        self._skipped_events = collections.Counter()
+        self._decode_latency = utils._LatencyHistogram()
 
     @property
     def open(self):
@@ -344,6 +354,9 @@ class DiscordWebSocket:
         ws.bot = client.http.bot_token
         ws._connection = client._connection
         ws._discord_parsers = client._connection.parsers
+        ws._dispatch_allowlist = client._connection.dispatch_allowlist
+        ws._skipped_events = client._connection.skipped_events
+        ws._decode_latency = client._connection.decode_latency
         ws._dispatch = client.dispatch
         ws.gateway = gateway
         ws.call_hooks = client._connection.call_hooks
@@ -469,18 +482,34 @@ class DiscordWebSocket:
         await self.send_as_json(payload)
         _log.info("Shard ID %s has sent the RESUME payload.", self.shard_id)
 
+    def _decode(self, msg: bytes | str, /) -> tuple[str, Any]:
+        if type(msg) is not str:
+            msg = self._zlib.decompress(msg).decode("utf-8")
+        return msg, utils._from_json(msg)
+
     async def received_message(self, msg, /):
+        start = time.perf_counter()
         if type(msg) is bytes:
             self._buffer.extend(msg)
 
             if len(msg) < 4 or msg[-4:] != b"\x00\x00\xff\xff":
                 return
-            msg = self._zlib.decompress(self._buffer)
-            msg = msg.decode("utf-8")
+            msg = self._buffer
             self._buffer = bytearray()
+            threshold = DECODE_OFFLOAD_COMPRESSED_SIZE
+        else:
+            threshold = DECODE_OFFLOAD_SIZE
 
-        self.log_receive(msg)
-        msg = utils._from_json(msg)
+        if len(msg) >= threshold:
+            # Large payloads (e.g. GUILD_CREATE) are decoded in a thread, so other connections
+            # in the loop are not blocked. The next message is not received before this one
+            # is decoded, which keeps the order of messages (and the zlib stream) intact.
+            text, msg = await self.loop.run_in_executor(None, self._decode, msg)
+        else:
+            text, msg = self._decode(msg)
+
+        self._decode_latency.record(time.perf_counter() - start)
+        self.log_receive(text)
 
         _log.debug("For Shard ID %s: WebSocket Event: %s", self.shard_id, msg)
         event = msg.get("t")
@@ -570,7 +599,13 @@ class DiscordWebSocket:
         except KeyError:
             _log.debug("Unknown event %s.", event)
         else:
-            func(data)
+            allowlist = self._dispatch_allowlist
+            if allowlist is None or event in allowlist:
+                func(data)
+            else:
+                # the payload still had to be decoded for the sequence number,
+                # but no models are built from it
+                self._skipped_events[event] += 1
 
         # remove the dispatched listeners
         removed = []
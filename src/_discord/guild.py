@@ -30,13 +30,17 @@ import unicodedata
 from typing import (
     TYPE_CHECKING,
     Any,
+    Callable,
     ClassVar,
+    Generic,
+    Iterator,
     List,
     Literal,
     NamedTuple,
     Optional,
     Sequence,
     Tuple,
+    TypeVar,
     Union,
     overload,
 )
@@ -102,7 +106,9 @@ if TYPE_CHECKING:
     from .types.guild import Ban as BanPayload
     from .types.guild import Guild as GuildPayload
     from .types.guild import GuildFeature, MFALevel
+    from .types.channel import GuildChannel as GuildChannelPayload
     from .types.member import Member as MemberPayload
+    from .types.role import Role as RolePayload
     from .types.threads import Thread as ThreadPayload
     from .types.voice import GuildVoiceState
     from .voice_client import VoiceProtocol
@@ -120,6 +126,211 @@ class BanEntry(NamedTuple):
     user: User
 
 
+_V = TypeVar("_V")
+
+
+class _LazyMapping(Generic[_V]):
+    """A mapping of snowflake IDs to objects, of which some are still raw payloads.
+
+    A payload is built into an object the first time its key is looked up.
+    Iterating values or items builds all the remaining payloads, while
+    iterating keys, checking membership and length do not build anything.
+    """
+
+    __slots__ = ("_built", "_pending", "_build")
+
+    def __init__(self, build: Callable[[Any], _V | None]):
+        self._built: dict[int, _V] = {}
+        self._pending: dict[int, Any] = {}
+        self._build = build
+
+    def add_pending(self, key: int, payload: Any) -> None:
+        self._built.pop(key, None)
+        self._pending[key] = payload
+
+    def get_pending(self, key: int) -> Any:
+        """Returns the payload of a key that was not yet built, without building it."""
+        return self._pending.get(key)
+
+    def get(self, key: int | None, default: Any = None) -> _V | Any:
+        value = self._built.get(key)  # type: ignore
+        if value is not None:
+            return value
+
+        payload = self._pending.pop(key, None)  # type: ignore
+        if payload is None:
+            return default
+
+        value = self._build(payload)
+        if value is None:
+            return default
+
+        self._built[key] = value  # type: ignore
+        return value
+
+    def _build_all(self) -> dict[int, _V]:
+        for key in list(self._pending):
+            self.get(key)
+        return self._built
+
+    def __getitem__(self, key: int) -> _V:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: int, value: _V) -> None:
+        self._pending.pop(key, None)
+        self._built[key] = value
+
+    def __delitem__(self, key: int) -> None:
+        if self._built.pop(key, None) is None and self._pending.pop(key, None) is None:
+            raise KeyError(key)
+
+    def pop(self, key: int, *default: Any) -> _V | Any:
+        value = self.get(key)
+        if value is None:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        del self._built[key]
+        return value
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._built or key in self._pending
+
+    def __len__(self) -> int:
+        return len(self._built) + len(self._pending)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(list(self._built) + list(self._pending))
+
+    def keys(self) -> list[int]:
+        return list(self)
+
+    def values(self):
+        return self._build_all().values()
+
+    def items(self):
+        return self._build_all().items()
+
+    def copy(self) -> dict[int, _V]:
+        return self._build_all().copy()
+
+    def clear(self) -> None:
+        self._built.clear()
+        self._pending.clear()
+
+
+# attributes of guild channels saved in snapshots, as (attribute, payload key) pairs
+_CHANNEL_SNAPSHOT_ATTRS = (
+    ("position", "position"),
+    ("nsfw", "nsfw"),
+    ("topic", "topic"),
+    ("slowmode_delay", "rate_limit_per_user"),
+    ("default_auto_archive_duration", "default_auto_archive_duration"),
+    ("default_thread_slowmode_delay", "default_thread_rate_limit_per_user"),
+    ("last_message_id", "last_message_id"),
+    ("bitrate", "bitrate"),
+    ("user_limit", "user_limit"),
+)
+
+
+def _snapshot_channel(channel: GuildChannel) -> GuildChannelPayload:
+    """Returns the payload of a guild channel with only the data needed to rebuild it."""
+    data = {
+        "id": channel.id,
+        "type": channel.type.value,
+        "name": channel.name,
+        "parent_id": channel.category_id,
+        "flags": channel.flags.value,
+        "permission_overwrites": [o._asdict() for o in channel._overwrites],
+    }
+    for attr, key in _CHANNEL_SNAPSHOT_ATTRS:
+        if hasattr(channel, attr):
+            data[key] = getattr(channel, attr)
+
+    return data  # type: ignore
+
+
+def _snapshot_role(role: Role) -> RolePayload:
+    """Returns the payload of a role with only the data needed to rebuild it."""
+    return {
+        "id": role.id,
+        "name": role.name,
+        "permissions": str(role._permissions),
+        "position": role.position,
+        "color": role._colour,
+        "hoist": role.hoist,
+        "managed": role.managed,
+        "mentionable": role.mentionable,
+        "icon": role._icon,
+        "unicode_emoji": role.unicode_emoji,
+    }  # type: ignore
+
+
+def _isoformat(value: datetime.datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+def _snapshot_member(member: Member) -> MemberPayload:
+    """Returns the payload of a member with only the data needed to rebuild it."""
+    return {
+        "user": member._user._to_minimal_user_json(),
+        "roles": [str(r) for r in member._roles],
+        "joined_at": _isoformat(member.joined_at),
+        "premium_since": _isoformat(member.premium_since),
+        "nick": member.nick,
+        "pending": member.pending,
+        "avatar": member._avatar,
+        "communication_disabled_until": _isoformat(member.communication_disabled_until),
+    }  # type: ignore
+
+
+def _snapshot_thread(thread: Thread) -> ThreadPayload:
+    """Returns the payload of a thread with only the data needed to rebuild it."""
+    data = {
+        "id": thread.id,
+        "type": thread.type.value,
+        "name": thread.name,
+        "parent_id": thread.parent_id,
+        "owner_id": thread.owner_id,
+        "last_message_id": thread.last_message_id,
+        "rate_limit_per_user": thread.slowmode_delay,
+        "message_count": thread.message_count,
+        "member_count": thread.member_count,
+        "flags": thread.flags.value,
+        "applied_tags": [str(t) for t in thread._applied_tags],
+        "thread_metadata": {
+            "archived": thread.archived,
+            "auto_archive_duration": thread.auto_archive_duration,
+            "archive_timestamp": _isoformat(thread.archive_timestamp),
+            "locked": thread.locked,
+            "invitable": thread.invitable,
+            "create_timestamp": _isoformat(thread.created_at),
+        },
+    }
+    me = thread.me
+    if me is not None:
+        data["member"] = {
+            "id": thread.id,
+            "user_id": me.id,
+            "join_timestamp": _isoformat(me.joined_at),
+            "flags": me.flags,
+        }
+
+    return data  # type: ignore
+
+
+def _snapshot_all(objects: dict[int, Any], snapshot: Callable[[Any], Any]) -> list[Any]:
+    """Returns the payloads of all the cached objects, using ``snapshot`` for the built ones."""
+    if isinstance(objects, _LazyMapping):
+        # payloads that were never built are still the original ones
+        return [*objects._pending.values(), *map(snapshot, objects._built.values())]
+
+    return [snapshot(o) for o in objects.values()]
+
+
 class _GuildLimit(NamedTuple):
     emoji: int
     stickers: int
@@ -277,6 +488,7 @@ class Guild(Hashable):
         "_public_updates_channel_id",
         "_stage_instances",
         "_threads",
+        "_permissions_cache",
         "approximate_member_count",
         "approximate_presence_count",
     )
@@ -295,19 +507,52 @@ class Guild(Hashable):
         # the attr doesn't exist? it has something to do with the order
         # of the attr in __slots__
 
-        self._channels: dict[int, GuildChannel] = {}
-        self._members: dict[int, Member] = {}
+        if state.lazy_guilds:
+            # channels, threads and members are built from GUILD_CREATE payloads on first access
+            self._channels: dict[int, GuildChannel] = _LazyMapping(self._build_channel)  # type: ignore
+            self._members: dict[int, Member] = _LazyMapping(self._build_member)  # type: ignore
+            self._threads: dict[int, Thread] = _LazyMapping(self._build_thread)  # type: ignore
+        else:
+            self._channels: dict[int, GuildChannel] = {}
+            self._members: dict[int, Member] = {}
+            self._threads: dict[int, Thread] = {}
+
         self._scheduled_events: dict[int, ScheduledEvent] = {}
         self._voice_states: dict[int, VoiceState] = {}
-        self._threads: dict[int, Thread] = {}
+        self._permissions_cache: dict[tuple[int, int], tuple] = {}
         self._state: ConnectionState = state
         self._from_data(data)
 
+    def _invalidate_permissions(self) -> None:
+        self._permissions_cache.clear()
+
+    def _build_channel(self, data: GuildChannelPayload) -> GuildChannel | None:
+        factory, _ = _guild_channel_factory(data["type"])
+        if factory is None:
+            return None
+        channel = factory(guild=self, data=data, state=self._state)  # type: ignore
+        self._state._index_channel(self, channel)
+        return channel
+
+    def _build_thread(self, data: ThreadPayload) -> Thread:
+        thread = Thread(guild=self, state=self._state, data=data)
+        self._state._index_channel(self, thread)
+        return thread
+
+    def _build_member(self, data: MemberPayload) -> Member:
+        member = Member(data=data, guild=self, state=self._state)
+        presence = data.get("presence")  # stored by _sync
+        if presence is not None:
+            member._presence_update(presence, ())  # type: ignore
+        return member
+
     def _add_channel(self, channel: GuildChannel, /) -> None:
         self._channels[channel.id] = channel
+        self._state._index_channel(self, channel)
 
     def _remove_channel(self, channel: Snowflake, /) -> None:
         self._channels.pop(channel.id, None)
+        self._state._unindex_channel(self, channel.id)
 
     def _voice_state_for(self, user_id: int, /) -> VoiceState | None:
         return self._voice_states.get(user_id)
@@ -335,7 +580,7 @@ class Guild(Hashable):
 
     def _store_thread(self, payload: ThreadPayload, /) -> Thread:
         thread = Thread(guild=self, state=self._state, data=payload)
-        self._threads[thread.id] = thread
+        self._add_thread(thread)
         return thread
 
     def _remove_member(self, member: Snowflake, /) -> None:
@@ -354,17 +599,22 @@ class Guild(Hashable):
 
     def _add_thread(self, thread: Thread, /) -> None:
         self._threads[thread.id] = thread
+        self._state._index_channel(self, thread)
 
     def _remove_thread(self, thread: Snowflake, /) -> None:
         self._threads.pop(thread.id, None)
+        self._state._unindex_channel(self, thread.id)
 
     def _clear_threads(self) -> None:
+        for k in self._threads:
+            self._state._unindex_channel(self, k)
         self._threads.clear()
 
     def _remove_threads_by_channel(self, channel_id: int) -> None:
         to_remove = [k for k, t in self._threads.items() if t.parent_id == channel_id]
         for k in to_remove:
             del self._threads[k]
+            self._state._unindex_channel(self, k)
 
     def _filter_threads(self, channel_ids: set[int]) -> dict[int, Thread]:
         to_remove: dict[int, Thread] = {
@@ -372,6 +622,7 @@ class Guild(Hashable):
         }
         for k in to_remove:
             del self._threads[k]
+            self._state._unindex_channel(self, k)
         return to_remove
 
     def __str__(self) -> str:
@@ -391,6 +642,20 @@ class Guild(Hashable):
     def _update_voice_state(
         self, data: GuildVoiceState, channel_id: int
     ) -> tuple[Member | None, VoiceState, VoiceState]:
+        user_id = int(data["user_id"])
+        before, after = self._store_voice_state(data, channel_id)
+        member = self.get_member(user_id)
+        if member is None:
+            try:
+                member = Member(data=data["member"], state=self._state, guild=self)
+            except KeyError:
+                member = None
+
+        return member, before, after
+
+    def _store_voice_state(
+        self, data: GuildVoiceState, channel_id: int
+    ) -> tuple[VoiceState, VoiceState]:
         user_id = int(data["user_id"])
         channel = self.get_channel(channel_id)
         try:
@@ -408,14 +673,7 @@ class Guild(Hashable):
             before = VoiceState(data=data, channel=None)
             self._voice_states[user_id] = after
 
-        member = self.get_member(user_id)
-        if member is None:
-            try:
-                member = Member(data=data["member"], state=self._state, guild=self)
-            except KeyError:
-                member = None
-
-        return member, before, after
+        return before, after
 
     def _add_role(self, role: Role, /) -> None:
         # roles get added to the bottom (position 1, pos 0 is @everyone)
@@ -427,6 +685,7 @@ class Guild(Hashable):
             r.position += not r.is_default()
 
         self._roles[role.id] = role
+        self._invalidate_permissions()
 
     def _remove_role(self, role_id: int, /) -> Role:
         # this raises KeyError if it fails.
@@ -438,6 +697,7 @@ class Guild(Hashable):
         for r in self._roles.values():
             r.position -= r.position > role.position
 
+        self._invalidate_permissions()
         return role
 
     def _from_data(self, guild: GuildPayload) -> None:
@@ -511,10 +771,18 @@ class Guild(Hashable):
 
         cache_joined = self._state.member_cache_flags.joined
         self_id = self._state.self_id
-        for mdata in guild.get("members", []):
-            member = Member(data=mdata, guild=self, state=state)
-            if cache_joined or member.id == self_id:
-                self._add_member(member)
+        if isinstance(self._members, _LazyMapping):
+            for mdata in guild.get("members", []):
+                member_id = int(mdata["user"]["id"])
+                if member_id == self_id:
+                    self._add_member(Member(data=mdata, guild=self, state=state))
+                elif cache_joined:
+                    self._members.add_pending(member_id, mdata)
+        else:
+            for mdata in guild.get("members", []):
+                member = Member(data=mdata, guild=self, state=state)
+                if cache_joined or member.id == self_id:
+                    self._add_member(member)
 
         events = []
         for event in guild.get("guild_scheduled_events", []):
@@ -536,12 +804,14 @@ class Guild(Hashable):
         )
 
         self.owner_id: int | None = utils._get_as_snowflake(guild, "owner_id")
+        self._invalidate_permissions()  # owner or roles could have changed
         self.afk_channel: VocalGuildChannel | None = self.get_channel(
             utils._get_as_snowflake(guild, "afk_channel_id")
         )  # type: ignore
 
         for obj in guild.get("voice_states", []):
-            self._update_voice_state(obj, int(obj["channel_id"]))
+            # the members are not needed, looking them up would build members of lazy guilds
+            self._store_voice_state(obj, int(obj["channel_id"]))
 
     # TODO: refactor/remove?
     def _sync(self, data: GuildPayload) -> None:
@@ -551,12 +821,30 @@ class Guild(Hashable):
             pass
 
         empty_tuple = ()
+        members = self._members
         for presence in data.get("presences", []):
             user_id = int(presence["user"]["id"])
+            if isinstance(members, _LazyMapping):
+                payload = members.get_pending(user_id)
+                if payload is not None:
+                    # applied once the member is built
+                    payload["presence"] = presence  # type: ignore
+                    continue
+
             member = self.get_member(user_id)
             if member is not None:
                 member._presence_update(presence, empty_tuple)  # type: ignore
 
+        if isinstance(self._channels, _LazyMapping):
+            # indexed by the state once the guild is added to it
+            for c in data.get("channels", []):
+                self._channels.add_pending(int(c["id"]), c)
+            for thread in data.get("threads", []):
+                self._threads.add_pending(int(thread["id"]), thread)
+            if self._state._get_guild(self.id) is self:
+                self._state._index_guild(self)
+            return
+
         if "channels" in data:
             channels = data["channels"]
             for c in channels:
@@ -569,6 +857,24 @@ class Guild(Hashable):
             for thread in threads:
                 self._add_thread(Thread(guild=self, state=self._state, data=thread))
 
+    def _snapshot(self) -> GuildPayload:
+        """Returns a JSON serializable payload of the guild, containing only its roles,
+        channels, threads and cached members. The payload can be used to rebuild the guild
+        without waiting for the gateway.
+        """
+        return {
+            "id": self.id,
+            "name": self.name,
+            "icon": self._icon,
+            "owner_id": self.owner_id,
+            "features": self.features,
+            "member_count": self._member_count,
+            "roles": [_snapshot_role(r) for r in self._roles.values()],
+            "channels": _snapshot_all(self._channels, _snapshot_channel),
+            "threads": _snapshot_all(self._threads, _snapshot_thread),
+            "members": _snapshot_all(self._members, _snapshot_member),
+        }  # type: ignore
+
     @property
     def channels(self) -> list[GuildChannel]:
         """A list of channels that belong to this guild."""
@@ -1222,7 +1528,7 @@ class Guild(Hashable):
         channel = TextChannel(state=self._state, guild=self, data=data)
 
         # temporarily add to the cache
-        self._channels[channel.id] = channel
+        self._add_channel(channel)
         return channel
 
     async def create_voice_channel(
@@ -1312,7 +1618,7 @@ class Guild(Hashable):
         channel = VoiceChannel(state=self._state, guild=self, data=data)
 
         # temporarily add to the cache
-        self._channels[channel.id] = channel
+        self._add_channel(channel)
         return channel
 
     async def create_stage_channel(
@@ -1381,7 +1687,7 @@ class Guild(Hashable):
         channel = StageChannel(state=self._state, guild=self, data=data)
 
         # temporarily add to the cache
-        self._channels[channel.id] = channel
+        self._add_channel(channel)
         return channel
 
     async def create_forum_channel(
@@ -1496,7 +1802,7 @@ class Guild(Hashable):
         channel = ForumChannel(state=self._state, guild=self, data=data)
 
         # temporarily add to the cache
-        self._channels[channel.id] = channel
+        self._add_channel(channel)
         return channel
 
     async def create_category(
@@ -1544,7 +1850,7 @@ class Guild(Hashable):
         channel = CategoryChannel(state=self._state, guild=self, data=data)
 
         # temporarily add to the cache
-        self._channels[channel.id] = channel
+        self._add_channel(channel)
         return channel
 
     create_category_channel = create_category
@@ -30,7 +30,7 @@ import base64
 import asyncio
 import logging
 import sys
-import weakref
+import time
 from typing import TYPE_CHECKING, Any, Coroutine, Iterable, Sequence, TypeVar
 from urllib.parse import quote as _uriquote
 
@@ -52,8 +52,6 @@ from .utils import MISSING, warn_deprecated
 _log = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
-    from types import TracebackType
-
     from .enums import AuditLogAction, InteractionResponseType
     from .file import File
     from .types import (
@@ -85,10 +83,11 @@ if TYPE_CHECKING:
 
     T = TypeVar("T")
     BE = TypeVar("BE", bound=BaseException)
-    MU = TypeVar("MU", bound="MaybeUnlock")
     Response = Coroutine[Any, Any, T]
 
 API_VERSION: int = 10
+# rate limit buckets that are idle are removed once there are more than this many
+RATELIMIT_BUCKETS_MAX: int = 1024
 
 
 async def json_or_text(response: aiohttp.ClientResponse) -> dict[str, Any] | str:
@@ -148,26 +147,135 @@ class Route:
         # the bucket is just method + path w/ major parameters
         return f"{self.channel_id}:{self.guild_id}:{self.path}"
 
+    @property
+    def key(self) -> str:
+        # routes are mapped to Discord's rate limit buckets by method + path
+        return f"{self.method} {self.path}"
 
-class MaybeUnlock:
-    def __init__(self, lock: asyncio.Lock) -> None:
-        self.lock: asyncio.Lock = lock
-        self._unlock: bool = True
+    @property
+    def major_parameters(self) -> str:
+        return f"{self.channel_id}:{self.guild_id}:{self.webhook_id}:{self.webhook_token}"
+
+
+class RateLimitBucket:
+    """Tracks the rate limit of a Discord bucket (bucket hash + major parameters)
+    and schedules requests so that they stay within it.
+
+    Requests reserve a use of the bucket before being sent. While the bucket's
+    limit is unknown, only one request is sent at a time. Once known, as many
+    requests are sent in parallel as there are remaining uses, and the others
+    wait for the bucket to reset instead of getting a 429.
+    """
+
+    __slots__ = (
+        "limit",
+        "remaining",
+        "reset_at",
+        "_known",
+        "_in_flight",
+        "_waiters",
+    )
 
-    def __enter__(self: MU) -> MU:
-        return self
+    def __init__(self) -> None:
+        self.limit: int | None = None
+        self.remaining: int | None = None
+        self.reset_at: float = 0.0
+        self._known: bool = False
+        self._in_flight: int = 0
+        self._waiters: list[asyncio.Future] = []
+
+    def is_idle(self) -> bool:
+        return (
+            not self._in_flight
+            and not self._waiters
+            and self.reset_at <= time.monotonic()
+        )
+
+    def _try_reserve(self) -> float | None:
+        """Reserves a use of the bucket. Returns ``None`` on success, otherwise
+        the number of seconds until the bucket resets (``inf`` if unknown)."""
+        if not self._known:
+            # the first response tells the limit
+            return float("inf") if self._in_flight else None
+
+        if self.remaining is None:  # not rate limited
+            return None
+
+        now = time.monotonic()
+        if self.reset_at <= now or (
+            self.reset_at == float("inf") and not self._in_flight
+        ):
+            # a new window, its reset time is known once a response arrives
+            self.remaining = self.limit
+            self.reset_at = float("inf")
+
+        if self.remaining > 0:
+            self.remaining -= 1
+            return None
+
+        return self.reset_at - now
+
+    async def acquire(self) -> float:
+        """Waits until a request can be sent and returns for how long it waited."""
+        if self._try_reserve() is None:
+            self._in_flight += 1
+            return 0.0
+
+        start = time.monotonic()
+        while (delay := self._try_reserve()) is not None:
+            future = asyncio.get_running_loop().create_future()
+            self._waiters.append(future)
+            try:
+                await asyncio.wait_for(
+                    future, timeout=None if delay == float("inf") else delay
+                )
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                self._waiters.remove(future)
+
+        self._in_flight += 1
+        return time.monotonic() - start
+
+    def release(self) -> None:
+        self._in_flight -= 1
+        for future in self._waiters:
+            if not future.done():
+                future.set_result(None)
+
+    def update(self, response: aiohttp.ClientResponse, *, use_clock: bool) -> None:
+        """Updates the limits from the rate limit headers of a response."""
+        headers = response.headers
+        remaining = headers.get("X-Ratelimit-Remaining")
+        if remaining is None:
+            # responses without the headers (server errors, error pages of proxies, ...)
+            # keep the known limits, only a successful response tells the route isn't rate limited
+            if self.limit is None and response.status < 400:
+                self._known = True
+                self.remaining = None
+            return
+
+        self._known = True
+        remaining = int(remaining)
+        self.limit = int(headers.get("X-Ratelimit-Limit", 1))
+        # other requests may have been sent since, so only ever lower the remaining uses
+        # (unless the bucket has reset in the meantime)
+        if self.remaining is None or self.reset_at <= time.monotonic():
+            self.remaining = remaining
+        else:
+            self.remaining = min(self.remaining, remaining)
 
-    def defer(self) -> None:
-        self._unlock = False
+        self.reset_at = time.monotonic() + utils._parse_ratelimit_header(
+            response, use_clock=use_clock
+        )
 
-    def __exit__(
-        self,
-        exc_type: type[BE] | None,
-        exc: BE | None,
-        traceback: TracebackType | None,
-    ) -> None:
-        if self._unlock:
-            self.lock.release()
+    def exhaust(self, retry_after: float) -> None:
+        """Marks the bucket as used up for ``retry_after`` seconds (after a 429)."""
+        self._known = True
+        if self.limit is None:
+            self.limit = 1
+        self.remaining = 0
+        self.reset_at = time.monotonic() + retry_after
 
 
 # For some reason, the Discord voice websocket expects this header to be
@@ -192,7 +300,11 @@ class HTTPClient:
         )
         self.connector = connector
         self.__session: aiohttp.ClientSession = MISSING  # filled in static_login
-        self._locks: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+        # route key -> Discord's bucket hash, learned from responses
+        self._bucket_hashes: dict[str, str] = {}
+        self._buckets: dict[str, RateLimitBucket] = {}
+        self._buckets_max: int = RATELIMIT_BUCKETS_MAX
+        self._ratelimit_stats: dict[str, dict[str, float]] = {}
         self._global_over: asyncio.Event = asyncio.Event()
         self._global_over.set()
         self.token: str | None = None
@@ -216,6 +328,76 @@ class HTTPClient:
                 ws_response_class=DiscordClientWebSocketResponse,
             )
 
+    @property
+    def ratelimit_stats(self) -> dict[str, dict[str, float]]:
+        """Statistics of the requests per rate limit bucket hash (or per route
+        while the hash is not known yet): the number of ``requests``, how many
+        were ``delayed`` by the rate limiter and for how long (``wait``), and how
+        many were still ``rate_limited`` by Discord (429).
+        """
+        return {key: stats.copy() for key, stats in self._ratelimit_stats.items()}
+
+    def _get_bucket_key(self, route: Route) -> str:
+        bucket_hash = self._bucket_hashes.get(route.key, route.key)
+        return f"{bucket_hash}:{route.major_parameters}"
+
+    def _get_bucket(self, route: Route) -> RateLimitBucket:
+        key = self._get_bucket_key(route)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self._buckets_max:
+                self._prune_buckets()
+            self._buckets[key] = bucket = RateLimitBucket()
+        return bucket
+
+    async def _acquire_bucket(self, route: Route) -> tuple[RateLimitBucket, float]:
+        """Waits until a request to the route can be sent. Returns the bucket
+        (to be released after the request) and for how long it waited."""
+        waited = 0.0
+        while True:
+            bucket = self._get_bucket(route)
+            waited += await bucket.acquire()
+            # the route's bucket changes once its hash is learned
+            if bucket is self._get_bucket(route):
+                return bucket, waited
+
+            bucket.release()
+
+    def _prune_buckets(self) -> None:
+        for key, bucket in list(self._buckets.items()):
+            if bucket.is_idle():
+                del self._buckets[key]
+
+        # avoid pruning on every new bucket when most of them are in use
+        self._buckets_max = max(RATELIMIT_BUCKETS_MAX, len(self._buckets) * 2)
+
+    def _update_bucket(
+        self, route: Route, response: aiohttp.ClientResponse
+    ) -> RateLimitBucket:
+        """Learns the bucket hash of the route from the response and updates the
+        limits of the bucket. Returns the bucket."""
+        bucket_hash = response.headers.get("X-Ratelimit-Bucket")
+        if bucket_hash is not None:
+            self._bucket_hashes[route.key] = bucket_hash
+
+        bucket = self._get_bucket(route)
+        bucket.update(response, use_clock=self.use_clock)
+        return bucket
+
+    def _record_request(self, route: Route, **counts: float) -> None:
+        key = self._bucket_hashes.get(route.key, route.key)
+        stats = self._ratelimit_stats.get(key)
+        if stats is None:
+            stats = self._ratelimit_stats[key] = {
+                "requests": 0,
+                "delayed": 0,
+                "wait": 0.0,
+                "rate_limited": 0,
+            }
+
+        for name, value in counts.items():
+            stats[name] += value
+
     async def ws_connect(self, url: str, *, compress: int = 0) -> Any:
         kwargs = {
             "proxy_auth": self.proxy_auth,
@@ -239,16 +421,9 @@ class HTTPClient:
         form: Iterable[dict[str, Any]] | None = None,
         **kwargs: Any,
     ) -> Any:
-        bucket = route.bucket
         method = route.method
         url = route.url
 
-        lock = self._locks.get(bucket)
-        if lock is None:
-            lock = asyncio.Lock()
-            if bucket is not None:
-                self._locks[bucket] = lock
-
         # header creation
         headers: dict[str, str] = {
             "User-Agent": self.user_agent,
@@ -300,131 +475,131 @@ class HTTPClient:
 
         response: aiohttp.ClientResponse | None = None
         data: dict[str, Any] | str | None = None
-        await lock.acquire()
-        with MaybeUnlock(lock) as maybe_lock:
-            for tries in range(5):
-                if files:
-                    for f in files:
-                        f.reset(seek=tries)
-
-                if form:
-                    form_data = aiohttp.FormData(quote_fields=False)
-                    for params in form:
-                        form_data.add_field(**params)
-                    kwargs["data"] = form_data
-
-                try:
-
-                    if not self.bot_token:
-                        await self.user_limit.ensure()
+        for tries in range(5):
+            if files:
+                for f in files:
+                    f.reset(seek=tries)
+
+            if form:
+                form_data = aiohttp.FormData(quote_fields=False)
+                for params in form:
+                    form_data.add_field(**params)
+                kwargs["data"] = form_data
+
+            bucket, waited = await self._acquire_bucket(route)
+            self._record_request(route, requests=1, delayed=bool(waited), wait=waited)
+            try:
+
+                if not self.bot_token:
+                    await self.user_limit.ensure()
+
+
+                async with self.__session.request(
+                    method, url, **kwargs
+                ) as response:
+                    _log.debug(
+                        "%s %s with %s has returned %s",
+                        method,
+                        url,
+                        kwargs.get("data"),
+                        response.status,
+                    )
+
+                    # even errors have text involved in them so this is safe to call
+                    data = await json_or_text(response)
+
+                    # update the bucket from the rate limit header information
+                    updated = self._update_bucket(route, response)
+                    if updated.remaining == 0 and response.status != 429:
+                        # we've depleted our current bucket, the following
+                        # requests wait for it to reset
+                        _log.debug(
+                            (
+                                "A rate limit bucket has been exhausted (bucket:"
+                                " %s, retry: %s)."
+                            ),
+                            self._get_bucket_key(route),
+                            updated.reset_at - time.monotonic(),
+                        )
 
+                    # the request was successful so just return the text/json
+                    if 300 > response.status >= 200:
+                        _log.debug("%s %s has received %s", method, url, data)
+                        return data
+
+                    # we are being rate limited
+                    if response.status == 429:
+                        self._record_request(route, rate_limited=1)
+                        retry_after: float = data.get("retry_after", 0)
+                        if not response.headers.get("Via") or isinstance(data, str) or ("code" in data and data["code"] == 20016) or retry_after > 30:
+                            # Banned by Cloudflare more than likely.
+                            raise HTTPException(response, data)
 
-                    async with self.__session.request(
-                        method, url, **kwargs
-                    ) as response:
-                        _log.debug(
-                            "%s %s with %s has returned %s",
-                            method,
-                            url,
-                            kwargs.get("data"),
-                            response.status,
+                        fmt = (
+                            "We are being rate limited. Retrying in %.2f seconds."
+                            ' Handled under the bucket "%s"'
                         )
 
-                        # even errors have text involved in them so this is safe to call
-                        data = await json_or_text(response)
+                        # sleep a bit
+                        _log.warning(fmt, retry_after, self._get_bucket_key(route))
 
-                        # check if we have rate limit header information
-                        remaining = response.headers.get("X-Ratelimit-Remaining")
-                        if remaining == "0" and response.status != 429:
-                            # we've depleted our current bucket
-                            delta = utils._parse_ratelimit_header(
-                                response, use_clock=self.use_clock
-                            )
-                            _log.debug(
+                        # check if it's a global rate limit
+                        is_global = data.get("global", False)
+                        if is_global:
+                            _log.warning(
                                 (
-                                    "A rate limit bucket has been exhausted (bucket:"
-                                    " %s, retry: %s)."
+                                    "Global rate limit has been hit. Retrying in"
+                                    " %.2f seconds."
                                 ),
-                                bucket,
-                                delta,
-                            )
-                            maybe_lock.defer()
-                            self.loop.call_later(delta, lock.release)
-
-                        # the request was successful so just return the text/json
-                        if 300 > response.status >= 200:
-                            _log.debug("%s %s has received %s", method, url, data)
-                            return data
-
-                        # we are being rate limited
-                        if response.status == 429:
-                            retry_after: float = data.get("retry_after", 0)
-                            if not response.headers.get("Via") or isinstance(data, str) or ("code" in data and data["code"] == 20016) or retry_after > 30:
-                                # Banned by Cloudflare more than likely.
-                                raise HTTPException(response, data)
-
-                            fmt = (
-                                "We are being rate limited. Retrying in %.2f seconds."
-                                ' Handled under the bucket "%s"'
+                                retry_after,
                             )
-
-                            # sleep a bit
-                            _log.warning(fmt, retry_after, bucket)
-
-                            # check if it's a global rate limit
-                            is_global = data.get("global", False)
-                            if is_global:
-                                _log.warning(
-                                    (
-                                        "Global rate limit has been hit. Retrying in"
-                                        " %.2f seconds."
-                                    ),
-                                    retry_after,
-                                )
-                                self._global_over.clear()
-
+                            self._global_over.clear()
                             await asyncio.sleep(retry_after)
                             _log.debug("Done sleeping for the rate limit. Retrying...")
 
                             # release the global lock now that the
                             # global rate limit has passed
-                            if is_global:
-                                self._global_over.set()
-                                _log.debug("Global rate limit is now over.")
-
-                            continue
-
-                        # we've received a 500, 502, or 504, unconditional retry
-                        if response.status in {500, 502, 504}:
-                            await asyncio.sleep(1 + tries * 2)
-                            continue
-
-                        # the usual error cases
-                        if response.status == 403:
-                            raise Forbidden(response, data)
-                        elif response.status == 404:
-                            raise NotFound(response, data)
-                        elif response.status >= 500:
-                            raise DiscordServerError(response, data)
+                            self._global_over.set()
+                            _log.debug("Global rate limit is now over.")
                         else:
-                            raise HTTPException(response, data)
+                            # the retry waits for the bucket to reset
+                            updated.exhaust(retry_after)
 
-                # This is handling exceptions from the request
-                except OSError as e:
-                    # Connection reset by peer
-                    if tries < 4 and e.errno in (54, 10054):
-                        await asyncio.sleep(1 + tries * 2)
                         continue
-                    raise
 
-            if response is not None:
-                # We've run out of retries, raise.
-                if response.status >= 500:
-                    raise DiscordServerError(response, data)
-
-                raise HTTPException(response, data)
+                    # we've received a 500, 502, or 504, unconditional retry
+                    if response.status in {500, 502, 504}:
+                        await asyncio.sleep(1 + tries * 2)
+                        continue
 
-            raise RuntimeError("Unreachable code in HTTP handling")
+                    # the usual error cases
+                    if response.status == 403:
+                        raise Forbidden(response, data)
+                    elif response.status == 404:
+                        raise NotFound(response, data)
+                    elif response.status >= 500:
+                        raise DiscordServerError(response, data)
+                    else:
+                        raise HTTPException(response, data)
+
+            # This is handling exceptions from the request
+            except OSError as e:
+                # Connection reset by peer
+                if tries < 4 and e.errno in (54, 10054):
+                    await asyncio.sleep(1 + tries * 2)
+                    continue
+                raise
+            finally:
+                bucket.release()
+
+        if response is not None:
+            # We've run out of retries, raise.
+            if response.status >= 500:
+                raise DiscordServerError(response, data)
+
+            raise HTTPException(response, data)
+
+        raise RuntimeError("Unreachable code in HTTP handling")
 
     async def get_from_cdn(self, url: str) -> bytes:
         async with self.__session.get(url) as resp:
@@ -2952,9 +3127,18 @@ class HTTPClient:
             value = "{0}?encoding={1}&v={2}"
         return value.format(data["url"], encoding, API_VERSION)
 
+    def get_resume_gateway(
+        self, url: str, *, encoding: str = "json", zlib: bool = True
+    ) -> str:
+        if zlib:
+            value = "{0}?encoding={1}&v={2}&compress=zlib-stream"
+        else:
+            value = "{0}?encoding={1}&v={2}"
+        return value.format(url, encoding, API_VERSION)
+
     async def get_bot_gateway(
         self, *, encoding: str = "json", zlib: bool = True
-    ) -> tuple[int, str]:
+    ) -> tuple[int, str, int]:
         try:
             data = await self.request(Route("GET", "/gateway/bot"))
         except HTTPException as exc:
@@ -2964,7 +3148,12 @@ class HTTPClient:
             value = "{0}?encoding={1}&v={2}&compress=zlib-stream"
         else:
             value = "{0}?encoding={1}&v={2}"
-        return data["shards"], value.format(data["url"], encoding, API_VERSION)
+        max_concurrency = data.get("session_start_limit", {}).get("max_concurrency", 1)
+        return (
+            data["shards"],
+            value.format(data["url"], encoding, API_VERSION),
+            max_concurrency,
+        )
 
     def get_user(self, user_id: Snowflake) -> Response[user.User]:
         return self.request(Route("GET", "/users/{user_id}", user_id=user_id))
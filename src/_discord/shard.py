@@ -26,6 +26,7 @@ DEALINGS IN THE SOFTWARE.
 from __future__ import annotations
 
 import asyncio
+import itertools
 import logging
 from typing import TYPE_CHECKING, Any, Callable, TypeVar
 
@@ -128,9 +129,9 @@ class Shard:
         if self._task is not None and not self._task.done():
             self._task.cancel()
 
-    async def close(self) -> None:
+    async def close(self, *, keep_session: bool = False) -> None:
         self._cancel_task()
-        await self.ws.close(code=1000)
+        await self.ws.close(code=4000 if keep_session else 1000)
 
     async def disconnect(self) -> None:
         await self.close()
@@ -329,10 +330,16 @@ class AutoShardedClient(Client):
     if this is used. By default, when omitted, the client will launch shards from
     0 to ``shard_count - 1``.
 
+    Shards are identified in groups of ``max_concurrency`` shards at once, waiting
+    between the groups. If no ``max_concurrency`` is provided, then the library will
+    use the Bot Gateway endpoint call to get the limit of the bot.
+
     Attributes
     ----------
     shard_ids: Optional[List[:class:`int`]]
         An optional list of shard_ids to launch the shards with.
+    max_concurrency: Optional[:class:`int`]
+        How many shards can identify at the same time.
     """
 
     if TYPE_CHECKING:
@@ -346,6 +353,7 @@ class AutoShardedClient(Client):
     ) -> None:
         kwargs.pop("shard_id", None)
         self.shard_ids: list[int] | None = kwargs.pop("shard_ids", None)
+        self.max_concurrency: int | None = kwargs.pop("max_concurrency", None)
         super().__init__(*args, loop=loop, **kwargs)
 
         if self.shard_ids is not None:
@@ -439,8 +447,12 @@ class AutoShardedClient(Client):
         ret.launch()
 
     async def launch_shards(self) -> None:
-        if self.shard_count is None:
-            self.shard_count, gateway = await self.http.get_bot_gateway()
+        if self.shard_count is None or self.max_concurrency is None:
+            shard_count, gateway, max_concurrency = await self.http.get_bot_gateway()
+            if self.shard_count is None:
+                self.shard_count = shard_count
+            if self.max_concurrency is None:
+                self.max_concurrency = max_concurrency
         else:
             gateway = await self.http.get_gateway()
 
@@ -449,9 +461,21 @@ class AutoShardedClient(Client):
         shard_ids = self.shard_ids or range(self.shard_count)
         self._connection.shard_ids = shard_ids
 
+        # Discord allows max_concurrency shards (one of each shard_id % max_concurrency)
+        # to identify at once. All shards of a group wait in before_identify_hook together.
+        concurrency = max(self.max_concurrency, 1)
+        buckets: dict[int, list[int]] = {}
         for shard_id in shard_ids:
-            initial = shard_id == shard_ids[0]
-            await self.launch_shard(gateway, shard_id, initial=initial)
+            buckets.setdefault(shard_id % concurrency, []).append(shard_id)
+
+        for index, group in enumerate(itertools.zip_longest(*buckets.values())):
+            await asyncio.gather(
+                *(
+                    self.launch_shard(gateway, shard_id, initial=index == 0)
+                    for shard_id in group
+                    if shard_id is not None
+                )
+            )
 
         self._connection.shards_launched.set()
 
@@ -476,10 +500,15 @@ class AutoShardedClient(Client):
             elif item.type == EventType.clean_close:
                 return
 
-    async def close(self) -> None:
+    async def close(self, *, keep_session: bool = False) -> None:
         """|coro|
 
         Closes the connection to Discord.
+
+        Parameters
+        ----------
+        keep_session: :class:`bool`
+            Close the connections without invalidating the gateway sessions of the shards.
         """
         if self.is_closed():
             return
@@ -493,7 +522,7 @@ class AutoShardedClient(Client):
                 pass
 
         to_close = [
-            asyncio.ensure_future(shard.close(), loop=self.loop)
+            asyncio.ensure_future(shard.close(keep_session=keep_session), loop=self.loop)
             for shard in self.__shards.values()
         ]
         if to_close:
@@ -26,11 +26,13 @@ DEALINGS IN THE SOFTWARE.
 from __future__ import annotations
 
 import asyncio
+import collections.abc
 import copy
 import inspect
 import itertools
 import logging
 import os
+import time
 from collections import OrderedDict, deque
 from typing import (
     TYPE_CHECKING,
@@ -38,6 +40,8 @@ from typing import (
     Callable,
     Coroutine,
     Deque,
+    Iterable,
+    Iterator,
     Sequence,
     TypeVar,
     Union,
@@ -52,7 +56,7 @@ from .channel import _channel_factory
 from .emoji import Emoji
 from .enums import ChannelType, InteractionType, ScheduledEventStatus, Status, try_enum
 from .flags import ApplicationFlags, Intents, MemberCacheFlags
-from .guild import Guild
+from .guild import Guild, _LazyMapping
 from .integrations import _integration_factory
 from .interactions import Interaction
 from .invite import Invite
@@ -142,6 +146,9 @@ class ChunkRequest:
 
 _log = logging.getLogger(__name__)
 
+# Events needed for the connection itself, which are never skipped by dispatch_allowlist
+_REQUIRED_DISPATCH_EVENTS = frozenset({"READY", "RESUMED", "GUILD_CREATE", "GUILD_DELETE"})
+
 
 async def logging_coroutine(
     coroutine: Coroutine[Any, Any, T], *, info: str
@@ -152,6 +159,75 @@ async def logging_coroutine(
         _log.exception("Exception occurred during %s", info)
 
 
+class MessageCache(collections.abc.Sequence):
+    """LRU cache of messages, indexed by message ID and by channel ID.
+
+    Iteration goes from the least to the most recently used message.
+    Lookups, insertions and removals are O(1).
+    """
+
+    __slots__ = ("maxlen", "_messages", "_channels")
+
+    def __init__(self, maxlen: int):
+        self.maxlen: int = maxlen
+        self._messages: OrderedDict[int, Message] = OrderedDict()
+        # channel ID -> {message ID -> message}, in the order the messages were added
+        self._channels: dict[int, dict[int, Message]] = {}
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __iter__(self) -> Iterator[Message]:
+        return iter(self._messages.values())
+
+    def __reversed__(self) -> Iterator[Message]:
+        return reversed(self._messages.values())
+
+    def __contains__(self, message: Any) -> bool:
+        return self._messages.get(getattr(message, "id", None)) is message
+
+    def __getitem__(self, index: int) -> Message:
+        if index < 0:
+            index += len(self._messages)
+        if not 0 <= index < len(self._messages):
+            raise IndexError("message cache index out of range")
+        return next(itertools.islice(self._messages.values(), index, None))
+
+    def get(self, message_id: int | None) -> Message | None:
+        message = self._messages.get(message_id)  # type: ignore
+        if message is not None:
+            self._messages.move_to_end(message_id)  # type: ignore
+        return message
+
+    def append(self, message: Message) -> None:
+        messages = self._messages
+        messages[message.id] = message
+        messages.move_to_end(message.id)
+        self._channels.setdefault(message.channel.id, {})[message.id] = message
+        if len(messages) > self.maxlen:
+            self._unindex(messages.popitem(last=False)[1])
+
+    def remove(self, message: Message) -> None:
+        if self._messages.pop(message.id, None) is not None:
+            self._unindex(message)
+
+    def remove_channel(self, channel_id: int) -> None:
+        for message_id in self._channels.pop(channel_id, ()):
+            self._messages.pop(message_id, None)
+
+    def remove_many(self, messages: Iterable[Message]) -> None:
+        for message in messages:
+            self.remove(message)
+
+    def _unindex(self, message: Message) -> None:
+        channel_id = message.channel.id
+        channel = self._channels.get(channel_id)
+        if channel is not None:
+            channel.pop(message.id, None)
+            if not channel:
+                del self._channels[channel_id]
+
+
 class ConnectionState:
     if TYPE_CHECKING:
         _get_websocket: Callable[..., DiscordWebSocket]
@@ -242,6 +318,18 @@ class ConnectionState:
             cache_flags._verify_intents(intents)
 
         self.member_cache_flags: MemberCacheFlags = cache_flags
+        allowlist = options.get("dispatch_allowlist", None)
+        self.dispatch_allowlist: frozenset[str] | None = (
+            None if allowlist is None else frozenset(allowlist) | _REQUIRED_DISPATCH_EVENTS
+        )
+        # event name -> number of dispatches skipped due to dispatch_allowlist
+        self.skipped_events: collections.Counter[str] = collections.Counter()
+        # time spent decompressing and decoding gateway payloads
+        self.decode_latency: utils._LatencyHistogram = utils._LatencyHistogram()
+        self.joined_member_ttl: float | None = options.get("joined_member_ttl", None)
+        self.lazy_guilds: bool = options.get("lazy_guilds", False)
+        # timer expiring members cached due to joined_member_ttl
+        self._joined_expiry: asyncio.TimerHandle | None = None
         self._activity: ActivityPayload | None = activity
         self._status: str | None = status
         self._intents: Intents = intents
@@ -275,6 +363,18 @@ class ConnectionState:
         self._emojis: dict[int, Emoji] = {}
         self._stickers: dict[int, GuildSticker] = {}
         self._guilds: dict[int, Guild] = {}
+        # (expiry time, guild ID, member ID) of members cached due to joined_member_ttl
+        self._joined_members: Deque[tuple[float, int, int]] = deque()
+        # (guild ID, member ID) -> expiry time of the last join, older entries of _joined_members are skipped
+        self._joined_deadlines: dict[tuple[int, int], float] = {}
+        if self._joined_expiry is not None:
+            self._joined_expiry.cancel()
+            self._joined_expiry = None
+
+        # channel and thread ID -> channel or thread of the cached guilds
+        self._guild_channels: dict[int, GuildChannel | Thread] = {}
+        # channel and thread ID -> guild, for channels of lazy guilds that are not yet built
+        self._lazy_channels: dict[int, Guild] = {}
         if views:
             self._view_store: ViewStore = ViewStore(self)
         self._modal_store: ModalStore = ModalStore(self)
@@ -285,9 +385,9 @@ class ConnectionState:
         # extra dict to look up private channels by user id
         self._private_channels_by_user: dict[int, DMChannel] = {}
         if self.max_messages is not None:
-            self._messages: Deque[Message] | None = deque(maxlen=self.max_messages)
+            self._messages: MessageCache | None = MessageCache(self.max_messages)
         else:
-            self._messages: Deque[Message] | None = None
+            self._messages: MessageCache | None = None
 
     def process_chunk_requests(
         self, guild_id: int, nonce: str | None, members: list[Member], complete: bool
@@ -405,9 +505,17 @@ class ConnectionState:
         return self._guilds.get(guild_id)  # type: ignore
 
     def _add_guild(self, guild: Guild) -> None:
+        old_guild = self._guilds.get(guild.id)
+        if old_guild is not None and old_guild is not guild:
+            self._unindex_guild(old_guild)
+
         self._guilds[guild.id] = guild
+        self._index_guild(guild)
 
     def _remove_guild(self, guild: Guild) -> None:
+        if self._guilds.get(guild.id) is guild:
+            self._unindex_guild(guild)
+
         self._guilds.pop(guild.id, None)
 
         for emoji in guild.emojis:
@@ -434,6 +542,39 @@ class ConnectionState:
         # the keys of self._stickers are ints
         return self._stickers.get(sticker_id)  # type: ignore
 
+    def _index_guild(self, guild: Guild) -> None:
+        channels = self._guild_channels
+        lazy_channels = self._lazy_channels
+        for mapping in (guild._channels, guild._threads):
+            if isinstance(mapping, _LazyMapping):
+                # channels not yet built are resolved through their guild
+                channels.update(mapping._built)
+                for channel_id in mapping._pending:
+                    channels.pop(channel_id, None)
+                    lazy_channels[channel_id] = guild
+            else:
+                channels.update(mapping)
+
+    def _unindex_guild(self, guild: Guild) -> None:
+        channels = self._guild_channels
+        lazy_channels = self._lazy_channels
+        for mapping in (guild._channels, guild._threads):
+            for channel_id in mapping:
+                channels.pop(channel_id, None)
+                lazy_channels.pop(channel_id, None)
+
+    def _index_channel(self, guild: Guild, channel: GuildChannel | Thread) -> None:
+        # only channels of cached guilds are indexed, the ones of other guilds
+        # are indexed once (if) the guild is added to the cache
+        if self._guilds.get(guild.id) is guild:
+            self._guild_channels[channel.id] = channel
+            self._lazy_channels.pop(channel.id, None)
+
+    def _unindex_channel(self, guild: Guild, channel_id: int) -> None:
+        if self._guilds.get(guild.id) is guild:
+            self._guild_channels.pop(channel_id, None)
+            self._lazy_channels.pop(channel_id, None)
+
     @property
     def private_channels(self) -> list[PrivateChannel]:
         return list(self._private_channels.values())
@@ -478,17 +619,36 @@ class ConnectionState:
                 self._private_channels_by_user.pop(recipient.id, None)
 
     def _get_message(self, msg_id: int | None) -> Message | None:
-        return (
-            utils.find(lambda m: m.id == msg_id, reversed(self._messages))
-            if self._messages
-            else None
-        )
+        return self._messages.get(msg_id) if self._messages else None
 
     def _add_guild_from_data(self, data: GuildPayload) -> Guild:
         guild = Guild(data=data, state=self)
         self._add_guild(guild)
         return guild
 
+    def snapshot(self) -> dict[str, Any]:
+        """Returns a JSON serializable snapshot of the guilds, their roles, channels, threads
+        and cached members, which can be restored with :meth:`restore_snapshot`.
+        """
+        return {
+            "user_id": self.self_id,
+            "guilds": [g._snapshot() for g in self._guilds.values() if not g.unavailable],
+        }
+
+    def restore_snapshot(self, data: dict[str, Any]) -> bool:
+        """Fills the guild cache from a :meth:`snapshot`, made by the same user.
+        The cache is replaced once the gateway sends READY.
+
+        Returns whether the snapshot was restored.
+        """
+        if self.self_id is None or data.get("user_id") != self.self_id:
+            return False
+
+        for guild_data in data["guilds"]:
+            self._add_guild_from_data(guild_data)
+
+        return True
+
     def _guild_needs_chunking(self, guild: Guild) -> bool:
         # If presences are enabled then we get back the old guild.large behaviour
         return (
@@ -642,6 +802,8 @@ class ConnectionState:
         self._ready_task = asyncio.create_task(self._delay_ready())
 
     def parse_resumed(self, data) -> None:
+        # a session resumed at startup has no READY, the cache was restored from a snapshot
+        self.call_handlers("resumed")
         self.dispatch("resumed")
 
     def parse_application_command_permissions_update(self, data) -> None:
@@ -693,8 +855,11 @@ class ConnectionState:
     def parse_message_delete_bulk(self, data) -> None:
         raw = RawBulkMessageDeleteEvent(data)
         if self._messages:
+            get_message = self._messages.get
             found_messages = [
-                message for message in self._messages if message.id in raw.message_ids
+                message
+                for message_id in raw.message_ids
+                if (message := get_message(message_id)) is not None
             ]
         else:
             found_messages = []
@@ -702,9 +867,8 @@ class ConnectionState:
         self.dispatch("raw_bulk_message_delete", raw)
         if found_messages:
             self.dispatch("bulk_message_delete", found_messages)
-            for msg in found_messages:
-                # self._messages won't be None here
-                self._messages.remove(msg)  # type: ignore
+            # self._messages won't be None here
+            self._messages.remove_many(found_messages)  # type: ignore
 
     def parse_message_update(self, data) -> None:
         raw = RawMessageUpdateEvent(data)
@@ -867,6 +1031,8 @@ class ConnectionState:
             channel = guild.get_channel(channel_id)
             if channel is not None:
                 guild._remove_channel(channel)
+                if self._messages is not None:
+                    self._messages.remove_channel(channel_id)
                 self.dispatch("guild_channel_delete", channel)
 
     def parse_channel_update(self, data) -> None:
@@ -1017,6 +1183,8 @@ class ConnectionState:
 
         if thread is not None:
             guild._remove_thread(thread)  # type: ignore
+            if self._messages is not None:
+                self._messages.remove_channel(thread.id)
             self.dispatch("thread_delete", thread)
 
             if (msg := thread.starting_message) is not None:
@@ -1136,7 +1304,13 @@ class ConnectionState:
             return
 
         member = Member(guild=guild, data=data, state=self)
-        if self.member_cache_flags.joined:
+        if self.joined_member_ttl is not None:
+            guild._add_member(member)
+            deadline = time.monotonic() + self.joined_member_ttl
+            self._joined_members.append((deadline, guild.id, member.id))
+            self._joined_deadlines[(guild.id, member.id)] = deadline
+            self._schedule_joined_expiry()
+        elif self.member_cache_flags.joined:
             guild._add_member(member)
 
         if guild._member_count is not None:
@@ -1144,6 +1318,28 @@ class ConnectionState:
 
         self.dispatch("member_join", member)
 
+    def _schedule_joined_expiry(self) -> None:
+        if self._joined_expiry is None and self._joined_members:
+            delay = max(self._joined_members[0][0] - time.monotonic(), 0)
+            self._joined_expiry = self.loop.call_later(delay, self._expire_joined_members)
+
+    def _expire_joined_members(self) -> None:
+        self._joined_expiry = None
+        joined = self._joined_members
+        deadlines = self._joined_deadlines
+        now = time.monotonic()
+        while joined and joined[0][0] <= now:
+            deadline, guild_id, member_id = joined.popleft()
+            if deadlines.get((guild_id, member_id)) != deadline:  # Joined again later
+                continue
+
+            del deadlines[(guild_id, member_id)]
+            guild = self._guilds.get(guild_id)
+            if guild is not None and member_id != self.self_id:
+                guild._remove_member(Object(id=member_id))
+
+        self._schedule_joined_expiry()
+
     def parse_guild_member_remove(self, data) -> None:
         # Check if data contains necessary items
         user_data = data["user"]
@@ -1345,10 +1541,7 @@ class ConnectionState:
 
         # do a cleanup of the messages cache
         if self._messages is not None:
-            self._messages: Deque[Message] | None = deque(
-                (msg for msg in self._messages if msg.guild != guild),
-                maxlen=self.max_messages,
-            )
+            self._messages.remove_many([msg for msg in self._messages if msg.guild == guild])
 
         self._remove_guild(guild)
         self.dispatch("guild_remove", guild)
@@ -1434,6 +1627,7 @@ class ConnectionState:
             if role is not None:
                 old_role = copy.copy(role)
                 role._update(role_data)
+                guild._invalidate_permissions()
                 self.dispatch("guild_role_update", old_role, role)
         else:
             _log.debug(
@@ -1840,10 +2034,12 @@ class ConnectionState:
         if pm is not None:
             return pm
 
-        for guild in self.guilds:
-            channel = guild._resolve_channel(id)
-            if channel is not None:
-                return channel
+        channel = self._guild_channels.get(id)
+        if channel is None:
+            guild = self._lazy_channels.get(id)
+            if guild is not None:
+                channel = guild._resolve_channel(id)
+        return channel
 
     def create_message(
         self,
@@ -718,6 +718,36 @@ async def sane_wait_for(futures, *, timeout):
     return done
 
 
+class _LatencyHistogram:
+    """Histogram of durations, counted in buckets with the given upper bounds (in seconds)."""
+
+    __slots__ = ("bounds", "counts", "total", "max")
+
+    def __init__(self, bounds: Sequence[float] = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)):
+        self.bounds: tuple[float, ...] = tuple(bounds)
+        # the last bucket counts durations above the last bound
+        self.counts: list[int] = [0] * (len(self.bounds) + 1)
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+    def record(self, duration: float) -> None:
+        self.counts[bisect_left(self.bounds, duration)] += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+    def to_dict(self) -> dict[str, Any]:
+        buckets = {f"<={bound}s": count for bound, count in zip(self.bounds, self.counts)}
+        buckets[f">{self.bounds[-1]}s"] = self.counts[-1]
+        count = sum(self.counts)
+        return {
+            "count": count,
+            "mean": self.total / count if count else 0.0,
+            "max": self.max,
+            "buckets": buckets,
+        }
+
+
 def get_slots(cls: type[Any]) -> Iterator[str]:
     for mro in reversed(cls.__mro__):
         try:
@@ -1,7 +1,9 @@
 """
     This modules contains definitions related to the client (for API)
 """
-from typing import Optional, Union, List, Dict
+from typing import Any, Literal, Optional, Union, List, Dict
+from datetime import timedelta
+from enum import Enum, auto
 from aiohttp_socks import ProxyConnector
 from typeguard import typechecked
 from contextlib import suppress
@@ -11,12 +13,23 @@ from . import guild
 from . import web
 
 from .misc import async_util, instance_track, doc, attributes
+from .responder.engine import ResponderEngine
 from .logging.tracing import TraceLEVELS, trace
 from .events import *
 
 import _discord as discord
 import asyncio
 import copy
+import hashlib
+import json
+import os
+import time
+
+try:
+    from enum_tools.documentation import document_enum
+except ImportError:
+    def x(x): return x  # This is only needed for documentation
+    document_enum = x
 
 
 
@@ -24,14 +37,56 @@ import copy
 # Globals
 #######################################################################
 LOGIN_TIMEOUT_S = 15
+SESSION_MAX_AGE_S = 300  # Saved gateway sessions older than this are not resumed
 TOKEN_MAX_PRINT_LEN = 5
+# Gateway events parsed when ``skip_unused_events`` is enabled: the ones the framework listens to
+# and the ones needed to keep the guild, channel, role, member and message caches up to date.
+DISPATCH_ALLOWLIST = frozenset({
+    "MESSAGE_CREATE", "MESSAGE_UPDATE", "MESSAGE_DELETE", "MESSAGE_DELETE_BULK",
+    "GUILD_CREATE", "GUILD_UPDATE", "GUILD_DELETE",
+    "GUILD_MEMBER_ADD", "GUILD_MEMBER_UPDATE", "GUILD_MEMBER_REMOVE", "GUILD_MEMBERS_CHUNK",
+    "GUILD_ROLE_CREATE", "GUILD_ROLE_UPDATE", "GUILD_ROLE_DELETE",
+    "CHANNEL_CREATE", "CHANNEL_UPDATE", "CHANNEL_DELETE",
+    "THREAD_CREATE", "THREAD_UPDATE", "THREAD_DELETE", "THREAD_LIST_SYNC",
+    "THREAD_MEMBER_UPDATE", "THREAD_MEMBERS_UPDATE",
+    "INVITE_CREATE", "INVITE_DELETE",
+    "VOICE_STATE_UPDATE", "VOICE_SERVER_UPDATE",
+    "USER_UPDATE", "READY", "RESUMED",
+})
 
 
 __all__ = (
     "ACCOUNT",
+    "MemberCachePolicy",
 )
 
 
+@document_enum
+@doc.doc_category("Clients")
+class MemberCachePolicy(Enum):
+    """
+    .. versionadded:: 4.2
+
+    Which guild members an :class:`~daf.client.ACCOUNT` keeps cached.
+    """
+
+    FULL = 0
+    """
+    Cache all the members received from Discord (limited by ``intents``).
+    Required for :class:`~daf.responder.constraints.MemberOfGuildConstraint`.
+    """
+    SELF = auto()
+    """
+    Cache only the account's own member in each guild.
+    """
+    SELF_AND_JOINED = auto()
+    """
+    Cache the account's own member and the members that recently joined a guild.
+    How long joined members are cached is configured by the ``joined_member_ttl`` parameter of
+    :class:`~daf.client.ACCOUNT`.
+    """
+
+
 @instance_track.track_id
 @doc.doc_category("Clients")
 class ACCOUNT:
@@ -97,6 +152,56 @@ class ACCOUNT:
         .. versionadded:: 3.3
 
         List of automatic responders. These will automatically respond to certain messages.
+    member_cache: MemberCachePolicy
+        .. versionadded:: 4.2
+
+        Which guild members are kept cached. Advertising only needs the account's own members,
+        so :attr:`~daf.client.MemberCachePolicy.SELF` can save a lot of memory on accounts that are in
+        many large guilds. Defaults to :attr:`~daf.client.MemberCachePolicy.FULL`.
+    joined_member_ttl: timedelta
+        .. versionadded:: 4.2
+
+        For how long the members that joined a guild are cached when ``member_cache`` is
+        :attr:`~daf.client.MemberCachePolicy.SELF_AND_JOINED`. Defaults to 1 hour.
+    skip_unused_events: bool
+        .. versionadded:: 4.2
+
+        Skip parsing gateway events the framework doesn't use (typing, presences, reactions, ...),
+        which saves CPU time on accounts in many active guilds.
+        Don't enable it if you add your own listeners for such events to :py:attr:`~daf.client.ACCOUNT.client`.
+        Numbers of skipped events are available through :py:attr:`~daf.client.ACCOUNT.skipped_events`.
+        Defaults to False.
+    lazy_guilds: bool
+        .. versionadded:: 4.2
+
+        Build channels, threads and members of guilds only when they are first accessed,
+        instead of when the guilds are received from Discord.
+        This speeds up logging in to accounts that are in many large guilds and lowers their memory usage.
+        Defaults to False.
+    session_path: Optional[str]
+        .. versionadded:: 4.2
+
+        Path to a file, where the gateway session and a snapshot of the guilds, roles, channels, threads
+        and cached members are saved when the account is closed (eg. on shutdown or update).
+        On the next login, the session is resumed and the guilds are restored from the snapshot,
+        so the account doesn't need to wait for Discord to send all the guilds again.
+        If the session can't be resumed (eg. it's older than a few minutes), the account logs in normally
+        and the servers are initialized with the guilds Discord sends.
+        Each account should use a different file. Defaults to None (sessions are not saved).
+        Sessions of sharded accounts are not saved.
+    shards: Optional[int | Literal["auto"]]
+        .. versionadded:: 4.2
+
+        Number of shards (gateway connections) to split the guilds of a bot account into.
+        Bots in more than 2500 guilds can't connect without sharding.
+        If ``"auto"``, Discord's recommended number of shards is used.
+        Shard events are emitted through the account's event controller
+        (:attr:`~daf.events.EventID.discord_shard_ready`, ...) with the shard ID as the argument.
+        Defaults to None (a single connection, no sharding).
+    max_concurrency: Optional[int]
+        .. versionadded:: 4.2
+
+        How many shards can identify (login) at the same time. Defaults to the limit Discord reports for the bot.
 
     Raises
     ---------------
@@ -104,6 +209,8 @@ class ACCOUNT:
         'proxy' parameter was provided but requirements are not installed.
     ValueError
         'token' is not allowed if 'username' is provided and vice versa.
+    ValueError
+        'shards' is only allowed for bot accounts.
     """
     __slots__ = (
         "_token",
@@ -111,6 +218,13 @@ class ACCOUNT:
         "proxy",
         "intents",
         "removal_buffer_length",
+        "member_cache",
+        "joined_member_ttl",
+        "skip_unused_events",
+        "lazy_guilds",
+        "session_path",
+        "shards",
+        "max_concurrency",
         "_running",
         "_ws_task",
         "_servers",
@@ -119,7 +233,8 @@ class ACCOUNT:
         "_deleted",
         "_removed_servers",
         "_event_ctrl",
-        "_responders"
+        "_responders",
+        "_responder_engine",
     )
 
     _removed_servers: List[Union[guild.BaseGUILD, guild.AutoGUILD]]
@@ -137,7 +252,14 @@ class ACCOUNT:
         username: Optional[str] = None,
         password: Optional[str] = None,
         removal_buffer_length: int = 50,
-        responders: List[responder.ResponderBase] = None
+        responders: List[responder.ResponderBase] = None,
+        member_cache: MemberCachePolicy = MemberCachePolicy.FULL,
+        joined_member_ttl: timedelta = timedelta(hours=1),
+        skip_unused_events: bool = False,
+        lazy_guilds: bool = False,
+        session_path: Optional[str] = None,
+        shards: Union[int, Literal["auto"], None] = None,
+        max_concurrency: Optional[int] = None
     ) -> None:
 
         if token is not None and username is not None:  # Only one parameter of these at a time
@@ -146,6 +268,9 @@ class ACCOUNT:
         if token is None and username is None:  # At least one of these
             raise ValueError("At lest one parameter of these is required: 'token' OR 'username' + 'password'")
 
+        if shards is not None and (is_user or username is not None):  # Only bots can be sharded
+            raise ValueError("'shards' parameter is only allowed for bot accounts.")
+
         # If intents not passed, enable default
         if intents is None:
             intents = discord.Intents.default()
@@ -161,6 +286,13 @@ class ACCOUNT:
         self.proxy = proxy
         self.intents = intents
         self.removal_buffer_length = removal_buffer_length
+        self.member_cache = member_cache
+        self.joined_member_ttl = joined_member_ttl
+        self.skip_unused_events = skip_unused_events
+        self.lazy_guilds = lazy_guilds
+        self.session_path = session_path
+        self.shards = shards
+        self.max_concurrency = max_concurrency
         self._running = False
         self._servers = servers
         self._selenium = web.SeleniumCLIENT(username, password, proxy) if username is not None else None
@@ -169,6 +301,7 @@ class ACCOUNT:
         self._ws_task = None
         self._event_ctrl = EventController()
         self._responders = responders
+        self._responder_engine: ResponderEngine = None
 
         attributes.write_non_exist(self, "_removed_servers", [])
 
@@ -234,6 +367,47 @@ class ACCOUNT:
         """
         return self._deleted
 
+    @property
+    def skipped_events(self) -> Dict[str, int]:
+        """
+        .. versionadded:: 4.2
+
+        Returns the number of skipped gateway events (see ``skip_unused_events``) by event name.
+        """
+        if self._client is None:
+            return {}
+
+        return dict(self._client._connection.skipped_events)
+
+    @property
+    def decode_latency(self) -> Dict[str, Any]:
+        """
+        .. versionadded:: 4.2
+
+        Returns a histogram of time spent decompressing and decoding gateway payloads.
+        The result contains the number of payloads (``count``), the ``mean`` and ``max`` time in seconds
+        and the number of payloads by upper time bound (``buckets``).
+        """
+        if self._client is None:
+            return {}
+
+        return self._client._connection.decode_latency.to_dict()
+
+    @property
+    def ratelimit_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        .. versionadded:: 4.2
+
+        Returns statistics of the requests made to Discord's API, per rate limit bucket.
+        For each bucket, the result contains the number of ``requests``, how many were ``delayed``
+        to stay within the rate limit and for how long in total (``wait``, in seconds)
+        and how many were still ``rate_limited`` by Discord.
+        """
+        if self._client is None:
+            return {}
+
+        return self._client.http.ratelimit_stats
+
     @property
     def servers(self) -> List[Union[guild.GUILD, guild.AutoGUILD, guild.USER]]:
         """
@@ -442,24 +616,66 @@ class ACCOUNT:
         if self.proxy is not None:
             connector = ProxyConnector.from_url(self.proxy)
 
-        self._client = discord.Client(intents=self.intents, connector=connector)
+        self._client = self._create_client(
+            intents=self.intents,
+            connector=connector,
+            dispatch_allowlist=DISPATCH_ALLOWLIST if self.skip_unused_events else None,
+            lazy_guilds=self.lazy_guilds,
+            **self._get_cache_options()
+        )
 
         # Login
         trace("Logging in...")
         ws_task = None
         try:
             await self._client.login(self._token, not self.is_user)
-            ws_task = asyncio.create_task(self._client.connect())
-            self._ws_task = ws_task
-            await self._client.wait_for("ready", timeout=LOGIN_TIMEOUT_S)
-            trace(f"Logged in as {self._client.user.display_name}")
+            session = await self._load_session()
+            if session is not None and self._client._connection.restore_snapshot(session["cache"]):
+                # Guilds are already restored, only the gateway's confirmation (RESUMED) is needed.
+                # If the session can't be resumed, the client identifies and READY replaces the restored guilds,
+                # so the servers must not be initialized before either of them.
+                ws_task = asyncio.create_task(self._client.connect(session=session["session"]))
+                self._ws_task = ws_task
+                ready = asyncio.ensure_future(self._client.wait_until_ready())  # RESUMED or READY
+                await asyncio.wait((ready, ws_task), timeout=LOGIN_TIMEOUT_S, return_when=asyncio.FIRST_COMPLETED)
+                if not ready.done():
+                    ready.cancel()
+                    if not ws_task.done():
+                        raise asyncio.TimeoutError
+
+                    raise ConnectionError("Connection to Discord closed before the session was resumed")
+
+                if self._client.ws.session_id == session["session"]["session_id"]:
+                    trace(f"Logged in as {self._client.user.display_name} (resumed session)")
+                else:
+                    trace(f"Logged in as {self._client.user.display_name} (session could not be resumed)")
+            else:
+                ws_task = asyncio.create_task(self._client.connect())
+                self._ws_task = ws_task
+                if self.shards is None:
+                    await self._client.wait_for("ready", timeout=LOGIN_TIMEOUT_S)
+                else:
+                    # Login time depends on the number of shards, which may not be known yet.
+                    # Wait until all the shards are ready or connecting fails.
+                    ready = asyncio.ensure_future(self._client.wait_for("ready"))
+                    await asyncio.wait((ready, ws_task), return_when=asyncio.FIRST_COMPLETED)
+                    if not ready.done():
+                        ready.cancel()
+                        raise ConnectionError("Connection to Discord closed before all shards were ready")
+
+                trace(f"Logged in as {self._client.user.display_name}")
         except Exception as exc:
-            exc = ws_task.exception() if ws_task is not None and ws_task.done() else exc
+            if ws_task is not None and ws_task.done() and ws_task.exception() is not None:
+                exc = ws_task.exception()
+
             trace(f"Could not login to Discord - {self}", TraceLEVELS.ERROR, exc)
             raise exc
 
+        self._responder_engine = ResponderEngine(self._client)
+        self._responder_engine.start()
         for responder in self._responders:
             await responder.initialize(self._event_ctrl, self.client)
+            self._responder_engine.add(responder)
 
         self._add_listeners()
         self._event_ctrl.start()
@@ -519,11 +735,13 @@ class ACCOUNT:
         "Event handler that adds a responder"
         await resp.initialize(self._event_ctrl, self._client)
         self._responders.append(resp)
+        self._responder_engine.add(resp)
 
     def _on_remove_responder(self, resp: responder.ResponderBase):
         "Event handler that adds a responder"
         with suppress(ValueError):
             self._responders.remove(resp)
+            self._responder_engine.remove(resp)
             resp.close()
 
     async def _on_update(self, **kwargs):
@@ -562,6 +780,8 @@ class ACCOUNT:
         self._running = False
         self._remove_listeners()
 
+        self._responder_engine.clear()
+        await self._responder_engine.stop()
         for responder in self._responders:
             responder.close()
 
@@ -572,8 +792,10 @@ class ACCOUNT:
         if selenium is not None:
             selenium._close()
 
-        await self._client.close()
+        # Sessions of sharded accounts are not saved, so they are closed on Discord's side as well
+        await self._client.close(keep_session=self.session_path is not None and self.shards is None)
         await asyncio.gather(self._ws_task, return_exceptions=True)
+        await self._save_session()
         return self._event_ctrl.stop()
 
     # Other private methods
@@ -586,6 +808,90 @@ class ACCOUNT:
         self._token = result
         self.is_user = True
 
+    def _create_client(self, **kwargs) -> discord.Client:
+        "Creates the Discord client, sharded if ``shards`` is set."
+        if self.shards is None:
+            return discord.Client(**kwargs)
+
+        return discord.AutoShardedClient(
+            shard_count=None if self.shards == "auto" else self.shards,
+            max_concurrency=self.max_concurrency,
+            **kwargs
+        )
+
+    def _get_session_owner(self) -> str:
+        "Returns the hash of the token, which identifies the account a saved session belongs to."
+        return hashlib.sha256(self._token.encode()).hexdigest()
+
+    async def _load_session(self) -> Optional[dict]:
+        """
+        Loads (and removes) the gateway session saved by :py:meth:`~daf.client.ACCOUNT._save_session`.
+        Returns None if there is no session or it can't be resumed by this account.
+        """
+        if self.session_path is None or self.shards is not None:
+            return None
+
+        def read():
+            with open(self.session_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+
+            os.remove(self.session_path)  # A session can only be resumed once
+            return data
+
+        try:
+            data = await asyncio.get_event_loop().run_in_executor(None, read)
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            trace(f"Could not load saved gateway session of {self}", TraceLEVELS.WARNING, exc)
+            return None
+
+        if (
+            data.get("owner") != self._get_session_owner() or
+            data.get("intents") != self.intents.value or
+            time.time() - data.get("saved_at", 0) > SESSION_MAX_AGE_S
+        ):
+            return None
+
+        return data
+
+    async def _save_session(self):
+        "Saves the gateway session and a snapshot of the guild cache to ``session_path``."
+        if self.session_path is None or (session := self._client.session) is None:
+            return
+
+        data = {
+            "owner": self._get_session_owner(),
+            "intents": self.intents.value,
+            "saved_at": time.time(),
+            "session": session,
+            "cache": self._client._connection.snapshot(),
+        }
+
+        def write():
+            tmp_path = f"{self.session_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(data, file)
+
+            os.replace(tmp_path, self.session_path)
+
+        try:
+            await asyncio.get_event_loop().run_in_executor(None, write)
+        except Exception as exc:
+            trace(f"Could not save gateway session of {self}", TraceLEVELS.WARNING, exc)
+
+    def _get_cache_options(self) -> dict:
+        "Returns the client's options of the member cache, based on the ``member_cache`` policy."
+        policy = self.member_cache
+        if policy is MemberCachePolicy.FULL:
+            return {}
+
+        options = {"member_cache_flags": discord.MemberCacheFlags.none(), "chunk_guilds_at_startup": False}
+        if policy is MemberCachePolicy.SELF_AND_JOINED:
+            options["joined_member_ttl"] = self.joined_member_ttl.total_seconds()
+
+        return options
+
     def _check_intents(self):
         intents = self.intents
         if not intents.members:
@@ -629,8 +935,20 @@ class ACCOUNT:
         self._client.add_listener(self._discord_on_invite_delete, "on_invite_delete")
         self._client.add_listener(self._discord_on_guild_join, "on_guild_join")
         self._client.add_listener(self._discord_on_guild_remove, "on_guild_remove")
+        self._client.add_listener(self._discord_on_guild_channel_create, "on_guild_channel_create")
+        self._client.add_listener(self._discord_on_guild_channel_delete, "on_guild_channel_delete")
+        self._client.add_listener(self._discord_on_guild_channel_update, "on_guild_channel_update")
+        self._client.add_listener(self._discord_on_guild_role_create, "on_guild_role_create")
+        self._client.add_listener(self._discord_on_guild_role_delete, "on_guild_role_delete")
+        self._client.add_listener(self._discord_on_guild_role_update, "on_guild_role_update")
+        self._client.add_listener(self._discord_on_member_update, "on_member_update")
+        if self.shards is not None:
+            self._client.add_listener(self._discord_on_shard_ready, "on_shard_ready")
+            self._client.add_listener(self._discord_on_shard_disconnect, "on_shard_disconnect")
+            self._client.add_listener(self._discord_on_shard_resumed, "on_shard_resumed")
 
         # Client listeners
+        event_ctrl.add_listener(EventID.discord_message, self._responder_engine.handle_message)
         event_ctrl.add_listener(EventID._trigger_account_update, self._on_update)
         event_ctrl.add_listener(EventID._trigger_server_remove, self._on_remove_server)
         event_ctrl.add_listener(EventID._trigger_server_add, self._on_add_server)
@@ -641,6 +959,7 @@ class ACCOUNT:
         self._client._listeners.clear()
 
         event_ctrl = self._event_ctrl
+        event_ctrl.remove_listener(EventID.discord_message, self._responder_engine.handle_message)
         event_ctrl.remove_listener(EventID._trigger_account_update, self._on_update)
         event_ctrl.remove_listener(EventID._trigger_server_remove, self._on_remove_server)
         event_ctrl.remove_listener(EventID._trigger_server_add, self._on_add_server)
@@ -663,3 +982,34 @@ class ACCOUNT:
 
     async def _discord_on_guild_remove(self, guild: discord.Guild):
         self._event_ctrl.emit(EventID.discord_guild_remove, guild)
+
+    async def _discord_on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        self._event_ctrl.emit(EventID.discord_guild_channel_create, channel)
+
+    async def _discord_on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        self._event_ctrl.emit(EventID.discord_guild_channel_delete, channel)
+
+    async def _discord_on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        self._event_ctrl.emit(EventID.discord_guild_channel_update, before, after)
+
+    async def _discord_on_guild_role_create(self, role: discord.Role):
+        self._event_ctrl.emit(EventID.discord_guild_role_create, role)
+
+    async def _discord_on_guild_role_delete(self, role: discord.Role):
+        self._event_ctrl.emit(EventID.discord_guild_role_delete, role)
+
+    async def _discord_on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        self._event_ctrl.emit(EventID.discord_guild_role_update, before, after)
+
+    async def _discord_on_member_update(self, before: discord.Member, after: discord.Member):
+        if after.id == self.client.user.id:  # Only our own member affects what we can send to
+            self._event_ctrl.emit(EventID.discord_member_update, before, after)
+
+    async def _discord_on_shard_ready(self, shard_id: int):
+        self._event_ctrl.emit(EventID.discord_shard_ready, shard_id)
+
+    async def _discord_on_shard_disconnect(self, shard_id: int):
+        self._event_ctrl.emit(EventID.discord_shard_disconnect, shard_id)
+
+    async def _discord_on_shard_resumed(self, shard_id: int):
+        self._event_ctrl.emit(EventID.discord_shard_resumed, shard_id)
@@ -64,7 +64,8 @@ CONVERSION_ATTRS = {
             "_running": False,
             "_client": None,
             "_ws_task": None,
-            "_event_ctrl": events.EventController()
+            "_event_ctrl": events.EventController(),
+            "_responder_engine": None,
         },
     },
     guild.AutoGUILD: {
@@ -85,6 +86,8 @@ CONVERSION_ATTRS = {
             "parent": None,
             "removed_channels": set(),
             "channel_getter": None,
+            "_cache_valid": False,
+            "_event_ctrl": None,
         },
     },
     web.SeleniumCLIENT: {
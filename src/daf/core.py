@@ -496,6 +496,7 @@ async def shutdown() -> None:
 
     GLOBALS.accounts.clear()
     evt.remove_listener(EventID.g_account_expired, cleanup_account)
+    await logging.close()
 
     trace("Shutdown complete.", TraceLEVELS.NORMAL)
 
@@ -70,6 +70,16 @@ class EventID(Enum):
     discord_guild_join = auto()
     discord_guild_remove = auto()
     discord_message = auto()
+    discord_guild_channel_create = auto()
+    discord_guild_channel_delete = auto()
+    discord_guild_channel_update = auto()
+    discord_guild_role_create = auto()
+    discord_guild_role_delete = auto()
+    discord_guild_role_update = auto()
+    discord_member_update = auto()
+    discord_shard_ready = auto()
+    discord_shard_disconnect = auto()
+    discord_shard_resumed = auto()
 
     _dummy = auto()  # For stopping the event loop
 
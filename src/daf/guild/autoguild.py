@@ -210,7 +210,7 @@ class AutoGUILD:
         client: discord.Client = self.parent.client
         guilds = [
             g for g in client.guilds
-            if self.include_pattern.check(g.name)
+            if self.include_pattern.compile().check(g.name)
         ]
         return guilds
 
@@ -353,12 +353,12 @@ class AutoGUILD:
                 self._event_ctrl.add_listener(
                     EventID.discord_member_join,
                     self._on_member_join,
-                    predicate=lambda memb: self.include_pattern.check(memb.guild.name)
+                    predicate=lambda memb: self.include_pattern.compile().check(memb.guild.name)
                 )
                 self._event_ctrl.add_listener(
                     EventID.discord_invite_delete,
                     self._on_invite_delete,
-                    predicate=lambda inv: self.include_pattern.check(inv.guild.name)
+                    predicate=lambda inv: self.include_pattern.compile().check(inv.guild.name)
                 )
             except discord.HTTPException as exc:
                 trace(f"Could not query invite links in {self}", TraceLEVELS.ERROR, exc)
@@ -370,7 +370,7 @@ class AutoGUILD:
         self._event_ctrl.add_listener(
             EventID.discord_guild_join,
             self._on_guild_join,
-            predicate=lambda guild: self.include_pattern.check(guild.name)
+            predicate=lambda guild: self.include_pattern.compile().check(guild.name)
         )
 
         self._event_ctrl.add_listener(
@@ -483,7 +483,7 @@ class AutoGUILD:
             try:
                 # Get next result from top.gg
                 yielded: web.QueryResult = await self.guild_query_iter.__anext__()
-                if self.include_pattern.check(yielded.name):
+                if self.include_pattern.compile().check(yielded.name):
                     return yielded
             except StopAsyncIteration:
                 trace(f"Iterated though all found guilds -> stopping guild join in {self}.", TraceLEVELS.NORMAL)
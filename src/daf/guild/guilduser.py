@@ -346,7 +346,10 @@ class BaseGUILD(ABC):
         guild_ctx = self.generate_log_context()
         author_ctx = self.parent.generate_log_context()
 
-        if (message_context := await message._send()) and self.logging:
+        with self.parent._responder_engine.advertising():  # Responses wait for the advertisement
+            message_context = await message._send()
+
+        if message_context and self.logging:
             await logging.save_log(guild_ctx, message_context, author_ctx)
 
         message._reset_timer()    
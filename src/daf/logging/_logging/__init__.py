@@ -60,6 +60,15 @@ def get_logger() -> LoggerBASE:
     return GLOBAL.logger
 
 
+async def close() -> None:
+    """
+    Closes the selected logger and its fallbacks,
+    saving any logs that are not yet saved.
+    """
+    if GLOBAL.logger is not None:
+        await GLOBAL.logger._close()
+
+
 def _set_logger(logger: LoggerBASE):
     """
     Set's the logger to something new.
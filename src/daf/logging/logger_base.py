@@ -3,7 +3,7 @@ This module is responsible for the logging in daf.
 It contains all the logging classes.
 """
 from datetime import datetime, date
-from typing import Optional, Literal, Union, Tuple, List, Any
+from typing import Optional, Literal, Union, Tuple, List, Any, AsyncIterator, Callable
 
 from abc import ABC, abstractmethod
 
@@ -56,6 +56,26 @@ class LoggerBASE(ABC):
                       TraceLEVELS.WARNING, exc)
                 self.fallback = None
 
+    async def _save_fallback(self, logs: List[tuple]):
+        "Saves logs that could not be saved to the fallback."
+        for timestruct, *contexts in logs:
+            mgr = self.fallback
+            while mgr is not None:
+                try:
+                    await mgr._save_log(*contexts)
+                    break
+                except Exception as exc:
+                    trace(f"{type(mgr).__name__} failed, falling to {type(mgr.fallback).__name__}",
+                          TraceLEVELS.WARNING, exc)
+                    mgr = mgr.fallback
+            else:
+                trace("Could not save log to the manager or any of it's fallback", TraceLEVELS.ERROR)
+
+    async def _close(self) -> None:
+        "Closes self and the fallback, saving any logs that are not yet saved."
+        if self.fallback is not None:
+            await self.fallback._close()
+
     @abstractmethod
     async def _save_log(
         self,
@@ -155,6 +175,78 @@ class LoggerBASE(ABC):
     ) -> list:
         raise NotImplementedError
 
+    async def analytic_get_message_log_page(
+        self,
+        guild: Union[int, None] = None,
+        author: Union[int, None] = None,
+        after: Union[datetime, None] = None,
+        before: Union[datetime, None] = None,
+        success_rate: Tuple[float, float] = (0, 100),
+        guild_type: Union[Literal["USER", "GUILD"], None] = None,
+        message_type: Union[Literal["TextMESSAGE", "VoiceMESSAGE", "DirectMESSAGE"], None] = None,
+        sort_by_direction: Literal["asc", "desc"] = "desc",
+        limit: int = 500,
+        cursor: Optional[str] = None
+    ) -> Tuple[list, Optional[str]]:
+        """
+        .. versionadded:: v4.2
+
+        Returns one page of message logs, sorted by the timestamp, and the cursor of the next page.
+        Pages are found by the position of the last log (keyset pagination), so only the logs of
+        one page are in memory at once, no matter how many logs were saved.
+
+        Parameters
+        -----------
+        guild, author, after, before, success_rate, guild_type, message_type
+            Filters, same as in :py:meth:`~daf.logging.LoggerBASE.analytic_get_message_log`.
+        sort_by_direction: Literal["asc", "desc"]
+            Sort the logs by the timestamp in selected direction (asc = ascending, desc = descending).
+            Defaults to "desc".
+        limit: int
+            Maximum number of logs in the page. Defaults to 500.
+        cursor: Optional[str]
+            Cursor returned with the previous page. None (default) returns the first page.
+
+        Returns
+        --------
+        tuple[list, str | None]
+            The logs and the cursor of the next page, which is None if there are no more logs.
+        """
+        raise NotImplementedError
+
+    async def analytic_iter_message_log(
+        self,
+        guild: Union[int, None] = None,
+        author: Union[int, None] = None,
+        after: Union[datetime, None] = None,
+        before: Union[datetime, None] = None,
+        success_rate: Tuple[float, float] = (0, 100),
+        guild_type: Union[Literal["USER", "GUILD"], None] = None,
+        message_type: Union[Literal["TextMESSAGE", "VoiceMESSAGE", "DirectMESSAGE"], None] = None,
+        sort_by_direction: Literal["asc", "desc"] = "desc",
+        page_size: int = 500
+    ) -> AsyncIterator:
+        """
+        .. versionadded:: v4.2
+
+        Asynchronous generator of message logs, sorted by the timestamp.
+        Logs are obtained in pages of ``page_size`` logs with
+        :py:meth:`~daf.logging.LoggerBASE.analytic_get_message_log_page`.
+        """
+        async for log in self._iter_pages(
+            self.analytic_get_message_log_page,
+            page_size,
+            guild=guild,
+            author=author,
+            after=after,
+            before=before,
+            success_rate=success_rate,
+            guild_type=guild_type,
+            message_type=message_type,
+            sort_by_direction=sort_by_direction
+        ):
+            yield log
+
     @abstractmethod
     async def analytic_get_num_invites(
             self,
@@ -181,6 +273,88 @@ class LoggerBASE(ABC):
     ) -> list:
         raise NotImplementedError
 
+    async def analytic_get_invite_log_page(
+        self,
+        guild: Union[int, None] = None,
+        invite: Union[str, None] = None,
+        after: Union[datetime, None] = None,
+        before: Union[datetime, None] = None,
+        sort_by_direction: Literal["asc", "desc"] = "desc",
+        limit: int = 500,
+        cursor: Optional[str] = None
+    ) -> Tuple[list, Optional[str]]:
+        """
+        .. versionadded:: v4.2
+
+        Returns one page of invite logs, sorted by the timestamp, and the cursor of the next page.
+        See :py:meth:`~daf.logging.LoggerBASE.analytic_get_message_log_page`.
+        """
+        raise NotImplementedError
+
+    async def analytic_iter_invite_log(
+        self,
+        guild: Union[int, None] = None,
+        invite: Union[str, None] = None,
+        after: Union[datetime, None] = None,
+        before: Union[datetime, None] = None,
+        sort_by_direction: Literal["asc", "desc"] = "desc",
+        page_size: int = 500
+    ) -> AsyncIterator:
+        """
+        .. versionadded:: v4.2
+
+        Asynchronous generator of invite logs, sorted by the timestamp.
+        Logs are obtained in pages of ``page_size`` logs with
+        :py:meth:`~daf.logging.LoggerBASE.analytic_get_invite_log_page`.
+        """
+        async for log in self._iter_pages(
+            self.analytic_get_invite_log_page,
+            page_size,
+            guild=guild,
+            invite=invite,
+            after=after,
+            before=before,
+            sort_by_direction=sort_by_direction
+        ):
+            yield log
+
+    @staticmethod
+    async def _iter_pages(get_page, page_size: int, **kwargs) -> AsyncIterator:
+        "Yields logs of all the pages returned by ``get_page``."
+        cursor = None
+        while True:
+            logs, cursor = await get_page(**kwargs, limit=page_size, cursor=cursor)
+            for log in logs:
+                yield log
+
+            if cursor is None:
+                break
+
+    @staticmethod
+    def _make_cursor(
+        logs: list,
+        limit: Optional[int],
+        get_position: Callable[[Any], Tuple[datetime, int]]
+    ) -> Optional[str]:
+        """
+        Returns the cursor of the page after ``logs``, positioned at the timestamp and id of the last log,
+        returned by ``get_position``. Returns None when the page is not full, as there are no more logs.
+        """
+        if not logs or limit is None or len(logs) < limit:
+            return None
+
+        timestamp, id_ = get_position(logs[-1])
+        return f"{timestamp.isoformat()}/{id_}"
+
+    @staticmethod
+    def _parse_cursor(cursor: str) -> Tuple[datetime, int]:
+        "Returns the timestamp and the id of the log, the ``cursor`` is positioned at."
+        try:
+            timestamp, id_ = cursor.rsplit("/", 1)
+            return datetime.fromisoformat(timestamp), int(id_)
+        except ValueError as exc:
+            raise ValueError(f"Invalid cursor: {cursor}") from exc
+
     @abstractmethod
     async def delete_logs(self, table: Any, logs: List[Any]):
         """
@@ -5,8 +5,8 @@ from .tracing import trace
 from ..misc import doc
 from ..misc.instance_track import track_id
 
-from .logger_base import LoggerBASE, C_FILE_NAME_FORBIDDEN_CHAR
-from .logger_file import LoggerFileBASE
+from .logger_base import LoggerBASE
+from .logger_file import LoggerFileBASE, _FileWriter
 
 import json
 import csv
@@ -21,6 +21,10 @@ __all__ = ("LoggerCSV",)
 @doc.doc_category("Logging reference", path="logging")
 class LoggerCSV(LoggerFileBASE):
     """
+    .. versionchanged:: v4.2
+        Logs are written in batches by a separate thread.
+        Old logs can be compressed and deleted (``compress_after_days`` and ``delete_after_days``).
+
     .. versionadded:: v2.2
 
     .. caution::
@@ -44,6 +48,33 @@ class LoggerCSV(LoggerFileBASE):
         The delimiter between columns to use. Defaults to ';'
     fallback: Optional[LoggerBASE]
         The manager to use, in case saving using this manager fails.
+    flush_size: Optional[int]
+        .. versionadded:: v4.2
+
+        Logs are written to files by a separate thread, in batches.
+        A batch is written once this many logs are waiting to be written. Defaults to 100.
+    flush_interval: Optional[float]
+        .. versionadded:: v4.2
+
+        Maximum time in seconds a log waits to be written. Defaults to 1.
+    compress_after_days: Optional[int]
+        .. versionadded:: v4.2
+
+        Days of logs at least this many days old (1 is every day before today) are compressed
+        into a single ``Year/Month/Day.tar.gz`` archive per day, by a background task.
+        Analytics read the archives transparently. Defaults to None (logs are not compressed).
+    delete_after_days: Optional[int]
+        .. versionadded:: v4.2
+
+        Days of logs (directories and archives) at least this many days old are deleted,
+        by a background task. Defaults to None (logs are kept).
+    analytic_workers: Optional[int]
+        .. versionadded:: v4.2
+
+        Number of worker processes reading files for analytics that read many files at once
+        (see :ref:`File log summaries`). Workers import the main script,
+        so DAF must be started inside ``if __name__ == "__main__":``.
+        Defaults to 1 (files are read by the writer thread, without worker processes).
 
     Raises
     ----------
@@ -57,10 +88,17 @@ class LoggerCSV(LoggerFileBASE):
         self,
         path: str = str(pathlib.Path.home().joinpath("daf/History")),
         delimiter: str = ';',
-        fallback: Optional[LoggerBASE] = None
+        fallback: Optional[LoggerBASE] = None,
+        flush_size: int = 100,
+        flush_interval: float = 1.0,
+        compress_after_days: Optional[int] = None,
+        delete_after_days: Optional[int] = None,
+        analytic_workers: int = 1
     ) -> None:
         self.delimiter = delimiter
-        super().__init__(path, fallback)
+        super().__init__(
+            path, fallback, flush_size, flush_interval, compress_after_days, delete_after_days, analytic_workers
+        )
 
     async def delete_logs(self, table: Any, logs: List[Any]):
         """
@@ -85,47 +123,34 @@ class LoggerCSV(LoggerFileBASE):
         if invite_context is not None:  # Not implemented on CSV
             raise NotImplementedError("Invite tracking not available when using LoggerCSV")
 
-        timestruct = datetime.now()
-        timestamp = "{:02d}.{:02d}.{:04d} {:02d}:{:02d}:{:02d}".format(timestruct.day, timestruct.month, timestruct.year,
-                                                                    timestruct.hour, timestruct.minute, timestruct.second)
-
-        logging_output = (pathlib.Path(self.path)
-                        .joinpath("{:02d}".format(timestruct.year))
-                        .joinpath("{:02d}".format(timestruct.month))
-                        .joinpath("{:02d}".format(timestruct.day)))
-
-        logging_output.mkdir(parents=True, exist_ok=True)
-        logging_output = logging_output.joinpath("".join(char if char not in C_FILE_NAME_FORBIDDEN_CHAR
-                                                              else "#" for char in guild_context["name"]) + ".csv")          
-        # Create file if it doesn't exist
-        if not logging_output.exists():
-            logging_output.touch()
-
-        # Write to file
-        with open(logging_output, 'a', encoding='utf-8', newline='') as f_writer:
-            try:
-                csv_writer = csv.writer(f_writer, delimiter=self.delimiter, quoting=csv.QUOTE_NONNUMERIC, quotechar='"')
-                # Timestamp, Guild Type, Guild Name, Guild Snowflake, Author Name, Author Snowflake
-                # Message Type, Sent Data, Message Mode, Message Channels, Success Info
-                channels_str = message_context.get("channels", "")
-                success_info_str = message_context.get("success_info", "")
-
-                if channels_str:
-                    channels_str = json.dumps(channels_str, ensure_ascii=False)
-
-                if success_info_str:
-                    success_info_str = json.dumps(success_info_str, ensure_ascii=False)
-
-                csv_writer.writerow([
-                    self._generate_snowflake(),
-                    timestamp, guild_context["type"], guild_context["name"], guild_context["id"],
-                    *list(author_context.values()),
-                    message_context["type"], json.dumps(message_context["sent_data"], ensure_ascii=False),
-                    message_context.get("mode", ""), channels_str, success_info_str
-                ])
-
-            except Exception as exc:
-                raise OSError(*exc.args) from exc  # Raise OSError for any type of exceptions
+        await super()._save_log(guild_context, message_context, author_context, invite_context)
+
+    def _write_logs(self, filename: str, logs: List[tuple], writer: _FileWriter):
+        f_writer = writer.open(filename, newline='')
+        csv_writer = csv.writer(f_writer, delimiter=self.delimiter, quoting=csv.QUOTE_NONNUMERIC, quotechar='"')
+        rows = []
+        for timestruct, guild_context, message_context, author_context, invite_context in logs:
+            # Timestamp, Guild Type, Guild Name, Guild Snowflake, Author Name, Author Snowflake
+            # Message Type, Sent Data, Message Mode, Message Channels, Success Info
+            channels_str = message_context.get("channels", "")
+            success_info_str = message_context.get("success_info", "")
+
+            if channels_str:
+                channels_str = json.dumps(channels_str, ensure_ascii=False)
+
+            if success_info_str:
+                success_info_str = json.dumps(success_info_str, ensure_ascii=False)
+
+            rows.append([
+                self._generate_snowflake(),
+                self._stamp_from_datetime(timestruct),
+                guild_context["type"], guild_context["name"], guild_context["id"],
+                *list(author_context.values()),
+                message_context["type"], json.dumps(message_context["sent_data"], ensure_ascii=False),
+                message_context.get("mode", ""), channels_str, success_info_str
+            ])
+
+        csv_writer.writerows(rows)
 
     def _get_msg_log_process_file(
         self,
@@ -140,7 +165,7 @@ class LoggerCSV(LoggerFileBASE):
         filename
     ):
         logs = []
-        with open(filename, encoding="utf-8") as file:
+        with self._open_log(filename) as file:
             for (
                 index, stamp, guild_type_r, guild_name, guild_id, author_name, author_id, message_type_r,
                 sent_data, send_mode, channels, dm_success
@@ -179,13 +204,7 @@ class LoggerCSV(LoggerFileBASE):
                 guild_ctx = {"type": guild_type_r, "name": guild_name, "id": guild_id}
                 author_ctx = {"name": author_name, "id": author_id}
 
-                if dm_success is not None:
-                    calc_success_rate = 0.0 if not dm_success["success"] else 1.0
-                else:
-                    calc_success_rate = (
-                        100.0 * len(channels["successful"]) /
-                        (len(channels["successful"]) + len(channels["failed"]))
-                    )
+                calc_success_rate = self._calc_success_rate({"channels": channels, "success_info": dm_success})
 
                 if calc_success_rate < success_rate[0] or calc_success_rate > success_rate[1]: 
                     continue
@@ -1,34 +1,902 @@
 """
 Implements common functionality of file-based loggers.
 """
-from typing import Union, Tuple, Literal, Optional, Iterator, get_args
+from typing import (
+    Union, Tuple, Literal, Optional, Iterator, Callable, Dict, List, TextIO, Any, Iterable, get_args
+)
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from time import time
-from datetime import datetime
+from time import time, monotonic, perf_counter
+from datetime import datetime, timedelta, date
 from abc import abstractmethod
+from contextlib import suppress
 
-from .logger_base import LoggerBASE
-from ..logging.tracing import trace
+from .logger_base import LoggerBASE, C_FILE_NAME_FORBIDDEN_CHAR
+from ..logging.tracing import trace, TraceLEVELS
 
+import multiprocessing
+import threading
+import itertools
+import tarfile
+import asyncio
+import atexit
+import shutil
+import heapq
+import queue
+import json
+import io
 import os
 
 
+# Configuration
+WRITE_QUEUE_SIZE = 10_000  # Maximum number of logs waiting to be written, before saving a log waits
+WRITE_MAX_OPEN_FILES = 32  # Maximum number of files the writer keeps open between writes
+INDEX_FILENAME = ".daf_index"  # Name of the file, inside each directory, containing summaries of the log files
+INDEX_VERSION = 2
+INDEX_CACHE_SIZE = 1000  # Maximum number of directories whose summaries are kept in memory
+ANALYTIC_MIN_FILES = 200  # Minimum number of files read at once for them to be read by the worker processes
+ARCHIVE_EXTENSION = ".tar.gz"  # Extension of the archives, days of logs are compressed into (Year/Month/Day.tar.gz)
+ARCHIVE_CACHE_SIZE = 4  # Maximum number of archives whose decompressed files are kept in memory for reading
+RETENTION_INTERVAL = 3600  # Seconds between compressing and deleting old logs (compress / delete_after_days)
+
+
+def _escape_filename(name: str) -> str:
+    "Replaces characters that are not allowed inside file names."
+    return "".join(
+        char
+        if char not in C_FILE_NAME_FORBIDDEN_CHAR
+        else "#" for char in name
+    )
+
+
+class _FileWriter:
+    """
+    Writes the logs of a file logger inside a dedicated thread.
+
+    Logs are queued and written in batches (one write for each file), once ``flush_size`` logs
+    are queued or ``flush_interval`` seconds have passed since the oldest log was queued.
+    Files opened for appending are kept open between the writes.
+    When :data:`WRITE_QUEUE_SIZE` logs are waiting to be written, queuing a log waits for the writer.
+
+    Other file operations (reading, deleting logs) are ran through :py:meth:`run`,
+    which first writes the queued logs, so that the thread is the only one accessing the files.
+    """
+    _STOP = object()
+    _CALL = object()
+
+    def __init__(self, logger: "LoggerFileBASE", flush_size: int, flush_interval: float) -> None:
+        self.logger = logger
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.closed = False
+        self._loop = asyncio.get_running_loop()
+        self._queue = queue.SimpleQueue()
+        self._slots = asyncio.Semaphore(WRITE_QUEUE_SIZE)
+        self._handles: Dict[str, TextIO] = OrderedDict()
+        self._stats = {
+            "queued": 0,
+            "max_queued": 0,
+            "written": 0,
+            "failed": 0,
+            "batches": 0,
+            "blocked": 0,
+            "blocked_time": 0.0,
+            "last_batch_time": 0.0,
+        }
+        self._thread = threading.Thread(target=self._run, name=f"{type(logger).__name__} writer", daemon=True)
+        self._thread.start()
+        atexit.register(self._stop)
+
+    @property
+    def stats(self) -> dict:
+        "Returns a copy of the writer statistics."
+        return self._stats.copy()
+
+    async def put(self, filename: str, log: tuple):
+        "Queues the ``log`` for writing into ``filename``."
+        stats = self._stats
+        if self._slots.locked():  # Queue is full
+            stats["blocked"] += 1
+            start = perf_counter()
+            await self._slots.acquire()
+            stats["blocked_time"] += perf_counter() - start
+        else:
+            await self._slots.acquire()
+
+        self._queue.put((filename, log))
+        stats["queued"] += 1
+        stats["max_queued"] = max(stats["max_queued"], stats["queued"])
+
+    async def run(self, fnc: Callable, *args) -> Any:
+        "Writes the queued logs and then calls ``fnc`` with ``args`` inside the thread."
+        future = Future()
+        self._queue.put((self._CALL, (fnc, args, future)))
+        return await asyncio.wrap_future(future)
+
+    def open(self, filename: str, **kwargs) -> TextIO:
+        "Returns a file opened for appending. Called from the thread."
+        handles = self._handles
+        if (handle := handles.pop(filename, None)) is None:
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            handle = open(filename, 'a', encoding='utf-8', **kwargs)
+            if len(handles) >= WRITE_MAX_OPEN_FILES:
+                handles.popitem(last=False)[1].close()
+
+        handles[filename] = handle  # Most recently used is last
+        return handle
+
+    async def close(self):
+        "Writes all the queued logs and stops the thread."
+        if self.closed:
+            return
+
+        self.closed = True
+        self._queue.put((self._STOP, None))
+        await self._loop.run_in_executor(None, self._thread.join)
+        atexit.unregister(self._stop)
+
+    def _stop(self):
+        "Writes all the queued logs at interpreter exit."
+        self.closed = True
+        self._queue.put((self._STOP, None))
+        self._thread.join()
+
+    def _run(self):
+        batch: Dict[str, List[tuple]] = {}
+        size = 0
+        deadline = None
+        get = self._queue.get
+        while True:
+            try:
+                filename, item = get(timeout=None if deadline is None else max(deadline - monotonic(), 0))
+            except queue.Empty:
+                filename = None
+
+            if filename is not None and filename is not self._STOP and filename is not self._CALL:
+                batch.setdefault(filename, []).append(item)
+                size += 1
+                if deadline is None:
+                    deadline = monotonic() + self.flush_interval
+
+                if size < self.flush_size:
+                    continue
+
+            self._write(batch)
+            batch = {}
+            size = 0
+            deadline = None
+            if filename is self._STOP:
+                self._close_handles()
+                return
+
+            if filename is self._CALL:
+                self._close_handles()
+                fnc, args, future = item
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(fnc(*args))
+                    except Exception as exc:
+                        future.set_exception(exc)
+
+    def _write(self, batch: Dict[str, List[tuple]]):
+        if not batch:
+            return
+
+        start = perf_counter()
+        written = 0
+        failed: List[tuple] = []
+        logger = self.logger
+        for filename, logs in batch.items():
+            try:
+                stat = _stat(filename)
+                logger._write_logs(filename, logs, self)
+                if (handle := self._handles.get(filename)) is not None:
+                    handle.flush()
+
+                written += len(logs)
+            except Exception as exc:
+                trace(f"Could not write {len(logs)} logs to {filename}", TraceLEVELS.ERROR, exc)
+                if (handle := self._handles.pop(filename, None)) is not None:
+                    with suppress(OSError):
+                        handle.close()
+
+                failed.extend(logs)
+                continue
+
+            logger._summarize_written(filename, logs, stat)
+
+        logger._index.save()
+        with suppress(RuntimeError):  # Loop closed (interpreter exit)
+            self._loop.call_soon_threadsafe(self._written, written, failed, perf_counter() - start)
+
+    def _written(self, written: int, failed: List[tuple], duration: float):
+        "Updates the statistics and frees the queue. Called from the event loop."
+        stats = self._stats
+        count = written + len(failed)
+        stats["queued"] -= count
+        stats["written"] += written
+        stats["failed"] += len(failed)
+        stats["batches"] += 1
+        stats["last_batch_time"] = duration
+        for _ in range(count):
+            self._slots.release()
+
+        if failed:
+            asyncio.create_task(self.logger._save_fallback(failed))
+
+    def _close_handles(self):
+        for handle in self._handles.values():
+            with suppress(OSError):
+                handle.close()
+
+        self._handles.clear()
+
+
+def _run_reader(reader: "LoggerFileBASE", method: str, *args) -> Any:
+    "Calls ``method`` of the ``reader`` (see :py:meth:`LoggerFileBASE._get_reader`). Runs in worker processes."
+    return getattr(reader, method)(*args)
+
+
+def _stat(filename: str) -> Optional[os.stat_result]:
+    "Returns the status of the file or None if it doesn't exist."
+    try:
+        return os.stat(filename)
+    except FileNotFoundError:
+        return None
+
+
+class _ArchiveCache:
+    """
+    Decompressed files of the most recently read archives of compressed days.
+    Analytics read each file more than once (eg. message and invite logs), while each archive is decompressed once.
+
+    Shared by the writer threads of all the loggers (and the worker processes' own copies).
+    """
+    def __init__(self) -> None:
+        self._archives: Dict[str, Tuple[tuple, Dict[str, bytes]]] = OrderedDict()  # Path => (stat, name => content)
+        self._lock = threading.Lock()
+
+    def read(self, archive: str) -> Dict[str, bytes]:
+        "Returns the files inside the ``archive`` (name => content)."
+        stat = os.stat(archive)
+        key = (stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            cached = self._archives.pop(archive, None)
+
+        if cached is None or cached[0] != key:
+            files = {}
+            with tarfile.open(archive, "r:gz") as tar:
+                for member in tar:
+                    if member.isfile():
+                        files[member.name] = tar.extractfile(member).read()
+
+            cached = (key, files)
+
+        with self._lock:
+            self._archives[archive] = cached  # Most recently used is last
+            while len(self._archives) > ARCHIVE_CACHE_SIZE:
+                self._archives.popitem(last=False)
+
+        return cached[1]
+
+    def forget(self, archive: str):
+        "Removes the files of the ``archive``, which was rewritten, from the cache."
+        with self._lock:
+            self._archives.pop(archive, None)
+
+    def open(self, filename: str) -> TextIO:
+        "Opens a file inside an archive, given as ``<archive>/<file name>``, for reading."
+        archive, name = os.path.split(filename)
+        try:
+            content = self.read(archive)[name]
+        except KeyError:
+            raise FileNotFoundError(f"{name} is not inside {archive}") from None
+
+        return io.StringIO(content.decode("utf-8"))
+
+
+_archives = _ArchiveCache()
+
+
+class _SummaryIndex:
+    """
+    Summaries of log files, which allow analytics to skip files that can't contain the requested logs
+    and to count logs without reading the files.
+
+    Summaries of files inside a directory are saved in the directory's :data:`INDEX_FILENAME` file.
+    Files inside archives of compressed days are summarized in the archive's directory,
+    under ``<archive name>/<file name>``, and use the status of the archive.
+    Each summary contains the size and modification time of the file it was made from (a summary
+    that doesn't match the file is outdated), the time range of the logs and the number of logs:
+
+    - ``messages``: rows of [day, guild id, guild type, author id, message type, guild name, author name,
+      successful, failed].
+    - ``invites``: rows of [day, guild id, invite id, guild name, count].
+
+    Only used from the writer thread.
+    """
+    def __init__(self) -> None:
+        self._indexes: Dict[str, Dict[str, dict]] = OrderedDict()  # Directory => file name => summary
+        self._changed = set()
+
+    @staticmethod
+    def new() -> dict:
+        "Returns a summary without any logs."
+        return {"first": None, "last": None, "messages": [], "invites": []}
+
+    @classmethod
+    def add_message(
+        cls,
+        summary: dict,
+        timestamp: datetime,
+        guild: dict,
+        author: dict,
+        message_type: str,
+        successful: bool
+    ):
+        "Adds a message log to the ``summary``."
+        cls._add_row(
+            summary,
+            "messages",
+            timestamp,
+            [guild["id"], guild["type"], author["id"], message_type],
+            [guild["name"], author["name"]],
+            [1, 0] if successful else [0, 1]
+        )
+
+    @classmethod
+    def add_invite(cls, summary: dict, timestamp: datetime, guild: dict, invite: str):
+        "Adds an invite log to the ``summary``."
+        cls._add_row(summary, "invites", timestamp, [guild["id"], invite], [guild["name"]], [1])
+
+    @staticmethod
+    def _add_row(summary: dict, kind: str, timestamp: datetime, key: list, names: list, counts: list):
+        first = timestamp.replace(microsecond=0)
+        # Rounded up, so that logs are never after the end of the range (files are counted from it, without reading)
+        last = first + timedelta(seconds=1) if timestamp.microsecond else first
+        stamp = first.isoformat(" ")
+        if summary["first"] is None or stamp < summary["first"]:
+            summary["first"] = stamp
+
+        stamp = last.isoformat(" ")
+        if summary["last"] is None or stamp > summary["last"]:
+            summary["last"] = stamp
+
+        key = [timestamp.date().isoformat(), *key]
+        key_size = len(key)
+        for row in summary[kind]:
+            if row[:key_size] == key:
+                for i, count in enumerate(counts, len(row) - len(counts)):
+                    row[i] += count
+
+                return
+
+        summary[kind].append(key + names + counts)
+
+    @staticmethod
+    def get_rows(summary: dict, kind: str, after: datetime, before: datetime) -> List[list]:
+        "Returns rows of ``kind`` (messages / invites) from days in ``after`` - ``before``."
+        if summary["first"] is None:
+            return []
+
+        if datetime.fromisoformat(summary["last"]) < after or datetime.fromisoformat(summary["first"]) > before:
+            return []
+
+        first_day = after.date().isoformat()
+        last_day = before.date().isoformat()
+        return [row for row in summary[kind] if first_day <= row[0] <= last_day]
+
+    @staticmethod
+    def is_within(summary: dict, after: datetime, before: datetime) -> bool:
+        "Returns True if all the logs of the summary are inside ``after`` - ``before``."
+        return (
+            summary["first"] is None or
+            after <= datetime.fromisoformat(summary["first"]) and datetime.fromisoformat(summary["last"]) <= before
+        )
+
+    def get(self, filename: str, stat: Optional[os.stat_result]) -> Optional[dict]:
+        "Returns the summary of the file, if it exists and matches the file's ``stat``."
+        directory, name = self._split(filename)
+        summary = self._load(directory).get(name)
+        if (
+            summary is None or stat is None or
+            summary["size"] != stat.st_size or summary["mtime"] != stat.st_mtime_ns
+        ):
+            return None
+
+        return summary
+
+    def set(self, filename: str, summary: dict, stat: os.stat_result):
+        "Sets the summary of the file, made from the file with the ``stat`` status."
+        directory, name = self._split(filename)
+        summary["size"] = stat.st_size
+        summary["mtime"] = stat.st_mtime_ns
+        self._load(directory)[name] = summary
+        self._changed.add(directory)
+
+    def remove(self, filename: str):
+        "Removes the summary of the file."
+        directory, name = self._split(filename)
+        if self._load(directory).pop(name, None) is not None:
+            self._changed.add(directory)
+
+    def get_archived(self, archive: str, stat: os.stat_result) -> Optional[List[str]]:
+        """
+        Returns names of the files inside the ``archive``, from their summaries.
+        None if there are no summaries matching the archive's ``stat``.
+        """
+        directory, name = os.path.split(archive)
+        prefix = name + "/"
+        names = [
+            key[len(prefix):] for key, summary in self._load(directory).items()
+            if key.startswith(prefix) and summary["size"] == stat.st_size and summary["mtime"] == stat.st_mtime_ns
+        ]
+        return names or None
+
+    def remove_archived(self, archive: str):
+        "Removes summaries of the files inside the ``archive``."
+        directory, name = os.path.split(archive)
+        prefix = name + "/"
+        index = self._load(directory)
+        for key in [key for key in index if key.startswith(prefix)]:
+            del index[key]
+            self._changed.add(directory)
+
+    def forget(self, directory: str):
+        "Forgets summaries of files inside the ``directory``, which was removed."
+        self._indexes.pop(directory, None)
+        self._changed.discard(directory)
+
+    def keep(self, directory: str, names: Iterable[str]):
+        "Removes summaries of files inside ``directory`` that are not in ``names`` (no longer exist)."
+        index = self._load(directory)
+        for name in index.keys() - set(names):
+            del index[name]
+            self._changed.add(directory)
+
+    def save(self):
+        "Saves the changed summaries."
+        for directory in self._changed:
+            self._save(directory, self._indexes[directory])
+
+        self._changed.clear()
+
+    def _load(self, directory: str) -> Dict[str, dict]:
+        indexes = self._indexes
+        if (index := indexes.pop(directory, None)) is None:
+            index = {}
+            with suppress(OSError, ValueError, KeyError, TypeError):  # Not yet existing or invalid index
+                with open(os.path.join(directory, INDEX_FILENAME), 'r', encoding="utf-8") as reader:
+                    data = json.load(reader)
+
+                if data["version"] == INDEX_VERSION:
+                    index = data["files"]
+
+            if len(indexes) >= INDEX_CACHE_SIZE:
+                old_directory, old_index = indexes.popitem(last=False)
+                if old_directory in self._changed:
+                    self._changed.remove(old_directory)
+                    self._save(old_directory, old_index)
+
+        indexes[directory] = index  # Most recently used is last
+        return index
+
+    def _save(self, directory: str, index: Dict[str, dict]):
+        filename = os.path.join(directory, INDEX_FILENAME)
+        try:
+            with open(filename + ".tmp", 'w', encoding="utf-8") as writer:
+                json.dump({"version": INDEX_VERSION, "files": index}, writer, ensure_ascii=False)
+
+            os.replace(filename + ".tmp", filename)
+        except OSError as exc:
+            trace(f"Could not save the log summaries to {filename}", TraceLEVELS.WARNING, exc)
+
+    @staticmethod
+    def _split(filename: str) -> Tuple[str, str]:
+        "Returns the directory, whose index contains the summary of the file, and the file's name inside the index."
+        directory, name = os.path.split(filename)
+        if directory.endswith(ARCHIVE_EXTENSION):
+            directory, archive = os.path.split(directory)
+            name = f"{archive}/{name}"
+
+        return directory, name
+
+
 class LoggerFileBASE(LoggerBASE):
     EXTENSION = NotImplemented
+    # Extensions of files read by analytics. Defaults to EXTENSION.
+    READ_EXTENSIONS = None
 
     def __init__(
         self,
         path: str = str(Path.home().joinpath("daf/History")),
-        fallback: Optional[LoggerBASE] = None
+        fallback: Optional[LoggerBASE] = None,
+        flush_size: int = 100,
+        flush_interval: float = 1.0,
+        compress_after_days: Optional[int] = None,
+        delete_after_days: Optional[int] = None,
+        analytic_workers: int = 1
     ) -> None:
+        if analytic_workers < 1:
+            raise ValueError(f"analytic_workers must be at least 1 (got {analytic_workers})")
+
+        for name, days in (("compress_after_days", compress_after_days), ("delete_after_days", delete_after_days)):
+            if days is not None and days < 1:
+                raise ValueError(f"{name} must be at least 1 (got {days})")
+
         self.path = path
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.compress_after_days = compress_after_days
+        self.delete_after_days = delete_after_days
+        self.analytic_workers = analytic_workers
         self._sequence_number = 0
+        self._writer: _FileWriter = None
+        self._index = _SummaryIndex()
+        self._pool: ProcessPoolExecutor = None
+        self._retention_task: asyncio.Task = None
         super().__init__(fallback)
 
+    @property
+    def write_stats(self) -> dict:
+        """
+        .. versionadded:: v4.2
+
+        Returns statistics of the writer thread: number of logs waiting to be written (``queued``),
+        the maximum ever waiting (``max_queued``), logs ``written`` and ``failed`` (saved to the fallback instead),
+        number of ``batches`` written, duration of the last batch in seconds (``last_batch_time``),
+        how many times saving a log had to wait for the writer, due to a full queue (``blocked``)
+        and the total time in seconds spent waiting (``blocked_time``).
+        """
+        if self._writer is None:
+            return {}
+
+        return self._writer.stats
+
+    async def flush(self) -> None:
+        """
+        .. versionadded:: v4.2
+
+        Waits for all the logs that were saved so far to be written into files.
+        """
+        await self._run_file_task(lambda: None)
+
+    async def apply_retention(self) -> None:
+        """
+        .. versionadded:: v4.2
+
+        Compresses days of logs that are at least ``compress_after_days`` days old and deletes days of logs
+        that are at least ``delete_after_days`` days old. Called automatically every
+        ``daf.logging.logger_file.RETENTION_INTERVAL`` seconds, if any of the parameters is set.
+
+        Raises
+        ----------
+        OSError
+            Could not compress or delete the files.
+        """
+        today = date.today()
+        for day, path in await self._run_file_task(self._get_days):
+            age = (today - day).days
+            if self.delete_after_days is not None and age >= self.delete_after_days:
+                await self._run_file_task(self._delete_day, path)
+            elif (
+                self.compress_after_days is not None and age >= self.compress_after_days and
+                not path.endswith(ARCHIVE_EXTENSION)
+            ):
+                await self._run_file_task(self._compress_day, path)
+
     def initialize(self):
         trace(f"{type(self).__name__} logs will be saved to {self.path}")
+        self._get_writer()
+        if self.compress_after_days is not None or self.delete_after_days is not None:
+            self._retention_task = asyncio.create_task(self._retain())
+
         return super().initialize()
 
+    async def update(self, **kwargs):
+        self._stop_retention()
+        await self._close_writer()
+        await super().update(**kwargs)
+
+    async def _close(self):
+        self._stop_retention()
+        await self._close_writer()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+        await super()._close()
+
+    async def _close_writer(self):
+        if self._writer is not None:
+            await self._writer.close()
+
+    async def _retain(self):
+        "Applies the retention every :data:`RETENTION_INTERVAL` seconds."
+        while True:
+            try:
+                await self.apply_retention()
+            except Exception as exc:
+                trace(f"Could not compress or delete old logs of {type(self).__name__}", TraceLEVELS.ERROR, exc)
+
+            await asyncio.sleep(RETENTION_INTERVAL)
+
+    def _stop_retention(self):
+        if self._retention_task is not None:
+            self._retention_task.cancel()
+            self._retention_task = None
+
+    def _get_days(self) -> List[Tuple[date, str]]:
+        "Returns paths to the day directories and archives of compressed days, with their dates, oldest first."
+        days = []
+        for year in self._list_numbered(self.path):
+            for month in self._list_numbered(os.path.join(self.path, year)):
+                directory = os.path.join(self.path, year, month)
+                for name in os.listdir(directory):
+                    path = os.path.join(directory, name)
+                    if name.endswith(ARCHIVE_EXTENSION) and os.path.isfile(path):
+                        name = name[:-len(ARCHIVE_EXTENSION)]
+                    elif not os.path.isdir(path):
+                        continue
+
+                    with suppress(ValueError):  # Not a day
+                        days.append((date(int(year), int(month), int(name)), path))
+
+        days.sort()
+        return days
+
+    @staticmethod
+    def _list_numbered(directory: str) -> List[str]:
+        "Returns names of the numbered (year, month) directories inside ``directory``."
+        if not os.path.isdir(directory):
+            return []
+
+        return [
+            name for name in os.listdir(directory)
+            if name.isdigit() and os.path.isdir(os.path.join(directory, name))
+        ]
+
+    def _compress_day(self, directory: str):
+        """
+        Compresses the files of a day ``directory`` into the ``<directory>.tar.gz`` archive, together with
+        their summaries, and removes the directory. Files of an already existing archive (logs written after
+        the day was compressed) are kept, unless the directory contains a file with the same name.
+        """
+        names = [name for name in os.listdir(directory) if name != INDEX_FILENAME]
+        if any(not os.path.isfile(os.path.join(directory, name)) for name in names):
+            trace(f"Could not compress {directory}, it contains other directories", TraceLEVELS.WARNING)
+            return
+
+        extensions = self.READ_EXTENSIONS or self.EXTENSION
+        archive = directory + ARCHIVE_EXTENSION
+        index = self._index
+        summaries: Dict[str, Optional[dict]] = {}  # Of the log files
+        try:
+            with tarfile.open(archive + ".tmp", "w:gz") as tar:
+                if (stat := _stat(archive)) is not None:
+                    with tarfile.open(archive, "r:gz") as old_tar:
+                        for member in old_tar:
+                            if member.isfile() and member.name not in names:
+                                tar.addfile(member, old_tar.extractfile(member))
+                                if member.name.endswith(extensions):
+                                    summaries[member.name] = index.get(os.path.join(archive, member.name), stat)
+
+                for name in names:
+                    filename = os.path.join(directory, name)
+                    if name.endswith(extensions):
+                        if (summary := index.get(filename, os.stat(filename))) is None:
+                            summary = self._summarize_file(filename)
+
+                        summaries[name] = summary
+
+                    tar.add(filename, name)
+
+            os.replace(archive + ".tmp", archive)
+        except Exception:
+            with suppress(OSError):
+                os.remove(archive + ".tmp")
+
+            raise
+
+        # Analytics list the archived files from their summaries, so either all the files have one or none
+        index.remove_archived(archive)
+        if all(summary is not None for summary in summaries.values()):
+            stat = os.stat(archive)
+            for name, summary in summaries.items():
+                index.set(os.path.join(archive, name), summary, stat)
+
+        index.forget(directory)
+        shutil.rmtree(directory)
+        index.save()
+
+    def _rewrite_archive(self, archive: str, rewrite: Callable[[str, bytes], Optional[bytes]]):
+        """
+        Rewrites files inside the ``archive`` of a compressed day. ``rewrite`` is called with the name
+        and the content of each file and returns the new content, or None if the file is unchanged.
+        The archive is only replaced if any of its files changed, after which the summaries of its files are updated.
+        """
+        files = _archives.read(archive)
+        changed: Dict[str, bytes] = {}
+        for name, content in files.items():
+            if (new_content := rewrite(name, content)) is not None:
+                changed[name] = new_content
+
+        if not changed:
+            return
+
+        stat = os.stat(archive)
+        try:
+            with tarfile.open(archive + ".tmp", "w:gz") as tar, tarfile.open(archive, "r:gz") as old_tar:
+                for member in old_tar:
+                    if not member.isfile():
+                        continue
+
+                    if member.name in changed:
+                        content = changed[member.name]
+                        member.size = len(content)
+                        tar.addfile(member, io.BytesIO(content))
+                    else:
+                        tar.addfile(member, old_tar.extractfile(member))
+
+            os.replace(archive + ".tmp", archive)
+        except Exception:
+            with suppress(OSError):
+                os.remove(archive + ".tmp")
+
+            raise
+
+        _archives.forget(archive)
+        extensions = self.READ_EXTENSIONS or self.EXTENSION
+        index = self._index
+        summaries: Dict[str, dict] = {}
+        for name in files:
+            if name.endswith(extensions):
+                filename = os.path.join(archive, name)
+                if name in changed or (summary := index.get(filename, stat)) is None:
+                    summary = self._summarize_file(filename)
+
+                summaries[name] = summary
+
+        index.remove_archived(archive)
+        stat = os.stat(archive)
+        for name, summary in summaries.items():
+            index.set(os.path.join(archive, name), summary, stat)
+
+        index.save()
+
+    def _delete_day(self, path: str):
+        """
+        Deletes a day directory or an archive of a compressed day, together with the summaries of its files.
+        Month and year directories left without logs are deleted as well.
+        """
+        index = self._index
+        if path.endswith(ARCHIVE_EXTENSION):
+            os.remove(path)
+            index.remove_archived(path)
+        else:
+            index.forget(path)
+            shutil.rmtree(path)
+
+        root = os.path.normpath(self.path)
+        directory = os.path.dirname(path)
+        while os.path.normpath(directory) != root and set(os.listdir(directory)) <= {INDEX_FILENAME}:
+            index.forget(directory)
+            shutil.rmtree(directory)
+            directory = os.path.dirname(directory)
+
+        index.save()
+
+    def _get_writer(self) -> _FileWriter:
+        "Returns the writer, starting it if it's not running."
+        if self._writer is None or self._writer.closed:
+            self._writer = _FileWriter(self, self.flush_size, self.flush_interval)
+
+        return self._writer
+
+    async def _run_file_task(self, fnc: Callable, *args) -> Any:
+        "Calls ``fnc`` with ``args`` inside the writer thread, after all the queued logs were written."
+        return await self._get_writer().run(fnc, *args)
+
+    def _map_files(self, fnc: Callable[..., Any], filenames: List[str], *args) -> list:
+        """
+        Returns results of ``fnc``, a method of the logger, called with chunks of ``filenames`` and ``args``.
+        The chunks are processed by ``analytic_workers`` worker processes when there are at least
+        :data:`ANALYTIC_MIN_FILES` files, otherwise ``fnc`` is called with all the files in the current thread.
+        """
+        if not filenames:
+            return []
+
+        if self.analytic_workers > 1 and len(filenames) >= ANALYTIC_MIN_FILES:
+            try:
+                pool = self._get_pool()
+                reader = self._get_reader()
+                size = -(-len(filenames) // (self.analytic_workers * 4))  # A few chunks per worker balance the load
+                futures = [
+                    pool.submit(_run_reader, reader, fnc.__name__, filenames[i:i + size], *args)
+                    for i in range(0, len(filenames), size)
+                ]
+                return [future.result() for future in futures]
+            except BrokenProcessPool as exc:
+                trace(
+                    "Analytics worker processes stopped, reading files in the writer thread.", TraceLEVELS.WARNING, exc
+                )
+                self._pool = None
+
+        return [fnc(filenames, *args)]
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """
+        Returns the pool of worker processes reading files for analytics, starting it if it's not running.
+        Workers are started from a fresh process (forkserver or spawn), never forked from this multithreaded one,
+        whose locks could be held by other threads at the time of forking.
+        """
+        if self._pool is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            self._pool = ProcessPoolExecutor(self.analytic_workers, multiprocessing.get_context(method))
+
+        return self._pool
+
+    def _get_reader(self) -> "LoggerFileBASE":
+        """
+        Returns a copy of the logger for reading files inside worker processes,
+        without the writer, the summaries and the fallback, which can't be sent to other processes.
+        """
+        reader = object.__new__(type(self))
+        reader.__dict__.update(
+            (name, value) for name, value in vars(self).items()
+            if name not in ("_writer", "_index", "_pool", "_retention_task", "_mutex", "fallback")
+        )
+        return reader
+
+    async def _save_log(
+        self,
+        guild_context: dict,
+        message_context: Optional[dict] = None,
+        author_context: Optional[dict] = None,
+        invite_context: Optional[dict] = None
+    ):
+        timestruct = datetime.now()
+        filename = os.path.join(
+            self.path,
+            "{:02d}".format(timestruct.year),
+            "{:02d}".format(timestruct.month),
+            "{:02d}".format(timestruct.day),
+            _escape_filename(guild_context["name"]) + self._get_write_extension()
+        )
+        await self._get_writer().put(
+            filename,
+            (timestruct, guild_context, message_context, author_context, invite_context)
+        )
+
+    def _stamp_from_datetime(self, timestruct: datetime) -> str:
+        return "{:02d}.{:02d}.{:04d} {:02d}:{:02d}:{:02d}".format(
+            timestruct.day, timestruct.month, timestruct.year,
+            timestruct.hour, timestruct.minute, timestruct.second
+        )
+
+    def _get_write_extension(self) -> str:
+        "Returns the extension of files the logs are written into."
+        return self.EXTENSION
+
+    @abstractmethod
+    def _write_logs(self, filename: str, logs: List[tuple], writer: _FileWriter):
+        """
+        Writes a batch of logs into ``filename``. Called from the writer thread.
+
+        Parameters
+        ------------
+        filename: str
+            Path to the file.
+        logs: List[tuple]
+            Logs to write. Each log is a tuple of the datetime the log was created at and
+            the guild, message, author and invite contexts.
+        writer: _FileWriter
+            The writer, which can open files for appending through its ``open`` method.
+        """
+        raise NotImplementedError
+
     def _generate_snowflake(self) -> int:
         """
         Generates an unique snowflake index (id) for identifying logs.
@@ -46,12 +914,144 @@ class LoggerFileBASE(LoggerBASE):
         self._sequence_number = (seq + 1) % 0xFF  # modules by max value of 8 bits
         return snowflake
 
-    def _get_files(self, filetype: str) -> Iterator[str]:
+    def _get_files(self, filetype: Union[str, Tuple[str, ...]]) -> Iterator[str]:
         for path, dirs, files in os.walk(self.path):
             for filename in files:
                 if filename.endswith(filetype):
                     yield os.path.join(path, filename)
 
+    def _get_summarized_files(self) -> Iterator[Tuple[str, dict]]:
+        """
+        Yields log files, read by analytics, together with their summaries.
+        Missing and outdated summaries are made by reading the files.
+        """
+        extensions = self.READ_EXTENSIONS or self.EXTENSION
+        index = self._index
+        summarized = []  # Files with their stat and summary
+        outdated = []
+        try:
+            for path, dirs, files in os.walk(self.path):
+                entries = []  # Names inside the index, paths and stats of the files
+                for name in files:
+                    filename = os.path.join(path, name)
+                    if name.endswith(extensions):
+                        entries.append((name, filename, os.stat(filename)))
+                    elif name.endswith(ARCHIVE_EXTENSION):  # Files of a compressed day
+                        stat = os.stat(filename)
+                        if (members := index.get_archived(filename, stat)) is None:
+                            members = [member for member in _archives.read(filename) if member.endswith(extensions)]
+
+                        entries.extend(
+                            (f"{name}/{member}", os.path.join(filename, member), stat) for member in members
+                        )
+
+                if not entries:
+                    continue
+
+                index.keep(path, [name for name, _, _ in entries])
+                for _, filename, stat in entries:
+                    if (summary := index.get(filename, stat)) is None:
+                        outdated.append(len(summarized))
+
+                    summarized.append([filename, stat, summary])
+
+            summaries = self._map_files(self._summarize_files, [summarized[i][0] for i in outdated])
+            for i, summary in zip(outdated, itertools.chain.from_iterable(summaries)):
+                summarized[i][2] = summary
+                index.set(summarized[i][0], summary, summarized[i][1])
+        finally:
+            index.save()
+
+        for filename, _, summary in summarized:
+            yield filename, summary
+
+    @staticmethod
+    def _open_log(filename: str) -> TextIO:
+        """
+        Opens a log file for reading.
+        Files inside archives of compressed days are given as ``<archive>/<file name>``.
+        """
+        if os.path.dirname(filename).endswith(ARCHIVE_EXTENSION):
+            return _archives.open(filename)
+
+        return open(filename, 'r', encoding="utf-8")
+
+    def _summarize_files(self, filenames: List[str]) -> List[dict]:
+        "Returns summaries of the files. Called with chunks of files by :py:meth:`_map_files`."
+        return [self._summarize_file(filename) for filename in filenames]
+
+    def _summarize_file(self, filename: str) -> dict:
+        "Reads all the logs of the file and returns their summary."
+        summary = _SummaryIndex.new()
+        for log in self._get_msg_log_process_file(
+            None, None, datetime.min, datetime.max, (0, 100), None, None, [], filename
+        ):
+            _SummaryIndex.add_message(
+                summary, log["timestamp"], log["guild"], log["author"], log["type"], log["success_rate"] == 100
+            )
+
+        for log in self._get_invite_log_process_file(None, None, datetime.min, datetime.max, filename):
+            # Logs contain the invite's URL
+            _SummaryIndex.add_invite(summary, log["timestamp"], log["guild"], log["invite"].rsplit("/", 1)[-1])
+
+        return summary
+
+    def _summarize_written(self, filename: str, logs: List[tuple], stat: Optional[os.stat_result]):
+        """
+        Adds logs, that were just written, to the summary of ``filename``. Called from the writer thread.
+
+        Parameters
+        ------------
+        filename: str
+            Path to the file.
+        logs: List[tuple]
+            The written logs.
+        stat: Optional[os.stat_result]
+            Status of the file before the logs were written, None if it didn't exist.
+        """
+        index = self._index
+        try:
+            new_stat = os.stat(filename)
+            summary = None
+            if stat is None:
+                summary = _SummaryIndex.new()
+            elif new_stat.st_size >= stat.st_size:  # Otherwise the file was replaced (eg. split by size)
+                summary = index.get(filename, stat)
+
+            if summary is None:
+                summary = self._summarize_file(filename)
+            else:
+                for timestruct, guild_context, message_context, author_context, invite_context in logs:
+                    if message_context is not None:
+                        _SummaryIndex.add_message(
+                            summary,
+                            timestruct,
+                            guild_context,
+                            author_context,
+                            message_context["type"],
+                            self._calc_success_rate(message_context) == 100
+                        )
+
+                    if invite_context is not None:
+                        _SummaryIndex.add_invite(summary, timestruct, guild_context, invite_context["id"])
+
+            index.set(filename, summary, new_stat)
+        except Exception as exc:
+            trace(f"Could not update the summary of {filename}", TraceLEVELS.WARNING, exc)
+            index.remove(filename)
+
+    def _calc_success_rate(self, message: dict) -> float:
+        "Returns the percentage of channels the message was successfully sent into."
+        channel_ctx = message.get("channels")
+        if channel_ctx is not None:
+            len_s = len(channel_ctx["successful"])
+            len_all = len(channel_ctx["failed"]) + len_s
+            calc_success_rate = 100.00 * len_s / len_all if len_all else 0.0
+        else:
+            calc_success_rate = 100.00 if message["success_info"]["success"] else 0.0
+
+        return calc_success_rate
+
     async def analytic_get_message_log(
         self,
         guild: Union[int, None] = None,
@@ -71,8 +1071,49 @@ class LoggerFileBASE(LoggerBASE):
         if before is None:
             before = datetime.max
 
+        return await self._run_file_task(
+            self._get_msg_logs,
+            guild,
+            author,
+            after,
+            before,
+            success_rate,
+            guild_type,
+            message_type,
+            sort_by,
+            sort_by_direction == "desc",
+            limit
+        )
+
+    def _get_msg_logs(
+        self, guild, author, after, before, success_rate, guild_type, message_type, sort_by, reverse, limit
+    ) -> list:
+        filenames = [
+            filename for filename, summary in self._get_summarized_files()
+            if self._get_message_rows(summary, guild, author, after, before, guild_type, message_type)
+        ]
+        parts = self._map_files(
+            self._read_msg_logs,
+            filenames,
+            guild,
+            author,
+            after,
+            before,
+            success_rate,
+            guild_type,
+            message_type,
+            sort_by,
+            reverse,
+            limit
+        )
+        return self._merge_logs(parts, sort_by, reverse, limit)
+
+    def _read_msg_logs(
+        self, filenames, guild, author, after, before, success_rate, guild_type, message_type, sort_by, reverse, limit
+    ) -> list:
+        "Returns message logs of the files, sorted and limited. Called with chunks of files by :py:meth:`_map_files`."
         logs = []
-        for filename in self._get_files(self.EXTENSION):
+        for filename in filenames:
             logs.extend(
                 self._get_msg_log_process_file(
                     guild,
@@ -87,11 +1128,225 @@ class LoggerFileBASE(LoggerBASE):
                 )
             )
 
-        sorted_ = sorted(logs, key=lambda log: log[sort_by], reverse=sort_by_direction == "desc")
-        if limit is not None:
-            sorted_ = sorted_[:limit]
+        return sorted(logs, key=lambda log: log[sort_by], reverse=reverse)[:limit]
 
-        return sorted_
+    @staticmethod
+    def _merge_logs(parts: List[list], sort_by: str, reverse: bool, limit: Optional[int]) -> list:
+        "Merges the ``parts``, lists of logs sorted by ``sort_by`` (k-way merge), and returns up to ``limit`` logs."
+        return list(itertools.islice(heapq.merge(*parts, key=lambda log: log[sort_by], reverse=reverse), limit))
+
+    async def analytic_get_message_log_page(
+        self,
+        guild: Union[int, None] = None,
+        author: Union[int, None] = None,
+        after: Union[datetime, None] = None,
+        before: Union[datetime, None] = None,
+        success_rate: Tuple[float, float] = (0, 100),
+        guild_type: Union[Literal["USER", "GUILD"], None] = None,
+        message_type: Union[Literal["TextMESSAGE", "VoiceMESSAGE", "DirectMESSAGE"], None] = None,
+        sort_by_direction: Literal["asc", "desc"] = "desc",
+        limit: int = 500,
+        cursor: Optional[str] = None
+    ) -> Tuple[list, Optional[str]]:
+        if after is None:
+            after = datetime.min
+
+        if before is None:
+            before = datetime.max
+
+        return await self._run_file_task(
+            self._get_log_page,
+            lambda summary: self._get_message_rows(summary, guild, author, after, before, guild_type, message_type),
+            lambda filename: self._get_msg_log_process_file(
+                guild, author, after, before, success_rate, guild_type, message_type, [], filename
+            ),
+            sort_by_direction,
+            limit,
+            cursor
+        )
+
+    def _get_log_page(
+        self,
+        get_rows: Callable[[dict], list],
+        read_file: Callable[[str], list],
+        sort_by_direction: Literal["asc", "desc"],
+        limit: int,
+        cursor: Optional[str]
+    ) -> Tuple[list, Optional[str]]:
+        """
+        Returns up to ``limit`` logs after the ``cursor``, ordered by the timestamp and the index,
+        and the cursor of the next page.
+
+        Logs are merged into a heap of the best ``limit`` logs (top-k), reading files from the newest
+        (oldest when ascending). Files without logs matching the filters (``get_rows`` of the summary is empty)
+        and files whose time range (from the summary) ends before the cursor or the worst log of a full heap
+        are skipped without being read. Only logs of one file and of the page are kept in memory.
+        """
+        if limit < 1:
+            return [], None
+
+        get_key = self._get_key_function(sort_by_direction)
+        files = self._get_sorted_files(get_rows, get_key)
+        cursor_key = get_key(*self._parse_cursor(cursor)) if cursor is not None else None
+        heap = []  # The worst log of the page is first
+        counter = itertools.count()  # Breaks ties of keys, so that logs are never compared
+        for best, worst, filename in files:
+            if cursor_key is not None and worst > cursor_key[0]:
+                continue  # All logs are on the previous pages
+
+            if len(heap) == limit and best < heap[0][0][0]:
+                break  # All logs of this and the remaining files are worse than the page's logs
+
+            for log in self._read_files(read_file, [filename]):
+                key = get_key(*self._get_log_position(log))
+                if cursor_key is not None and key >= cursor_key:
+                    continue
+
+                if len(heap) < limit:
+                    heapq.heappush(heap, (key, next(counter), log))
+                elif key > heap[0][0]:
+                    heapq.heapreplace(heap, (key, next(counter), log))
+
+        logs = [log for *_, log in sorted(heap, reverse=True)]
+        return logs, self._make_cursor(logs, limit, self._get_log_position)
+
+    def _get_sorted_files(
+        self,
+        get_rows: Callable[[dict], list],
+        get_key: Callable[[datetime, int], Tuple[int, int]]
+    ) -> List[Tuple[int, int, str]]:
+        """
+        Returns files containing logs that match the filters (``get_rows`` of the summary is not empty),
+        as tuples of the timestamp keys of the best and the worst log and the filename, sorted from the best.
+        """
+        files = []
+        for filename, summary in self._get_summarized_files():
+            if get_rows(summary):
+                first, _ = get_key(datetime.fromisoformat(summary["first"]), 0)
+                last, _ = get_key(datetime.fromisoformat(summary["last"]), 0)
+                files.append((max(first, last), min(first, last), filename))
+
+        files.sort(reverse=True)
+        return files
+
+    @staticmethod
+    def _read_files(read_file: Callable[[str], list], filenames: List[str]) -> list:
+        "Returns logs of the files, skipping files that were removed in the meantime."
+        logs = []
+        for filename in filenames:
+            with suppress(FileNotFoundError):
+                logs.extend(read_file(filename))
+
+        return logs
+
+    @staticmethod
+    def _get_key_function(sort_by_direction: Literal["asc", "desc"]) -> Callable[[datetime, int], Tuple[int, int]]:
+        "Returns a function, returning keys of logs from their timestamp and index. Better logs have larger keys."
+        order = 1 if sort_by_direction == "desc" else -1
+
+        def get_key(timestamp: datetime, index: int) -> Tuple[int, int]:
+            return order * ((timestamp - datetime.min) // timedelta(microseconds=1)), order * index
+
+        return get_key
+
+    @staticmethod
+    def _get_log_position(log: dict) -> Tuple[datetime, int]:
+        "Returns the timestamp and the index of the log, by which logs are paginated."
+        return log["timestamp"], int(log["index"])
+
+    @staticmethod
+    def _get_message_rows(
+        summary: dict,
+        guild: Optional[int],
+        author: Optional[int],
+        after: datetime,
+        before: datetime,
+        guild_type: Optional[str],
+        message_type: Optional[str]
+    ) -> List[list]:
+        "Returns rows of message counts inside the ``summary`` (see :class:`_SummaryIndex`) matching the filters."
+        return [
+            row for row in _SummaryIndex.get_rows(summary, "messages", after, before)
+            if (guild is None or row[1] == guild) and
+            (guild_type is None or row[2] == guild_type) and
+            (author is None or row[3] == author) and
+            (message_type is None or row[4] == message_type)
+        ]
+
+    def _get_num_messages(
+        self,
+        guild: Optional[int],
+        author: Optional[int],
+        after: datetime,
+        before: datetime,
+        guild_type: Optional[str],
+        message_type: Optional[str],
+        group_by: str
+    ) -> List[list]:
+        """
+        Counts the messages, grouped by ``group_by``, guild and author.
+        Files whose logs are all inside ``after`` - ``before`` are counted by their summaries,
+        without reading them.
+        """
+        date_size = {"year": 4, "month": 7, "day": 10}[group_by]  # Of the date in the ISO format
+        cuts = {}
+        filenames = []
+        for filename, summary in self._get_summarized_files():
+            rows = self._get_message_rows(summary, guild, author, after, before, guild_type, message_type)
+            if not rows:
+                continue
+
+            if _SummaryIndex.is_within(summary, after, before):
+                for day, guild_id, _, author_id, _, guild_name, author_name, *counts in rows:
+                    self._add_message_count(
+                        cuts, day[:date_size], guild_id, guild_name, author_id, author_name, counts
+                    )
+            else:
+                filenames.append(filename)
+
+        for part in self._map_files(
+            self._count_msg_logs, filenames, guild, author, after, before, guild_type, message_type, date_size
+        ):
+            for time_group, *counts, guild_id, guild_name, author_id, author_name in part:
+                self._add_message_count(cuts, time_group, guild_id, guild_name, author_id, author_name, counts)
+
+        return list(cuts.values())
+
+    def _count_msg_logs(
+        self, filenames, guild, author, after, before, guild_type, message_type, date_size
+    ) -> List[list]:
+        """
+        Counts message logs of the files, grouped by the date (first ``date_size`` characters), guild and author.
+        Called with chunks of files by :py:meth:`_map_files`.
+        """
+        cuts = {}
+        for filename in filenames:
+            for log in self._get_msg_log_process_file(
+                guild, author, after, before, (0, 100), guild_type, message_type, [], filename
+            ):
+                self._add_message_count(
+                    cuts,
+                    log["timestamp"].date().isoformat()[:date_size],
+                    log["guild"]["id"],
+                    log["guild"]["name"],
+                    log["author"]["id"],
+                    log["author"]["name"],
+                    [1, 0] if log["success_rate"] == 100 else [0, 1]
+                )
+
+        return list(cuts.values())
+
+    @staticmethod
+    def _add_message_count(
+        cuts: dict, time_group: str, guild_id: int, guild_name: str, author_id: int, author_name: str, counts: list
+    ):
+        "Adds successful and failed ``counts`` to the row of the group (``time_group``, guild and author)."
+        group_value = time_group, guild_id, author_id
+        if (cut_group := cuts.get(group_value)) is None:
+            cut_group = cuts[group_value] = [time_group, 0, 0, guild_id, guild_name, author_id, author_name]
+
+        cut_group[1] += counts[0]
+        cut_group[2] += counts[1]
 
     async def analytic_get_num_messages(
         self,
@@ -106,53 +1361,19 @@ class LoggerFileBASE(LoggerBASE):
         limit: int = 500,
         group_by: Literal["year", "month", "day"] = "day"
     ) -> list:
-        logs = await self.analytic_get_message_log(
-            guild,
-            author,
-            after,
-            before,
-            guild_type=guild_type,
-            message_type=message_type,
-            limit=None
-        )
-        cuts = {}
-        if not len(logs):
-            return []
+        if after is None:
+            after = datetime.min
 
-        regions = ["day", "month", "year"]
-        regions_left = list(reversed(regions[regions.index(group_by):]))
+        if before is None:
+            before = datetime.max
 
         sort_by_values = get_args(LoggerFileBASE.analytic_get_num_messages.__annotations__["sort_by"])
-
-        def get_region_text(stamp):
-            return '-'.join(f"{getattr(stamp, region):02d}" for region in regions_left)
-
-        for log in logs:
-            time_group = get_region_text(log["timestamp"])
-            guild = log["guild"]
-            author = log["author"]
-            group_value = time_group, guild["id"], author["id"]
-            if group_value not in cuts:
-                cut_group = cuts[group_value] = [
-                    time_group,
-                    0,
-                    0,
-                    guild["id"],
-                    guild["name"],
-                    author["id"],
-                    author["name"]
-                ]
-            else:
-                cut_group = cuts[group_value]
-
-            if log["success_rate"] == 100:
-                cut_group[1] += 1
-            else:
-                cut_group[2] += 1
-
+        cuts = await self._run_file_task(
+            self._get_num_messages, guild, author, after, before, guild_type, message_type, group_by
+        )
         # key: first index is timestamp group, so offset by one and then calculate index by annotation position
         return sorted(
-            cuts.values(),
+            cuts,
             key=lambda row: row[sort_by_values.index(sort_by) + 1],
             reverse=sort_by_direction == "desc"
         )[:limit]
@@ -160,3 +1381,7 @@ class LoggerFileBASE(LoggerBASE):
     @abstractmethod
     def _get_msg_log_process_file(self):
         raise NotImplementedError
+
+    def _get_invite_log_process_file(self, guild, invite, after, before, filename) -> list:
+        "Returns invite logs inside the file. Loggers without invite tracking don't have any."
+        return []
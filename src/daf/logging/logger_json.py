@@ -1,12 +1,12 @@
 from datetime import datetime
-from typing import Optional, Literal, List, Set, get_args, Iterator
+from typing import Optional, Literal, List, Set, Tuple, get_args, Iterator, Iterable, Dict
 
-from .tracing import trace
+from .tracing import trace, TraceLEVELS
 from ..misc import doc, async_util
 from ..misc.instance_track import track_id
 
-from .logger_base import C_FILE_NAME_FORBIDDEN_CHAR, C_FILE_MAX_SIZE, LoggerBASE
-from .logger_file import LoggerFileBASE
+from .logger_base import C_FILE_MAX_SIZE, LoggerBASE
+from .logger_file import LoggerFileBASE, _FileWriter, _SummaryIndex, _escape_filename, ARCHIVE_EXTENSION
 
 import json
 import pathlib
@@ -21,6 +21,11 @@ __all__ = ("LoggerJSON",)
 @doc.doc_category("Logging reference", path="logging")
 class LoggerJSON(LoggerFileBASE):
     """
+    .. versionchanged:: v4.2
+        JSON Lines mode, where each log is appended to the file as a single line.
+        Logs are written in batches by a separate thread.
+        Old logs can be compressed and deleted (``compress_after_days`` and ``delete_after_days``).
+
     .. versionchanged:: v3.1
         The index of each log is now a snowflake ID.
         It consists of <timestamp in ms since epoch> | <sequence number>.
@@ -41,6 +46,41 @@ class LoggerJSON(LoggerFileBASE):
         Path to the folder where logs will be saved. Defaults to /<user-home>/daf/History
     fallback: Optional[LoggerBASE]
         The manager to use, in case saving using this manager fails.
+    json_lines: Optional[bool]
+        .. versionadded:: v4.2
+
+        Save the logs in the JSON Lines format (``.jsonl`` files), where each log is a single line
+        appended to the file, instead of rewriting the entire file for each log.
+        Files are not split by size in this mode.
+        Analytics read files of both formats, existing logs can be converted with
+        :py:meth:`~daf.logging.LoggerJSON.convert_to_json_lines`. Defaults to False.
+    flush_size: Optional[int]
+        .. versionadded:: v4.2
+
+        Logs are written to files by a separate thread, in batches.
+        A batch is written once this many logs are waiting to be written. Defaults to 100.
+    flush_interval: Optional[float]
+        .. versionadded:: v4.2
+
+        Maximum time in seconds a log waits to be written. Defaults to 1.
+    compress_after_days: Optional[int]
+        .. versionadded:: v4.2
+
+        Days of logs at least this many days old (1 is every day before today) are compressed
+        into a single ``Year/Month/Day.tar.gz`` archive per day, by a background task.
+        Analytics read the archives transparently. Defaults to None (logs are not compressed).
+    delete_after_days: Optional[int]
+        .. versionadded:: v4.2
+
+        Days of logs (directories and archives) at least this many days old are deleted,
+        by a background task. Defaults to None (logs are kept).
+    analytic_workers: Optional[int]
+        .. versionadded:: v4.2
+
+        Number of worker processes reading files for analytics that read many files at once
+        (see :ref:`File log summaries`). Workers import the main script,
+        so DAF must be started inside ``if __name__ == "__main__":``.
+        Defaults to 1 (files are read by the writer thread, without worker processes).
 
     Raises
     ----------
@@ -50,40 +90,35 @@ class LoggerJSON(LoggerFileBASE):
     """
 
     EXTENSION = ".json"
+    EXTENSION_LINES = ".jsonl"
+    READ_EXTENSIONS = (EXTENSION, EXTENSION_LINES)
 
     def __init__(
         self,
         path: str = str(pathlib.Path.home().joinpath("daf/History")),
-        fallback: Optional[LoggerBASE] = None
+        fallback: Optional[LoggerBASE] = None,
+        json_lines: bool = False,
+        flush_size: int = 100,
+        flush_interval: float = 1.0,
+        compress_after_days: Optional[int] = None,
+        delete_after_days: Optional[int] = None,
+        analytic_workers: int = 1
     ) -> None:
-        super().__init__(path, fallback)
-
-    @async_util.with_semaphore("_mutex")
-    async def _save_log(
-        self,
-        guild_context: dict,
-        message_context: Optional[dict] = None,
-        author_context: Optional[dict] = None,
-        invite_context: Optional[dict] = None
-    ):
-        def replace_strings(name: str):
-            return "".join(
-                char
-                if char not in C_FILE_NAME_FORBIDDEN_CHAR
-                else "#" for char in name
-            )
+        self.json_lines = json_lines
+        super().__init__(
+            path, fallback, flush_size, flush_interval, compress_after_days, delete_after_days, analytic_workers
+        )
 
-        timestruct = datetime.now()
-        timestamp = "{:02d}.{:02d}.{:04d} {:02d}:{:02d}:{:02d}".format(timestruct.day, timestruct.month, timestruct.year,
-                                                                    timestruct.hour, timestruct.minute, timestruct.second)
+    def _get_write_extension(self) -> str:
+        return self.EXTENSION_LINES if self.json_lines else self.EXTENSION
 
-        logging_output = (pathlib.Path(self.path)
-                        .joinpath("{:02d}".format(timestruct.year))
-                        .joinpath("{:02d}".format(timestruct.month))
-                        .joinpath("{:02d}".format(timestruct.day)))
+    def _write_logs(self, filename: str, logs: List[tuple], writer: _FileWriter):
+        if self.json_lines:
+            self._write_logs_lines(filename, logs, writer)
+            return
 
-        logging_output.mkdir(parents=True, exist_ok=True)
-        logging_output = logging_output.joinpath(replace_strings(guild_context["name"]) + ".json")
+        logging_output = pathlib.Path(filename)
+        logging_output.parent.mkdir(parents=True, exist_ok=True)
         # Create file if it doesn't exist
         file_exists = True
         if not logging_output.exists():
@@ -116,6 +151,7 @@ class LoggerJSON(LoggerFileBASE):
 
             if json_data is None:
                 # Some error or new file
+                guild_context = logs[0][1]
                 json_data = {}
                 json_data["name"] = guild_context["name"]
                 json_data["id"] = guild_context["id"]
@@ -123,42 +159,94 @@ class LoggerJSON(LoggerFileBASE):
                 json_data["invite_tracking"] = {}
                 json_data["message_tracking"] = {}
 
-            # Message logs
+            for timestruct, guild_context, message_context, author_context, invite_context in logs:
+                timestamp = self._stamp_from_datetime(timestruct)
+                # Message logs
+                if message_context is not None:
+                    json_data_messages = json_data["message_tracking"]
+                    author_id_str = str(author_context["id"])
+                    if author_id_str not in json_data_messages:
+                        messages = []
+                        json_data_messages[author_id_str] = {**author_context, "messages": messages}
+                    else:
+                        messages = json_data_messages[author_id_str]["messages"]
+
+                    messages.insert(0, {
+                        **message_context,
+                        "index": self._generate_snowflake(),
+                        "timestamp": timestamp}
+                    )
+
+                # Invite link tracking
+                if invite_context is not None:
+                    json_data_invites = json_data["invite_tracking"]
+                    invite_id = invite_context["id"]
+                    if invite_id not in json_data_invites:
+                        json_data_invites[invite_id] = []
+
+                    invite_list: list = json_data_invites[invite_id]
+                    invite_list.insert(0, {
+                        "member": {**invite_context["member"]},
+                        "index": self._generate_snowflake(),
+                        "timestamp": timestamp}
+                    )
+
+            json.dump(json_data, f_writer, indent=4, ensure_ascii=False)
+            f_writer.truncate()  # Remove any old data
+
+    def _write_logs_lines(self, filename: str, logs: List[tuple], writer: _FileWriter):
+        "Appends the logs to a JSON Lines file, a line for each log."
+        lines = []
+        for timestruct, guild_context, message_context, author_context, invite_context in logs:
+            timestamp = self._stamp_from_datetime(timestruct)
+            guild_dict = {"name": guild_context["name"], "id": guild_context["id"], "type": guild_context["type"]}
+            # The kind is first, so lines of other kinds can be skipped without parsing them
             if message_context is not None:
-                json_data_messages = json_data["message_tracking"]
-                author_id_str = str(author_context["id"])
-                if author_id_str not in json_data_messages:
-                    messages = author_context["messages"] = []
-                    json_data_messages[author_id_str] = author_context
-                else:
-                    messages = json_data_messages[author_id_str]["messages"]
-
-                messages.insert(0, {
+                lines.append({
+                    "kind": "message",
                     **message_context,
                     "index": self._generate_snowflake(),
-                    "timestamp": timestamp}
-                )
+                    "timestamp": timestamp,
+                    "guild": guild_dict,
+                    "author": {"name": author_context["name"], "id": author_context["id"]}
+                })
 
-            # Invite link tracking
             if invite_context is not None:
-                json_data_invites = json_data["invite_tracking"]
-                invite_id = invite_context["id"]
-                if invite_id not in json_data_invites:
-                    json_data_invites[invite_id] = []
-
-                invite_list: list = json_data_invites[invite_id]
-                invite_list.insert(0, {
+                lines.append({
+                    "kind": "invite",
+                    "invite": invite_context["id"],
                     "member": {**invite_context["member"]},
                     "index": self._generate_snowflake(),
-                    "timestamp": timestamp}
-                )
+                    "timestamp": timestamp,
+                    "guild": guild_dict
+                })
+
+        writer.open(filename).write("".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines))
+
+    def _read_lines(self, filename: str, kind: Literal["message", "invite"]) -> Iterator[dict]:
+        "Streams logs of ``kind`` from a JSON Lines file."
+        prefix = f'{{"kind": "{kind}"'
+        with self._open_log(filename) as reader:
+            for line in reader:
+                if not line.startswith(prefix):
+                    continue
 
-            json.dump(json_data, f_writer, indent=4, ensure_ascii=False)
-            f_writer.truncate()  # Remove any old data
+                try:
+                    log = json.loads(line)
+                except json.JSONDecodeError:  # Partially written line
+                    continue
+
+                del log["kind"]
+                yield log
 
     def _get_msg_log_process_file(self, guild, author, after, before, success_rate, guild_type, message_type, logs, filename):
+        if filename.endswith(self.EXTENSION_LINES):
+            return self._get_msg_log_process_lines(
+                guild, author, after, before, success_rate, guild_type, message_type, filename
+            )
+
         logs = []
-        with open(filename, 'r', encoding="utf-8") as reader:
+        with self._open_log(filename) as reader:
             data = json.load(reader)
 
         if guild_type is not None and data["type"] != guild_type or guild is not None and data["id"] != guild:
@@ -191,6 +279,39 @@ class LoggerJSON(LoggerFileBASE):
                 logs.append(message)
 
         return logs
+
+    def _get_msg_log_process_lines(
+        self, guild, author, after, before, success_rate, guild_type, message_type, filename
+    ):
+        logs = []
+        for message in self._read_lines(filename, "message"):
+            guild_dict = message["guild"]
+            if guild_type is not None and guild_dict["type"] != guild_type:
+                continue
+
+            if guild is not None and guild_dict["id"] != guild:
+                continue
+
+            if author is not None and message["author"]["id"] != author:
+                continue
+
+            if message_type is not None and message["type"] != message_type:
+                continue
+
+            stamp = self._datetime_from_stamp(message["timestamp"])
+            if before < stamp or stamp < after:
+                continue
+
+            calc_success_rate = self._calc_success_rate(message)
+            if success_rate[0] > calc_success_rate or calc_success_rate > success_rate[1]:
+                continue
+
+            del message["timestamp"]
+            message = {"timestamp": stamp, **message}
+            message["success_rate"] = calc_success_rate
+            logs.append(message)
+
+        return logs
     
     async def analytic_get_invite_log(
         self,
@@ -209,37 +330,170 @@ class LoggerJSON(LoggerFileBASE):
         if before is None:
             before = datetime.max
 
+        return await self._run_file_task(
+            self._get_invite_logs, guild, invite, after, before, sort_by, sort_by_direction == "desc", limit
+        )
+
+    def _get_invite_logs(self, guild, invite, after, before, sort_by, reverse, limit) -> list:
+        filenames = [
+            filename for filename, summary in self._get_summarized_files()
+            if self._get_invite_rows(summary, guild, invite, after, before)
+        ]
+        parts = self._map_files(
+            self._read_invite_logs, filenames, guild, invite, after, before, sort_by, reverse, limit
+        )
+        return self._merge_logs(parts, sort_by, reverse, limit)
+
+    def _read_invite_logs(self, filenames, guild, invite, after, before, sort_by, reverse, limit) -> list:
+        "Returns invite logs of the files, sorted and limited. Called with chunks of files by :py:meth:`_map_files`."
         logs = []
-        for filename in self._get_files(".json"):
-            with open(filename, 'r', encoding="utf-8") as reader:
-                data = json.load(reader)
+        for filename in filenames:
+            logs.extend(self._get_invite_log_process_file(guild, invite, after, before, filename))
 
-            if guild is not None and data["id"] != guild:
-                continue
+        return sorted(logs, key=lambda log: log[sort_by], reverse=reverse)[:limit]
+
+    async def analytic_get_invite_log_page(
+        self,
+        guild: Optional[int] = None,
+        invite: Optional[str] = None,
+        after: Optional[datetime] = None,
+        before: Optional[datetime] = None,
+        sort_by_direction: Literal['asc', 'desc'] = "desc",
+        limit: int = 500,
+        cursor: Optional[str] = None
+    ) -> Tuple[list, Optional[str]]:
+        if after is None:
+            after = datetime.min
 
-            guild_dict = {"name": data["name"], "id": data["id"], "type": data["type"]}
+        if before is None:
+            before = datetime.max
 
-            for invite_id, invite_logs in data["invite_tracking"].items():
+        return await self._run_file_task(
+            self._get_log_page,
+            lambda summary: self._get_invite_rows(summary, guild, invite, after, before),
+            lambda filename: self._get_invite_log_process_file(guild, invite, after, before, filename),
+            sort_by_direction,
+            limit,
+            cursor
+        )
+
+    def _get_invite_log_process_file(self, guild, invite, after, before, filename) -> list:
+        logs = []
+        if filename.endswith(self.EXTENSION_LINES):
+            for log in self._read_lines(filename, "invite"):
+                if guild is not None and log["guild"]["id"] != guild:
+                    continue
+
+                invite_id = log.pop("invite")
                 if invite is not None and invite_id != invite:
                     continue
 
-                for log in invite_logs:
-                    log["guild"] = guild_dict
-                    log["invite"] = f"https://discord.gg/{invite_id}"
+                stamp = self._datetime_from_stamp(log["timestamp"])
+                if stamp < after or stamp > before:
+                    continue
+
+                del log["timestamp"]
+                log = {"timestamp": stamp, **log}
+                log["invite"] = f"https://discord.gg/{invite_id}"
+                logs.append(log)
 
-                    stamp = self._datetime_from_stamp(log["timestamp"])
-                    if stamp < after or stamp > before:
-                        continue
+            return logs
 
-                    del log["timestamp"]
-                    log = {"timestamp": stamp, **log}
-                    logs.append(log)
-        
-        sorted_ = sorted(logs, key=lambda log: log[sort_by], reverse=sort_by_direction == "desc")
-        if limit is not None:
-            sorted_ = sorted_[:limit]
+        with self._open_log(filename) as reader:
+            data = json.load(reader)
 
-        return sorted_
+        if guild is not None and data["id"] != guild:
+            return logs
+
+        guild_dict = {"name": data["name"], "id": data["id"], "type": data["type"]}
+
+        for invite_id, invite_logs in data["invite_tracking"].items():
+            if invite is not None and invite_id != invite:
+                continue
+
+            for log in invite_logs:
+                log["guild"] = guild_dict
+                log["invite"] = f"https://discord.gg/{invite_id}"
+
+                stamp = self._datetime_from_stamp(log["timestamp"])
+                if stamp < after or stamp > before:
+                    continue
+
+                del log["timestamp"]
+                log = {"timestamp": stamp, **log}
+                logs.append(log)
+
+        return logs
+
+    @staticmethod
+    def _get_invite_rows(
+        summary: dict,
+        guild: Optional[int],
+        invite: Optional[str],
+        after: datetime,
+        before: datetime
+    ) -> List[list]:
+        "Returns rows of invite counts inside the ``summary`` matching the filters."
+        return [
+            row for row in _SummaryIndex.get_rows(summary, "invites", after, before)
+            if (guild is None or row[1] == guild) and (invite is None or row[2] == invite)
+        ]
+
+    def _get_num_invites(self, guild: Optional[int], after: datetime, before: datetime, group_by: str) -> List[list]:
+        """
+        Counts the invite logs, grouped by ``group_by``, guild and invite.
+        Files whose logs are all inside ``after`` - ``before`` are counted by their summaries,
+        without reading them.
+        """
+        date_size = {"year": 4, "month": 7, "day": 10}[group_by]  # Of the date in the ISO format
+        cuts = {}
+        filenames = []
+        for filename, summary in self._get_summarized_files():
+            rows = self._get_invite_rows(summary, guild, None, after, before)
+            if not rows:
+                continue
+
+            if _SummaryIndex.is_within(summary, after, before):
+                for day, guild_id, invite_id, guild_name, count in rows:
+                    self._add_invite_count(
+                        cuts, day[:date_size], guild_id, guild_name, f"https://discord.gg/{invite_id}", count
+                    )
+            else:
+                filenames.append(filename)
+
+        for part in self._map_files(self._count_invite_logs, filenames, guild, after, before, date_size):
+            for time_group, count, guild_id, guild_name, invite in part:
+                self._add_invite_count(cuts, time_group, guild_id, guild_name, invite, count)
+
+        return list(cuts.values())
+
+    def _count_invite_logs(self, filenames, guild, after, before, date_size) -> List[list]:
+        """
+        Counts invite logs of the files, grouped by the date (first ``date_size`` characters), guild and invite.
+        Called with chunks of files by :py:meth:`_map_files`.
+        """
+        cuts = {}
+        for filename in filenames:
+            for log in self._get_invite_log_process_file(guild, None, after, before, filename):
+                self._add_invite_count(
+                    cuts,
+                    log["timestamp"].date().isoformat()[:date_size],
+                    log["guild"]["id"],
+                    log["guild"]["name"],
+                    log["invite"],
+                    1
+                )
+
+        return list(cuts.values())
+
+    @staticmethod
+    def _add_invite_count(cuts: dict, time_group: str, guild_id: int, guild_name: str, invite: str, count: int):
+        "Adds ``count`` to the row of the group (``time_group``, guild and invite)."
+        group_value = time_group, guild_id, invite
+        if (cut_group := cuts.get(group_value)) is None:
+            cut_group = cuts[group_value] = [time_group, 0, guild_id, guild_name, invite]
+
+        cut_group[1] += count
 
     async def analytic_get_num_invites(
         self,
@@ -251,60 +505,61 @@ class LoggerJSON(LoggerFileBASE):
         limit: int = 500,
         group_by: Literal['year', 'month', 'day'] = "day"
     ) -> list:
-        logs = await self.analytic_get_invite_log(
-            guild,
-            after,
-            before,
-            limit=None
-        )
-        cuts = {}
-        if not len(logs):
-            return []
+        if after is None:
+            after = datetime.min
 
-        regions = ["day", "month", "year"]
-        regions_left = list(reversed(regions[regions.index(group_by):]))
+        if before is None:
+            before = datetime.max
 
         sort_by_values = get_args(LoggerJSON.analytic_get_num_invites.__annotations__["sort_by"])
-
-        def get_region_text(stamp):
-            return '-'.join(f"{getattr(stamp, region):02d}" for region in regions_left)
-
-        for log in logs:
-            time_group = get_region_text(log["timestamp"])
-            guild = log["guild"]
-            invite = log["invite"]
-            group_value = time_group, guild["id"], invite
-            if group_value not in cuts:
-                cut_group = cuts[group_value] = [
-                    time_group,
-                    0,
-                    guild["id"],
-                    guild["name"],
-                    invite
-                ]
-            else:
-                cut_group = cuts[group_value]
-
-            cut_group[1] += 1
-
+        cuts = await self._run_file_task(self._get_num_invites, guild, after, before, group_by)
         # key: first index is timestamp group, so offset by one and then calculate index by annotation position
         return sorted(
-            cuts.values(),
+            cuts,
             key=lambda row: row[sort_by_values.index(sort_by) + 1],
             reverse=sort_by_direction == "desc"
         )[:limit]
 
     @async_util.with_semaphore("_mutex")
     async def delete_logs(self, logs: List[dict]):
+        await self._run_file_task(self._delete_logs, logs)
+
+    def _delete_logs(self, logs: List[dict]):
         if "type" in logs[0]:  # Message log
             filterer = self._remove_message_logs
+            kind = "message"
         else:  # Invite log
             filterer = self._remove_invite_logs
+            kind = "invite"
 
         indexes = set(x["index"] for x in logs)
+
+        def rewrite_archived(name: str, content: bytes) -> Optional[bytes]:
+            "Returns the content of a file of a compressed day without the deleted logs, None if unchanged."
+            if name.endswith(self.EXTENSION_LINES):
+                kept = self._filter_lines(content.decode("utf-8").splitlines(keepends=True), kind, indexes)
+                return None if kept is None else "".join(kept).encode("utf-8")
+
+            if name.endswith(".json"):
+                try:
+                    data = json.loads(content)
+                except json.JSONDecodeError:
+                    return None
+
+                if filterer(data, indexes):
+                    return json.dumps(data, indent=4).encode("utf-8")
+
+            return None
+
         for path, dirs, files in os.walk(self.path):
             for filename in files:
-                if filename.endswith(".json"):
+                if filename.endswith(self.EXTENSION_LINES):
+                    self._remove_lines(os.path.join(path, filename), kind, indexes)
+
+                elif filename.endswith(ARCHIVE_EXTENSION):
+                    self._rewrite_archive(os.path.join(path, filename), rewrite_archived)
+
+                elif filename.endswith(".json"):
                     with open(os.path.join(path, filename), 'r+', encoding="utf-8") as f_log:
                         data = json.load(f_log)
                         filterer(data, indexes)
@@ -312,6 +567,69 @@ class LoggerJSON(LoggerFileBASE):
                         f_log.truncate()
                         json.dump(data, f_log, indent=4)
 
+    @async_util.with_semaphore("_mutex")
+    async def convert_to_json_lines(self):
+        """
+        .. versionadded:: v4.2
+
+        Converts logs saved in the nested JSON format (``.json`` files) into the JSON Lines format (``.jsonl`` files).
+        Logs of a guild in a single day, that were split into multiple files, are merged into a single file
+        and ordered from the oldest to the newest.
+        The converted ``.json`` files are removed.
+
+        Files that do not contain valid JSON are left unchanged.
+        Logs of compressed days (see ``compress_after_days``) are not converted.
+        """
+        await self._run_file_task(self._convert_to_json_lines)
+
+    def _convert_to_json_lines(self):
+        for path, dirs, files in os.walk(self.path):
+            converted: List[str] = []
+            output: Dict[str, List[dict]] = {}
+            for filename in files:
+                if not filename.endswith(".json"):
+                    continue
+
+                filename = os.path.join(path, filename)
+                try:
+                    with open(filename, 'r', encoding="utf-8") as reader:
+                        data = json.load(reader)
+                except json.JSONDecodeError as exc:
+                    trace(f"Could not convert {filename} to JSON Lines", TraceLEVELS.WARNING, exc)
+                    continue
+
+                guild_dict = {"name": data["name"], "id": data["id"], "type": data["type"]}
+                lines = output.setdefault(_escape_filename(data["name"]) + self.EXTENSION_LINES, [])
+                for author_ctx in data["message_tracking"].values():
+                    author_dict = {"name": author_ctx["name"], "id": author_ctx["id"]}
+                    for message in author_ctx["messages"]:
+                        lines.append({"kind": "message", **message, "guild": guild_dict, "author": author_dict})
+
+                for invite_id, invites in data["invite_tracking"].items():
+                    for invite in invites:
+                        lines.append({"kind": "invite", "invite": invite_id, **invite, "guild": guild_dict})
+
+                converted.append(filename)
+
+            for filename, lines in output.items():
+                filename = os.path.join(path, filename)
+                if os.path.exists(filename):  # Logs already saved in the JSON Lines format
+                    with open(filename, 'r', encoding="utf-8") as reader:
+                        for line in reader:
+                            try:
+                                lines.append(json.loads(line))
+                            except json.JSONDecodeError:  # Partially written line
+                                continue
+
+                lines.sort(key=lambda line: line["index"])
+                with open(filename + ".tmp", 'w', encoding="utf-8") as writer:
+                    writer.write("".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines))
+
+                os.replace(filename + ".tmp", filename)
+
+            for filename in converted:
+                os.remove(filename)
+
     def _datetime_from_stamp(self, timestamp: str):
         date_, time_ = timestamp.split(' ')
         day, month, year = map(int, date_.split('.'))
@@ -319,28 +637,56 @@ class LoggerJSON(LoggerFileBASE):
         stamp = datetime(year, month, day, hour, minute, second)
         return stamp
 
-    def _remove_message_logs(self, data: dict, indexes: Set[int]):
+    def _remove_message_logs(self, data: dict, indexes: Set[int]) -> bool:
+        removed = False
         for author_ctx in data["message_tracking"].values():
             for message in author_ctx["messages"].copy():
                 if message["index"] not in indexes:
                     continue
 
                 author_ctx["messages"].remove(message)
+                removed = True
 
-    def _remove_invite_logs(self, data: dict, indexes: Set[int]):
+        return removed
+
+    def _remove_lines(self, filename: str, kind: Literal["message", "invite"], indexes: Set[int]):
+        "Removes logs of ``kind`` with index in ``indexes`` from a JSON Lines file."
+        with open(filename, 'r', encoding="utf-8") as reader:
+            kept = self._filter_lines(reader, kind, indexes)
+
+        if kept is not None:
+            with open(filename, 'w', encoding="utf-8") as writer:
+                writer.writelines(kept)
+
+    @staticmethod
+    def _filter_lines(
+        lines: Iterable[str], kind: Literal["message", "invite"], indexes: Set[int]
+    ) -> Optional[List[str]]:
+        "Returns JSON Lines without logs of ``kind`` with index in ``indexes``, None if no log was removed."
+        prefix = f'{{"kind": "{kind}"'
+        kept = []
+        removed = False
+        for line in lines:
+            if line.startswith(prefix):
+                try:
+                    if json.loads(line)["index"] in indexes:
+                        removed = True
+                        continue
+                except json.JSONDecodeError:  # Partially written line
+                    pass
+
+            kept.append(line)
+
+        return kept if removed else None
+
+    def _remove_invite_logs(self, data: dict, indexes: Set[int]) -> bool:
+        removed = False
         for logs in data["invite_tracking"].values():
             for log in logs.copy():
                 if log["index"] not in indexes:
                     continue
 
                 logs.remove(log)
+                removed = True
 
-    def _calc_success_rate(self, message: dict) -> float:
-        channel_ctx = message.get("channels")
-        if channel_ctx is not None:
-            len_s = len(channel_ctx["successful"])
-            calc_success_rate = 100.00 * len_s / (len(channel_ctx["failed"]) + len_s)
-        else:
-            calc_success_rate = 100.00 if message["success_info"]["success"] else 0.0
-
-        return calc_success_rate
+        return removed
@@ -4,9 +4,11 @@
     .. versionchanged:: v2.7
         Added Discord invite link tracking.
 """
-from datetime import datetime, date
+from datetime import datetime, date, time, timedelta
 from typing import Callable, Dict, List, Literal, Any, Union, Optional, Tuple, get_args
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
+from functools import partial
 from pathlib import Path
 from typeguard import typechecked
 
@@ -14,6 +16,7 @@ from ..tracing import TraceLEVELS, trace
 from .. import _logging as logging
 from ...misc import doc, instance_track, async_util
 
+import hashlib
 import json
 import copy
 import asyncio
@@ -32,6 +35,13 @@ SQL_RECOVERY_TIME = 1
 SQL_RECONNECT_TIME = 5 * 60
 SQL_ENABLE_DEBUG = False
 SQL_TABLE_CACHE_SIZE = 1000
+SQL_FLUSH_SIZE = 100  # Number of buffered logs that are saved together in a single transaction
+SQL_FLUSH_INTERVAL = 1  # Maximum time in seconds a log is buffered before being saved
+SQL_MIGRATION_BATCH_SIZE = 10_000  # Number of rows processed at once when migrating tables
+# Dialects without async connectors, whose calls are made from a thread pool
+SQL_SYNC_DIALECTS = ("mssql",)
+# Number of threads, and connections kept open, for dialects without async connectors (mssql)
+SQL_SYNC_POOL_SIZE = 5
 # Dictionary mapping the database dialect to it's connector
 DIALECT_CONN_MAP = {
     "sqlite": "aiosqlite",
@@ -44,14 +54,15 @@ try:
     from .tables import *
 
     from sqlalchemy import (
-        select, text, case, delete, func,
-        Integer, String, event,
+        select, text, case, delete, update, insert, func,
+        union_all, or_, and_, Integer, event, bindparam,
     )
     from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
     from sqlalchemy.engine import URL as SQLURL, create_engine
     from sqlalchemy.exc import SQLAlchemyError
     from sqlalchemy.orm import (
         sessionmaker,
+        aliased,
         Session,
     )
     import sqlalchemy as sqa
@@ -286,6 +297,7 @@ class LoggerSQL(logging.LoggerBASE):
         # Set in ._begin_engine
         self.engine: sqa.engine.Engine = None
         self.session_maker: sessionmaker = None
+        self._executor: ThreadPoolExecutor = None  # Runs the calls of non-async dialects
         self.reconnecting = False  # Flag that is True while reconnecting, used for emergency exit of other tasks
 
         # Caching (to avoid unnecessary queries)
@@ -300,6 +312,10 @@ class LoggerSQL(logging.LoggerBASE):
         self.data_history_cache = TableCache(DataHISTORY, SQL_TABLE_CACHE_SIZE)
         self.invites_cache = TableCache(Invite, SQL_TABLE_CACHE_SIZE)
 
+        # Write-behind buffer of logs, saved by .flush()
+        self._buffer: List[tuple] = []
+        self._flush_task: asyncio.Task = None
+
         super().__init__(fallback)
 
     async def _run_async(self, method: Callable, *args, **kwargs):
@@ -426,12 +442,248 @@ class LoggerSQL(logging.LoggerBASE):
                 async with self.engine.begin() as tran:
                     await tran.run_sync(ORMBase.metadata.create_all)
             else:
-                with self.engine.connect() as tran:
-                    tran.run_callable(ORMBase.metadata.create_all)
+                await self._run_async(ORMBase.metadata.create_all, self.engine)
 
         except Exception as ex:
             raise RuntimeError("Unable to create all the tables.") from ex
 
+    async def _migrate_tables(self) -> None:
+        """
+        Migrates tables created by older versions of the framework to the current schema.
+
+        Raises
+        -----------
+        RuntimeError
+            Raised when tables could not be migrated.
+        """
+        def migrate(connection: "sqa.Connection"):
+            self._migrate_data_history(connection)
+            self._migrate_rollups(connection)
+
+        try:
+            await self._run_in_transaction(migrate)
+        except Exception as ex:
+            raise RuntimeError("Unable to migrate the tables.") from ex
+
+    async def _run_in_transaction(self, fnc: Callable[["sqa.Connection"], Any]) -> Any:
+        """
+        Calls the synchronous ``fnc`` with a database connection, inside a transaction.
+        """
+        if self.is_async:
+            async with self.engine.begin() as tran:
+                return await tran.run_sync(fnc)
+
+        def run():
+            with self.engine.begin() as tran:
+                return fnc(tran)
+
+        return await self._run_async(run)
+
+    async def _run_with_session(self, session: Union[AsyncSession, Session], fnc: Callable, *args) -> Any:
+        """
+        Calls the synchronous ``fnc`` with the synchronous version of ``session`` as the first argument.
+        """
+        if self.is_async:
+            return await session.run_sync(fnc, *args)
+
+        return await self._run_async(fnc, session, *args)
+
+    @classmethod
+    def _migrate_data_history(cls, connection: "sqa.Connection") -> None:
+        """
+        Adds the content hash column (and it's unique index) to the DataHISTORY table.
+        Rows with the same content are merged into one.
+        """
+        inspector = sqa.inspect(connection)
+        if "content_hash" in {column["name"] for column in inspector.get_columns("DataHISTORY")}:
+            return
+
+        trace("Migrating DataHISTORY to content hashes. This can take a while.", TraceLEVELS.NORMAL)
+        table = DataHISTORY.__table__
+        column = table.c.content_hash
+        quote = connection.dialect.identifier_preparer.quote
+        connection.execute(
+            text(
+                f"ALTER TABLE {quote(table.name)} "
+                f"ADD {quote(column.name)} {column.type.compile(dialect=connection.dialect)}"
+            )
+        )
+
+        # Hash the content in batches, using keyset pagination
+        kept: Dict[str, int] = {}  # Content hash => id of the row that is kept
+        merged: Dict[int, List[int]] = {}  # Id of kept row => ids of rows with the same content
+        last_id = None
+        while True:
+            select_stm = select(table.c.id, table.c.content).order_by(table.c.id).limit(SQL_MIGRATION_BATCH_SIZE)
+            if last_id is not None:
+                select_stm = select_stm.where(table.c.id > last_id)
+
+            rows = connection.execute(select_stm).all()
+            if not rows:
+                break
+
+            hashes = []
+            for id_, content in rows:
+                content_hash = cls._get_data_key(json.loads(content) if isinstance(content, str) else content)
+                if (kept_id := kept.setdefault(content_hash, id_)) != id_:
+                    merged.setdefault(kept_id, []).append(id_)
+                else:
+                    hashes.append({"b_id": id_, "b_hash": content_hash})
+
+            if hashes:
+                connection.execute(
+                    update(table).where(table.c.id == bindparam("b_id")).values(content_hash=bindparam("b_hash")),
+                    hashes
+                )
+
+            last_id = rows[-1][0]
+
+        # Point logs to the kept rows and remove the duplicates
+        message_log = MessageLOG.__table__
+        for kept_id, ids in merged.items():
+            for i in range(0, len(ids), SQL_MIGRATION_BATCH_SIZE):
+                chunk = ids[i:i + SQL_MIGRATION_BATCH_SIZE]
+                connection.execute(
+                    update(message_log).where(message_log.c.sent_data_id.in_(chunk)).values(sent_data_id=kept_id)
+                )
+                connection.execute(delete(table).where(table.c.id.in_(chunk)))
+
+        for index in table.indexes:
+            index.create(connection)
+
+        trace(
+            f"Migrated {len(kept) + sum(map(len, merged.values()))} DataHISTORY rows ({len(kept)} unique).",
+            TraceLEVELS.NORMAL
+        )
+
+    @classmethod
+    def _migrate_rollups(cls, connection: "sqa.Connection") -> None:
+        """
+        Creates the missing timestamp indexes of the log tables and
+        fills the rollup tables, if they are empty while the logs are not.
+        """
+        inspector = sqa.inspect(connection)
+        for table in (MessageLOG.__table__, InviteLOG.__table__):
+            existing = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(connection)
+
+        for rollup, log in ((MessageCOUNT, MessageLOG), (InviteCOUNT, InviteLOG)):
+            if (
+                connection.execute(select(rollup.day).limit(1)).first() is None and
+                connection.execute(select(log.id).limit(1)).first() is not None
+            ):
+                cls._backfill_rollup(connection, rollup)
+
+    @classmethod
+    def _backfill_rollup(cls, connection: "sqa.Connection", rollup: Union["MessageCOUNT", "InviteCOUNT"]) -> None:
+        """
+        Recalculates all the rows of the ``rollup`` table from the logs.
+        """
+        trace(f"Filling {rollup.__tablename__} from existing logs. This can take a while.", TraceLEVELS.NORMAL)
+        table = rollup.__table__
+        connection.execute(delete(table))
+        rows = [
+            {**dict(zip(cls._get_rollup_keys(rollup), key)), **dict(zip(cls._get_rollup_counters(rollup), counts))}
+            for key, counts in cls._count_logs(connection, rollup).items()
+        ]
+        for i in range(0, len(rows), SQL_MIGRATION_BATCH_SIZE):
+            connection.execute(insert(table), rows[i:i + SQL_MIGRATION_BATCH_SIZE])
+
+        trace(f"Filled {rollup.__tablename__} with {len(rows)} rows.", TraceLEVELS.NORMAL)
+
+    @classmethod
+    def _add_to_rollup(
+        cls,
+        connection: Union["sqa.Connection", Session],
+        rollup: Union["MessageCOUNT", "InviteCOUNT"],
+        counts: Dict[tuple, tuple]
+    ) -> None:
+        """
+        Adds ``counts`` (mapping of the key to the counts, see :py:meth:`LoggerSQL._count_logs`)
+        to the ``rollup`` table. Negative counts subtract.
+        """
+        if not counts:
+            return
+
+        table = rollup.__table__
+        keys = cls._get_rollup_keys(rollup)
+        counters = cls._get_rollup_counters(rollup)
+        key_columns = [table.c[name] for name in keys]
+        # Each key column is filtered separately, which finds a (small) superset of the existing rows
+        existing = set(
+            map(
+                tuple,
+                connection.execute(
+                    select(*key_columns).where(
+                        *(column.in_(list({key[i] for key in counts})) for i, column in enumerate(key_columns))
+                    )
+                )
+            )
+        )
+        updates = []
+        inserts = []
+        for key, values in counts.items():
+            if key in existing:
+                updates.append({f"b_{name}": value for name, value in zip(keys + counters, key + values)})
+            else:
+                inserts.append(dict(zip(keys + counters, key + values)))
+
+        if updates:
+            connection.execute(
+                update(table)
+                .where(*(column == bindparam(f"b_{column.name}") for column in key_columns))
+                .values({name: table.c[name] + bindparam(f"b_{name}") for name in counters}),
+                updates
+            )
+
+        if inserts:
+            connection.execute(insert(table), inserts)
+
+    @staticmethod
+    def _get_rollup_keys(rollup: Union["MessageCOUNT", "InviteCOUNT"]) -> List[str]:
+        "Returns names of the columns by which the ``rollup`` table counts the logs."
+        return [column.name for column in rollup.__table__.primary_key.columns]
+
+    @staticmethod
+    def _get_rollup_counters(rollup: Union["MessageCOUNT", "InviteCOUNT"]) -> List[str]:
+        "Returns names of the ``rollup`` table's columns that contain counts."
+        return [column.name for column in rollup.__table__.columns if not column.primary_key]
+
+    @staticmethod
+    def _count_logs(
+        connection: Union["sqa.Connection", Session],
+        rollup: Union["MessageCOUNT", "InviteCOUNT"],
+        *conditions: Any
+    ) -> Dict[tuple, tuple]:
+        """
+        Counts the logs (matching ``conditions``), the same way as the ``rollup`` table counts them.
+
+        Returns
+        ---------
+        Dict[tuple, tuple]
+            Mapping of the rollup table's key (day, ...) to the counts.
+        """
+        if rollup is MessageCOUNT:
+            log = MessageLOG
+            keys = [MessageLOG.guild_id, MessageLOG.author_id, MessageLOG.message_type_id]
+            counters = [
+                func.sum(case((MessageLOG.success_rate > 0, 1), else_=0)),
+                func.sum(case((MessageLOG.success_rate == 0, 1), else_=0)),
+            ]
+        else:
+            log = InviteLOG
+            keys = [InviteLOG.invite_id]
+            counters = [func.count()]
+
+        periods = [func.extract(region, log.timestamp).cast(Integer) for region in ("year", "month", "day")]
+        select_stm = select(*periods, *keys, *counters).where(*conditions).group_by(*periods, *keys)
+        return {
+            (date(*row[:3]), *row[3:3 + len(keys)]): tuple(row[3 + len(keys):])
+            for row in connection.execute(select_stm)
+        }
+
     def _begin_engine(self) -> None:
         """
         Creates the sqlalchemy engine.
@@ -443,13 +695,28 @@ class LoggerSQL(logging.LoggerBASE):
         """
         try:
             dialect = self.dialect
-            if dialect == "mssql":
-                # The only dialect that doesn't have async connectors
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+            if dialect in SQL_SYNC_DIALECTS:
+                # Calls are made from a dedicated thread pool, so they don't block the event loop.
+                # Sessions keep their connection between calls, so a thread waiting for a free connection
+                # could block the sessions holding the connections from being closed. Connections over
+                # the pool size are opened (and closed once returned) instead of waiting.
+                executor = self._executor = ThreadPoolExecutor(
+                    SQL_SYNC_POOL_SIZE,
+                    thread_name_prefix=type(self).__name__
+                )
+
                 async def _run_async(method: Callable, *args, **kwargs):
-                    return method(*args, **kwargs)
+                    return await asyncio.get_running_loop().run_in_executor(
+                        executor,
+                        partial(method, *args, **kwargs)
+                    )
 
                 self.is_async = False
-                create_engine_ = create_engine
+                create_engine_ = partial(create_engine, pool_size=SQL_SYNC_POOL_SIZE, max_overflow=-1)
                 session_class = Session
             else:
                 async def _run_async(method: Callable, *args, **kwargs):
@@ -483,6 +750,8 @@ class LoggerSQL(logging.LoggerBASE):
                 """
                 Wrapper class for the session that can always be used
                 in async mode, even if the session it wraps is not async.
+                Methods of a non-async session that communicate with the database
+                need to be called through ``_run_async``.
                 """
                 if self.is_async:
                     async def __aenter__(self_):
@@ -495,7 +764,12 @@ class LoggerSQL(logging.LoggerBASE):
                         return self_.__enter__()
 
                     async def __aexit__(self_, *args):
-                        return self_.__exit__(*args)
+                        return await _run_async(self_.__exit__, *args)  # Releases the connection
+
+                    def execute(self_, *args, **kwargs):
+                        # Fetch all the rows inside the thread, instead of when the result is used
+                        kwargs["execution_options"] = {**kwargs.get("execution_options", {}), "prebuffer_rows": True}
+                        return super().execute(*args, **kwargs)
 
             self.session_maker = sessionmaker(bind=self.engine, class_=SessionWrapper, expire_on_commit=False)
         except Exception as ex:
@@ -514,6 +788,7 @@ class LoggerSQL(logging.LoggerBASE):
         Any
             from ``._begin_engine()``
             from ``._create_tables()``
+            from ``._migrate_tables()``
             from ``._generate_lookup_values()``
         """
         trace(f"{type(self).__name__} logs will be saved to {self.database}")
@@ -521,175 +796,198 @@ class LoggerSQL(logging.LoggerBASE):
         self._begin_engine()
         # Create tables and the session class bound to the engine
         await self._create_tables()
+        # Update tables created by older versions
+        await self._migrate_tables()
         # Insert the lookuptable values
         await self._generate_lookup_values()
         await super().initialize()
 
-    async def __get_insert_base(
+    async def _get_insert_bulk(
         self,
-        key: Any,
+        rows: Dict[Any, tuple],
         cache_object: TableCache,
-        compare_key,
         type_: type,
+        condition: Callable[[list], Any],
+        key_of: Callable[[ORMBase], Any],
         session: Union[AsyncSession, Session],
-        *args,
-        **kwargs
-    ):
-        result = None
-        if not cache_object.exists(key):
-            result = await self._run_async(
-                session.execute,
-                select(type_).where(compare_key)
-            )
-            result = result.first()
-            if result is not None:
-                result = result[0]
+        created: List[Tuple[TableCache, Any, ORMBase]]
+    ) -> Dict[Any, ORMBase]:
+        """
+        Returns rows of ``type_`` from the cache/database, inserting the rows that don't exist.
+        All the rows that are not cached are selected with a single query.
+
+        Parameters
+        ------------
+        rows: Dict[Any, tuple]
+            Mapping of the cache keys of rows to the positional arguments used for creating the rows.
+        cache_object: TableCache
+            The cache of the table.
+        type_: type
+            The table.
+        condition: Callable[[list], Any]
+            Returns the WHERE clause matching rows that have any of the keys, passed as a list.
+        key_of: Callable[[ORMBase], Any]
+            Returns the cache key of a selected row.
+        session: Union[AsyncSession, Session]
+            Session to use for transaction.
+        created: List[Tuple[TableCache, Any, ORMBase]]
+            List into which the rows added to the session are appended (with the cache and key),
+            for caching them once the transaction is committed.
+
+        Returns
+        ----------
+        Dict[Any, ORMBase]
+            Mapping of the keys to the rows.
+        """
+        resolved = {}
+        missing = []
+        for key in rows:
+            if cache_object.exists(key):
+                resolved[key] = cache_object.get(key)
             else:
-                result = type_(*args, **kwargs)
-                session.add(result)
-                await self._run_async(session.commit)
-                await self._run_async(session.begin)
-                result = result
+                missing.append(key)
 
-            cache_object.insert(key, result)
-        else:
-            result = cache_object.get(key)
+        if missing:
+            result = await self._run_async(session.execute, select(type_).where(condition(missing)))
+            for (row,) in result.unique().all():
+                key = key_of(row)
+                resolved[key] = row
+                cache_object.insert(key, row)
+
+            to_add = []
+            for key in missing:
+                if key not in resolved:
+                    resolved[key] = row = type_(*rows[key])
+                    to_add.append(row)
+                    created.append((cache_object, key, row))
 
-        return result
+            session.add_all(to_add)
 
-    def _get_insert_invite(
+        return resolved
+
+    def _get_insert_invites(
         self,
-        id_: str,
-        guild: "GuildUSER",
-        session: Union[AsyncSession, Session]
-    ) -> int:
+        invites: Dict[str, Tuple[str, "GuildUSER"]],
+        session: Union[AsyncSession, Session],
+        created: List[Tuple[TableCache, Any, ORMBase]]
+    ) -> Dict[str, "Invite"]:
         """
-        Inserts the invite link into the db if it doesn't exist,
-        adds it to cache and returns it's internal db id from cache.
+        Inserts the invite links into the db if they don't exist,
+        adds them to cache and returns them.
 
         Parameters
         ------------
-        id_: str
-            The invite link ID (final part of URL).
-        guild: GuildUSER,
-            The guild that
+        invites: Dict[str, Tuple[str, GuildUSER]]
+            Mapping of invite link IDs (final part of URL) to the ID and the guild of the invite.
         session: Union[AsyncSession, Session]
             The session to use as transaction.
+        created: List[Tuple[TableCache, Any, ORMBase]]
+            See :py:meth:`~daf.logging.sql.LoggerSQL._get_insert_bulk`.
         """
-        return self.__get_insert_base(id_, self.invites_cache, Invite.discord_id == id_, Invite, session, id_, guild)
+        return self._get_insert_bulk(
+            invites,
+            self.invites_cache,
+            Invite,
+            Invite.discord_id.in_,
+            lambda invite: invite.discord_id,
+            session,
+            created
+        )
 
-    def _get_insert_guild(self,
-                          snowflake: int,
-                          name: str,
-                          guild_type: int,
-                          session: Union[AsyncSession, Session]) -> int:
+    def _get_insert_guilds(
+        self,
+        guilds: Dict[int, Tuple["GuildTYPE", int, str]],
+        session: Union[AsyncSession, Session],
+        created: List[Tuple[TableCache, Any, ORMBase]]
+    ) -> Dict[int, "GuildUSER"]:
         """
-        Inserts the guild into the db if it doesn't exist,
-        adds it to cache and returns it's internal db id from cache.
+        Inserts the guilds (and users) into the db if they don't exist,
+        adds them to cache and returns them.
 
         Parameters
         ------------
-        snowflake: int
-            The snowflake of the guild.
-        name: name
-            The name of the guild.
-        guild_type: int
-            ID of key pointing to guild_type.
+        guilds: Dict[int, Tuple[GuildTYPE, int, str]]
+            Mapping of guild snowflakes to the guild type, snowflake and name of the guild.
         session: Union[AsyncSession, Session]
             The session to use as transaction.
+        created: List[Tuple[TableCache, Any, ORMBase]]
+            See :py:meth:`~daf.logging.sql.LoggerSQL._get_insert_bulk`.
         """
-        return self.__get_insert_base(
-            snowflake,
+        return self._get_insert_bulk(
+            guilds,
             self.guild_user_cache,
-            GuildUSER.snowflake_id == snowflake,
             GuildUSER,
+            GuildUSER.snowflake_id.in_,
+            lambda guild: guild.snowflake_id,
             session,
-            guild_type,
-            snowflake,
-            name
+            created
         )
 
-    async def _get_insert_channels(self,
-                                   channels: List[dict],
-                                   guild: "GuildUSER",
-                                   session: Union[AsyncSession, Session]) -> List[Dict[int, Union[str, None]]]:
+    def _get_insert_channels(
+        self,
+        channels: Dict[int, Tuple[int, str, "GuildUSER"]],
+        session: Union[AsyncSession, Session],
+        created: List[Tuple[TableCache, Any, ORMBase]]
+    ) -> Dict[int, "CHANNEL"]:
         """
-        Adds missing channels to the database, then caches those added
-        for performance.
+        Inserts the channels into the db if they don't exist,
+        adds them to cache and returns them.
 
         Parameters
         ------------
-        channels: List[dict]
-            List of dictionaries containing values for snowflake id ("id") and name of the channel ("name").
-            If sending to failed, it also contains text like description of the error ("reason").
-        guild: GuildUSER
-            The internal DB id of the guild where the channels are in.
+        channels: Dict[int, Tuple[int, str, GuildUSER]]
+            Mapping of channel snowflakes to the snowflake, name and guild of the channel.
         session: Union[AsyncSession, Session]
             Session to use for transaction.
-
-        Return
-        -------------
-        List[Dict[int, Union[str, None]]]
-            List of dictionaries containing database ID of a channel and a reason why sending to channel failed.
+        created: List[Tuple[TableCache, Any, ORMBase]]
+            See :py:meth:`~daf.logging.sql.LoggerSQL._get_insert_bulk`.
         """
+        return self._get_insert_bulk(
+            channels,
+            self.channel_cache,
+            CHANNEL,
+            CHANNEL.snowflake_id.in_,
+            lambda channel: channel.snowflake_id,
+            session,
+            created
+        )
 
-        # Put into cache if it is not already
-        # Get snowflakes that are not cached
-        not_cached = [{"id": x["id"], "name": x["name"]} for x in channels if not self.channel_cache.exists(x["id"])]
-        not_cached_snow = [x["id"] for x in not_cached]
-        if len(not_cached):
-            # Search the database for non cached channels
-            result = await self._run_async(
-                session.execute,
-                select(CHANNEL).where(CHANNEL.snowflake_id.in_(not_cached_snow))
-            )
-            result = result.all()
-            for (channel,) in result:
-                self.channel_cache.insert(channel.snowflake_id, channel)
-
-            # Add the channels that are not in the database
-            to_add = [
-                CHANNEL(x["id"], x["name"], guild)
-                for x in not_cached if not self.channel_cache.exists(x["id"])
-            ]
-            if len(to_add):
-                session.add_all(to_add)
-                await self._run_async(session.commit)
-                await self._run_async(session.begin)
-                for channel in to_add:
-                    self.channel_cache.insert(channel.snowflake_id, channel)
-
-        # Get from cache
-        ret = [(self.channel_cache.get(d["id"]), d.get("reason", None)) for d in channels]
-        return ret
-
-    def _get_insert_data(self, data: dict, session: Union[AsyncSession, Session]) -> int:
+    def _get_insert_data(
+        self,
+        data: Dict[str, Tuple[str, str]],
+        session: Union[AsyncSession, Session],
+        created: List[Tuple[TableCache, Any, ORMBase]]
+    ) -> Dict[str, "DataHISTORY"]:
         """
-        Get's data's row ID from the cache/database, if it does not exists,
-        it inserts into the database and then caches the value.
+        Inserts the sent data into the db if it doesn't exist,
+        adds it to cache and returns it.
 
         Parameters
         -------------
-        data: dict
-            The data dictionary which represents sent data
+        data: Dict[str, Tuple[str, str]]
+            Mapping of the content hashes of sent data to the JSON string and the content hash of the data.
+            See :py:meth:`~daf.logging.sql.LoggerSQL._get_data_key`.
         session: Union[AsyncSession, Session]
             Session to use for transaction.
-
-        Returns
-        -------------
-        int
-            Primary key of a row inside DataHISTORY table.
+        created: List[Tuple[TableCache, Any, ORMBase]]
+            See :py:meth:`~daf.logging.sql.LoggerSQL._get_insert_bulk`.
         """
-        const_data = json.dumps(data)
-        return self.__get_insert_base(
-            const_data,
+        return self._get_insert_bulk(
+            data,
             self.data_history_cache,
-            DataHISTORY.content.cast(String) == const_data,
             DataHISTORY,
+            DataHISTORY.content_hash.in_,
+            lambda data_obj: data_obj.content_hash,
             session,
-            const_data
+            created
         )
 
+    @staticmethod
+    def _get_data_key(data: dict) -> str:
+        "Returns the content hash (SHA-256 of the canonical JSON) under which sent data is stored."
+        canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
     async def _stop_engine(self):
         """
         Closes the engine and the cursor.
@@ -732,96 +1030,136 @@ class LoggerSQL(logging.LoggerBASE):
 
         return res  # Returns if the error was handled or not
 
-    async def _save_log_invite(
-        self,
-        session: Union[AsyncSession, Session],
-        guild_context: dict,
-        invite_context: dict
-    ):
-        # Parse the data
-        guild_snowflake: int = guild_context.get("id")
-        guild_name: str = guild_context.get("name")
-        invite_id: str = invite_context.get("id")
-        invite_member_id = invite_context["member"].get("id")
-        invite_member_name = invite_context["member"].get("name")
-
-        # Lookup table values
-        guild_type_obj = self.guild_type_cache.get(guild_context["type"])
-        # Insert guild into the database and cache if it doesn't exist
-        guild_obj = await self._get_insert_guild(guild_snowflake, guild_name, guild_type_obj, session)
-        member_obj = await self._get_insert_guild(
-            invite_member_id,
-            invite_member_name,
-            self.guild_type_cache.get("USER"),
-            session
+    async def _save_logs(self, session: Union[AsyncSession, Session], logs: List[tuple]):
+        """
+        Adds a batch of logs into the session.
+        Rows the logs link to (guilds, channels, data, invites) are resolved for all the logs at once.
+
+        Returns
+        ----------
+        List[Tuple[TableCache, Any, ORMBase]]
+            Newly added rows to cache, once the session is committed.
+        """
+        created = []
+        user_type_obj = self.guild_type_cache.get("USER")
+        guilds = {}
+        for _, guild_context, message_context, author_context, invite_context in logs:
+            guilds[guild_context["id"]] = (
+                self.guild_type_cache.get(guild_context["type"]),
+                guild_context["id"],
+                guild_context["name"]
+            )
+            if message_context is not None:
+                guilds[author_context["id"]] = (user_type_obj, author_context["id"], author_context["name"])
+            else:
+                member = invite_context["member"]
+                guilds[member["id"]] = (user_type_obj, member["id"], member["name"])
+
+        guilds = await self._get_insert_guilds(guilds, session, created)
+
+        channels = {}
+        data = {}
+        invites = {}
+        for _, guild_context, message_context, author_context, invite_context in logs:
+            guild_obj = guilds[guild_context["id"]]
+            if message_context is not None:
+                sent_data = message_context["sent_data"]
+                data_key = self._get_data_key(sent_data)
+                if data_key not in data:
+                    data[data_key] = (json.dumps(sent_data), data_key)
+                channels_ctx = message_context.get("channels")
+                if channels_ctx is not None:
+                    for channel in channels_ctx["successful"] + channels_ctx["failed"]:
+                        channels[channel["id"]] = (channel["id"], channel["name"], guild_obj)
+            else:
+                invites[invite_context["id"]] = (invite_context["id"], guild_obj)
+
+        channels = await self._get_insert_channels(channels, session, created)
+        data = await self._get_insert_data(data, session, created)
+        invites = await self._get_insert_invites(invites, session, created)
+
+        log_objs = []
+        for timestamp, guild_context, message_context, author_context, invite_context in logs:
+            if message_context is not None:  # Message tracking
+                dm_success_info: dict = message_context.get("success_info", None)
+                dm_success_info_reason: str = None
+                if dm_success_info is not None and "reason" in dm_success_info:
+                    dm_success_info_reason = dm_success_info["reason"]
+
+                channels_ctx = message_context.get("channels")
+                if channels_ctx is not None:
+                    channels_ctx = channels_ctx["successful"] + channels_ctx["failed"]
+                else:
+                    channels_ctx = []
+
+                log_obj = MessageLOG(
+                    data[self._get_data_key(message_context["sent_data"])],
+                    self.message_type_cache.get(message_context["type"]),
+                    self.message_mode_cache.get(message_context.get("mode", None)),
+                    dm_success_info_reason,
+                    guilds[guild_context["id"]],
+                    guilds[author_context["id"]],
+                    [
+                        MessageChannelLOG(channels[channel["id"]], channel.get("reason", None))
+                        for channel in channels_ctx
+                    ],
+                )
+            else:  # Invite tracking
+                log_obj = InviteLOG(
+                    invites[invite_context["id"]],
+                    guilds[invite_context["member"]["id"]]
+                )
+
+            log_obj.timestamp = timestamp
+            log_objs.append(log_obj)
+
+        # The ORM inserts rows of the same table with bulk INSERT statements
+        session.add_all(log_objs)
+        await self._run_async(session.flush)  # Assigns ids, used by the rollup tables
+
+        message_counts: Dict[tuple, List[int]] = {}
+        invite_counts: Dict[tuple, int] = {}
+        for log_obj in log_objs:
+            day = log_obj.timestamp.date()
+            if isinstance(log_obj, MessageLOG):
+                counts = message_counts.setdefault(
+                    (day, log_obj.guild_id, log_obj.author_id, log_obj.message_type_id), [0, 0]
+                )
+                successful, failed = self._get_log_counts(log_obj)
+                counts[0] += successful
+                counts[1] += failed
+            else:
+                key = (day, log_obj.invite_id)
+                invite_counts[key] = invite_counts.get(key, 0) + 1
+
+        await self._run_with_session(
+            session,
+            self._add_to_rollup,
+            MessageCOUNT,
+            {key: tuple(counts) for key, counts in message_counts.items()}
         )
-        invite_obj = await self._get_insert_invite(invite_id, guild_obj, session)
-        invite_log_obj = InviteLOG(
-            invite_obj,
-            member_obj
+        await self._run_with_session(
+            session,
+            self._add_to_rollup,
+            InviteCOUNT,
+            {key: (count,) for key, count in invite_counts.items()}
         )
-        session.add(invite_log_obj)
+        return created
 
-    async def _save_log_message(
-        self,
-        session: Union[AsyncSession, Session],
-        guild_context: dict,
-        message_context: Optional[dict] = None,
-        author_context: Optional[dict] = None,
-    ):
-        # Parse the data
-        author_name: str = author_context.get("name")
-        author_snowflake: str = author_context.get("id")
-        sent_data: dict = message_context.get("sent_data")
-        guild_snowflake: int = guild_context.get("id")
-        guild_name: str = guild_context.get("name")
-        channels: List[dict] = message_context.get("channels", None)
-        dm_success_info: dict = message_context.get("success_info", None)
-        dm_success_info_reason: str = None
-        message_mode: Union[int, str, None] = message_context.get("mode", None)
-
-        if dm_success_info is not None and "reason" in dm_success_info:
-            dm_success_info_reason = dm_success_info["reason"]
-
-        _channels = []
-        if channels is not None:
-            channels = channels['successful'] + channels['failed']
-
-        # Lookup table values
-        guild_type_obj = self.guild_type_cache.get(guild_context["type"])
-        message_type_obj = self.message_type_cache.get(message_context["type"])
-        message_mode_obj = self.message_mode_cache.get(message_mode)
-        # Insert guild into the database and cache if it doesn't exist
-        guild_obj = await self._get_insert_guild(guild_snowflake, guild_name, guild_type_obj, session)
-        if channels is not None:
-            # Insert channels into the database and cache if it doesn't exist
-            _channels = await self._get_insert_channels(channels, guild_obj, session)
-
-        data_obj = await self._get_insert_data(sent_data, session)
-        author_obj = await self._get_insert_guild(
-            author_snowflake,
-            author_name,
-            self.guild_type_cache.get("USER"),
-            session
-        )
+    @staticmethod
+    def _get_log_counts(log: "MessageLOG") -> Tuple[int, int]:
+        """
+        Returns the number of successful and failed messages (0 or 1) the ``log`` counts as.
+        Matches :attr:`MessageLOG.success_rate` being larger than 0 or equal to 0.
+        """
+        if log.message_type.name == "DirectMESSAGE":
+            return (1, 0) if log.dm_reason is None else (0, 1)
 
-        # Save message log
-        message_log_obj = MessageLOG(
-            data_obj,
-            message_type_obj,
-            message_mode_obj,
-            dm_success_info_reason,
-            guild_obj,
-            author_obj,
-            [
-                MessageChannelLOG(channel, reason)
-                for channel, reason in _channels
-            ],
-        )
-        session.add(message_log_obj)
+        if not log.channels:
+            return 0, 0
+
+        return (1, 0) if any(channel.reason is None for channel in log.channels) else (0, 1)
 
-    # with_semaphore prevents multiple tasks from attempting to do operations on the database at the same time.
-    @async_util.with_semaphore("_mutex")
     async def _save_log(
         self,
         guild_context: dict,
@@ -830,7 +1168,9 @@ class LoggerSQL(logging.LoggerBASE):
         invite_context: Optional[dict] = None
     ):
         """
-        This method saves the log generated by the xGUILD object into the database.
+        This method buffers the log generated by the xGUILD object for saving into the database.
+        Buffered logs are saved in a single transaction once :data:`SQL_FLUSH_SIZE` logs are buffered,
+        or :data:`SQL_FLUSH_INTERVAL` seconds after the first log was buffered.
 
         Parameters
         -------------
@@ -840,33 +1180,76 @@ class LoggerSQL(logging.LoggerBASE):
             Context generated by the xMESSAGE object, see guild.xMESSAGE.generate_log_context() for more info.
         author_context: dict
             Context generated by the ACCOUNT object, see ACCOUNT.generate_log_context() for more info.
-
-        Raises
-        --------
-        RuntimeError
-            Saving failed within n times or error recovery failed.
         """
 
         if self.reconnecting:
             # The SQL logger is in the middle of reconnection process
             return await logging.save_log(guild_context, message_context)
 
+        self._buffer.append((datetime.now(), guild_context, message_context, author_context, invite_context))
+        if len(self._buffer) >= SQL_FLUSH_SIZE:
+            await self.flush()  # Also slows down the callers while the database is behind
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after(SQL_FLUSH_INTERVAL))
+
+    async def _flush_after(self, delay: float):
+        await asyncio.sleep(delay)
+        self._flush_task = None
+        await self.flush()
+
+    # with_semaphore prevents multiple tasks from attempting to do operations on the database at the same time.
+    @async_util.with_semaphore("_mutex")
+    async def flush(self) -> None:
+        """
+        .. versionadded:: v4.2
+
+        Saves all the buffered logs into the database.
+        Logs that could not be saved are saved to the fallback.
+        """
+        await self._flush()
+
+    async def _flush(self):
+        logs = self._buffer
+        if not logs:
+            return
+
+        self._buffer = []
+        self._cancel_flush_task()  # Nothing left for it to save
         for _ in range(SQL_MAX_SAVE_ATTEMPTS):
             try:
                 async with self.session_maker() as session:
-                    if message_context is not None:  # Message tracking
-                        await self._save_log_message(session, guild_context, message_context, author_context)
-                    else:  # Invite tracking
-                        await self._save_log_invite(session, guild_context, invite_context)
-
+                    created = await self._save_logs(session, logs)
                     await self._run_async(session.commit)
 
+                for cache_object, key, row in created:
+                    cache_object.insert(key, row)
+
                 return
             except SQLAlchemyError as exc:
                 if not await self._handle_error(exc):
-                    raise RuntimeError("Unable to handle SQL error") from exc
+                    trace("Unable to handle SQL error", TraceLEVELS.ERROR, exc)
+                    break
+        else:
+            trace(f"Unable to save {len(logs)} logs within {SQL_MAX_SAVE_ATTEMPTS} tries", TraceLEVELS.ERROR)
+
+        await self._save_fallback(logs)
+
+    def _cancel_flush_task(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
 
-        raise RuntimeError(f"Unable to save invite log within {SQL_MAX_SAVE_ATTEMPTS} tries")
+    async def _close(self):
+        self._cancel_flush_task()
+        await self.flush()
+        if self.engine is not None:
+            await self._stop_engine()
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+        await super()._close()
 
     async def _get_guild(self, id_: int, session: Union[AsyncSession, Session]):
         guilduser: GuildUSER = self.guild_user_cache.get(id_)
@@ -895,6 +1278,10 @@ class LoggerSQL(logging.LoggerBASE):
         group_by: Literal["year", "month", "day"] = "day"
     ) -> List[Tuple[date, int, int, int, str, int, str]]:
         """
+        .. versionchanged:: v4.2
+
+            Whole days are counted from the :class:`~daf.logging.sql.tables.MessageCOUNT` rollup table.
+
         Counts all the messages in the configured group based on parameters.
 
         Parameters
@@ -946,38 +1333,67 @@ class LoggerSQL(logging.LoggerBASE):
         if sort_by not in args:
             raise ValueError(f"sort_by expected any of {args}. Got '{sort_by}'")
 
-        async with self.session_maker() as session:
-            conditions = [MessageLOG.timestamp.between(after, before)]
+        def get_conditions(table: Union[MessageLOG, MessageCOUNT]):
+            conditions = []
             if guild is not None:
-                conditions.append(MessageLOG.guild.has(GuildUSER.snowflake_id == guild))
+                conditions.append(table.guild.has(GuildUSER.snowflake_id == guild))
 
             if author is not None:
-                conditions.append(MessageLOG.author.has(GuildUSER.snowflake_id == author))
+                conditions.append(table.author.has(GuildUSER.snowflake_id == author))
 
             if guild_type is not None:
-                conditions.append(MessageLOG.guild.has(GuildUSER.guild_type.has(GuildTYPE.name == guild_type)))
+                conditions.append(table.guild.has(GuildUSER.guild_type.has(GuildTYPE.name == guild_type)))
 
             if message_type is not None:
-                conditions.append(MessageLOG.message_type.has(MessageTYPE.name == message_type))
+                conditions.append(table.message_type.has(MessageTYPE.name == message_type))
 
+            return conditions
+
+        await self.flush()  # Include the buffered logs
+        async with self.session_maker() as session:
+            counts = self._select_counts(
+                after,
+                before,
+                MessageCOUNT,
+                [MessageCOUNT.guild_id, MessageCOUNT.author_id, MessageCOUNT.successful, MessageCOUNT.failed],
+                MessageLOG,
+                [
+                    MessageLOG.guild_id,
+                    MessageLOG.author_id,
+                    case((MessageLOG.success_rate > 0, 1), else_=0).label("successful"),
+                    case((MessageLOG.success_rate == 0, 1), else_=0).label("failed"),
+                ],
+                get_conditions
+            )
+            guild_user = aliased(GuildUSER)
+            author_user = aliased(GuildUSER)
             return await self.__analytic_get_counts(
                 session,
                 group_by,
-                [MessageLOG.guild_id, MessageLOG.author_id],
-                conditions,
+                [
+                    counts.c.guild_id,
+                    counts.c.author_id,
+                    guild_user.snowflake_id,
+                    guild_user.name,
+                    author_user.snowflake_id,
+                    author_user.name
+                ],
                 limit,
                 sort_by,
                 sort_by_direction,
                 [
-                    func.sum(case((MessageLOG.success_rate > 0, 1), else_=0)).label("successful"),
-                    func.sum(case((MessageLOG.success_rate == 0, 1), else_=0)).label("failed"),
-                    select(GuildUSER.snowflake_id).where(GuildUSER.id == MessageLOG.guild_id).scalar_subquery().label("guild_snow"),
-                    select(GuildUSER.name).where(GuildUSER.id == MessageLOG.guild_id).scalar_subquery().label("guild_name"),
-                    select(GuildUSER.snowflake_id).where(GuildUSER.id == MessageLOG.author_id).scalar_subquery().label("author_snow"),
-                    select(GuildUSER.name).where(GuildUSER.id == MessageLOG.author_id).scalar_subquery().label("author_name")
+                    func.sum(counts.c.successful).label("successful"),
+                    func.sum(counts.c.failed).label("failed"),
+                    guild_user.snowflake_id.label("guild_snow"),
+                    guild_user.name.label("guild_name"),
+                    author_user.snowflake_id.label("author_snow"),
+                    author_user.name.label("author_name")
+                ],
+                [
+                    (guild_user, guild_user.id == counts.c.guild_id),
+                    (author_user, author_user.id == counts.c.author_id)
                 ],
-                [],
-                MessageLOG
+                counts
             )
 
     def analytic_get_message_log(
@@ -1030,8 +1446,53 @@ class LoggerSQL(logging.LoggerBASE):
         list[MessageLOG]
             List of the message logs.
         """
+        return self.__analytic_get_log(
+            MessageLOG,
+            self.__get_message_log_conditions(guild, author, after, before, success_rate, guild_type, message_type),
+            [getattr(getattr(MessageLOG, sort_by), sort_by_direction)()],
+            limit
+        )
+
+    async def analytic_get_message_log_page(
+        self,
+        guild: Union[int, None] = None,
+        author: Union[int, None] = None,
+        after: Union[datetime, None] = None,
+        before: Union[datetime, None] = None,
+        success_rate: Tuple[float, float] = (0, 100),
+        guild_type: Union[Literal["USER", "GUILD"], None] = None,
+        message_type: Union[Literal["TextMESSAGE", "VoiceMESSAGE", "DirectMESSAGE"], None] = None,
+        sort_by_direction: Literal["asc", "desc"] = "desc",
+        limit: int = 500,
+        cursor: Optional[str] = None
+    ) -> Tuple[List["MessageLOG"], Optional[str]]:
+        """
+        .. versionadded:: v4.2
+
+        Returns one page of :ref:`MessageLOG` objects, sorted by the timestamp, and the cursor of the next page.
+        The page continues after the log the ``cursor`` is positioned at (the timestamp and the id of the log),
+        which is found through the timestamp index.
+
+        See :py:meth:`daf.logging.LoggerBASE.analytic_get_message_log_page` for the parameters.
+        """
+        conditions = self.__get_message_log_conditions(
+            guild, author, after, before, success_rate, guild_type, message_type
+        )
+        return await self.__analytic_get_log_page(MessageLOG, conditions, sort_by_direction, limit, cursor)
+
+    @staticmethod
+    def __get_message_log_conditions(
+        guild: Optional[int],
+        author: Optional[int],
+        after: Optional[datetime],
+        before: Optional[datetime],
+        success_rate: Tuple[float, float],
+        guild_type: Optional[str],
+        message_type: Optional[str]
+    ) -> list:
+        "Returns conditions of the MessageLOG table matching the filters."
         conditions = [
-            MessageLOG.timestamp.between(after, before),
+            MessageLOG.timestamp.between(after or datetime.min, before or datetime.max),
             MessageLOG.success_rate.between(*success_rate)
         ]
 
@@ -1047,12 +1508,7 @@ class LoggerSQL(logging.LoggerBASE):
         if message_type is not None:
             conditions.append(MessageLOG.message_type.has(MessageTYPE.name == message_type))
 
-        return self.__analytic_get_log(
-            MessageLOG,
-            conditions,
-            getattr(getattr(MessageLOG, sort_by), sort_by_direction)(),
-            limit
-        )
+        return conditions
 
     async def analytic_get_num_invites(
         self,
@@ -1065,6 +1521,10 @@ class LoggerSQL(logging.LoggerBASE):
         group_by: Literal["year", "month", "day"] = "day"
     ) -> List[Tuple[date, int, str]]:
         """
+        .. versionchanged:: v4.2
+
+            Whole days are counted from the :class:`~daf.logging.sql.tables.InviteCOUNT` rollup table.
+
         Returns invite link join counts.
 
         Parameters
@@ -1106,13 +1566,23 @@ class LoggerSQL(logging.LoggerBASE):
         if sort_by not in args:
             raise ValueError(f"sort_by expected any of {args}. Got '{sort_by}'")
 
-        async with self.session_maker() as session:
-            conditions = [InviteLOG.timestamp.between(after, before)]
+        def get_conditions(table: Union[InviteLOG, InviteCOUNT]):
             if guild is not None:
-                conditions.append(
-                    InviteLOG.invite.has(Invite.guild.has(GuildUSER.snowflake_id == guild))
-                )
+                return [table.invite.has(Invite.guild.has(GuildUSER.snowflake_id == guild))]
+
+            return []
 
+        await self.flush()  # Include the buffered logs
+        async with self.session_maker() as session:
+            counts = self._select_counts(
+                after,
+                before,
+                InviteCOUNT,
+                [InviteCOUNT.invite_id, InviteCOUNT.count],
+                InviteLOG,
+                [InviteLOG.invite_id, sqa.literal(1).label("count")],
+                get_conditions
+            )
             return await self.__analytic_get_counts(
                 session,
                 group_by,
@@ -1121,35 +1591,89 @@ class LoggerSQL(logging.LoggerBASE):
                     GuildUSER.snowflake_id,
                     GuildUSER.name,
                 ],
-                conditions,
                 limit,
                 sort_by,
                 sort_by_direction,
                 [
-                    func.count().label("count"),
+                    func.sum(counts.c.count).label("count"),
                     GuildUSER.snowflake_id.label("guild_snow"),
                     GuildUSER.name.label("guild_name"),
-                    Invite.discord_id,
+                    Invite.discord_id.label("invite_id"),
                 ],
                 [
-                    (Invite, InviteLOG.invite_id == Invite.id),
+                    (Invite, counts.c.invite_id == Invite.id),
                     (GuildUSER, Invite.guild_id == GuildUSER.id)
                 ],
-                InviteLOG
+                counts
             )
 
+    @staticmethod
+    def _select_counts(
+        after: datetime,
+        before: datetime,
+        rollup: Union["MessageCOUNT", "InviteCOUNT"],
+        rollup_items: List[Any],
+        log: Union[MessageLOG, InviteLOG],
+        log_items: List[Any],
+        get_conditions: Callable[[Any], list]
+    ) -> "sqa.Subquery":
+        """
+        Returns a subquery of counts from ``after`` to ``before``, with year, month and day columns.
+        Whole days are counted from the ``rollup`` table and the (partial) days on the edges from the ``log`` table.
+
+        Parameters
+        ------------
+        rollup_items: List[Any]
+            Columns selected from the ``rollup`` table.
+        log_items: List[Any]
+            Columns selected from the ``log`` table, labeled as the ``rollup_items``.
+        get_conditions: Callable[[Any], list]
+            Function returning filter conditions for the passed table (``rollup`` or ``log``).
+        """
+        def select_periods(column):
+            return [func.extract(region, column).cast(Integer).label(region) for region in ("year", "month", "day")]
+
+        first = datetime.combine(after.date(), time.min)  # First whole day
+        if first < after:
+            first = first + timedelta(days=1) if after.date() < date.max else datetime.max
+
+        # End (exclusive) of whole days, None when the rollup table can be used until the end
+        end = datetime.combine(before.date(), time.min) if before < datetime.max else None
+        selects = []
+        log_conditions = [log.timestamp.between(after, before)]
+        if end is None or first < end:
+            rollup_conditions = [rollup.day >= first.date()]
+            if end is not None:
+                rollup_conditions.append(rollup.day < end.date())
+                log_conditions.append(or_(log.timestamp < first, log.timestamp >= end))
+            else:
+                log_conditions.append(log.timestamp < first)
+
+            selects.append(
+                select(*select_periods(rollup.day), *rollup_items).where(*rollup_conditions, *get_conditions(rollup))
+            )
+
+        if after < first or end is not None:
+            selects.append(
+                select(*select_periods(log.timestamp), *log_items).where(*log_conditions, *get_conditions(log))
+            )
+
+        if len(selects) == 1:
+            return selects[0].subquery()
+
+        return union_all(*selects).subquery()
+
     async def __analytic_get_counts(
         self,
         session: Union[Session, AsyncSession],
         group_by: str,
         group_by_extra: List[Any],
-        conditions: list,
         limit: int,
         sort_by: str,
         sort_by_direction: Literal["asc", "desc"],
         select_items: List[Any],
         joins: List[Tuple[Any, Any]],
-        select_from: Any
+        select_from: "sqa.Subquery"
     ):
         args = get_args(self.__analytic_get_counts.__annotations__["sort_by_direction"])
         if sort_by_direction not in args:
@@ -1157,13 +1681,9 @@ class LoggerSQL(logging.LoggerBASE):
 
         regions = ["day", "month", "year"]
         regions = reversed(regions[regions.index(group_by):])
-        extract_stms = []
+        extract_stms = [select_from.c[region_] for region_ in regions]
 
-        timestamp = getattr(select_from, "timestamp")
-        for region_ in regions:
-            extract_stms.append(func.extract(region_, timestamp).cast(Integer))
-
-        select_stm = (select(*extract_stms, *select_items).where(*conditions).select_from(select_from))
+        select_stm = select(*extract_stms, *select_items).select_from(select_from)
 
         for join_table, condition in joins:
             select_stm = select_stm.join(join_table, condition)
@@ -1220,36 +1740,93 @@ class LoggerSQL(logging.LoggerBASE):
         list[InviteLOG]
             List of the message logs.
         """
-        conditions = [InviteLOG.timestamp.between(after, before)]
+        return self.__analytic_get_log(
+            InviteLOG,
+            self.__get_invite_log_conditions(guild, invite, after, before),
+            [getattr(getattr(InviteLOG, sort_by), sort_by_direction)()],
+            limit
+        )
+
+    async def analytic_get_invite_log_page(
+        self,
+        guild: Union[int, None] = None,
+        invite: Union[str, None] = None,
+        after: Union[datetime, None] = None,
+        before: Union[datetime, None] = None,
+        sort_by_direction: Literal["asc", "desc"] = "desc",
+        limit: int = 500,
+        cursor: Optional[str] = None
+    ) -> Tuple[List["InviteLOG"], Optional[str]]:
+        """
+        .. versionadded:: v4.2
+
+        Returns one page of :ref:`InviteLOG` objects, sorted by the timestamp, and the cursor of the next page.
+
+        See :py:meth:`daf.logging.LoggerBASE.analytic_get_invite_log_page` for the parameters.
+        """
+        conditions = self.__get_invite_log_conditions(guild, invite, after, before)
+        return await self.__analytic_get_log_page(InviteLOG, conditions, sort_by_direction, limit, cursor)
+
+    @staticmethod
+    def __get_invite_log_conditions(
+        guild: Optional[int],
+        invite: Optional[str],
+        after: Optional[datetime],
+        before: Optional[datetime]
+    ) -> list:
+        "Returns conditions of the InviteLOG table matching the filters."
+        conditions = [InviteLOG.timestamp.between(after or datetime.min, before or datetime.max)]
         if guild is not None:
             conditions.append(InviteLOG.invite.has(Invite.guild.has(GuildUSER.snowflake_id == guild)))
         if invite is not None:
             conditions.append(InviteLOG.invite.has(Invite.discord_id == invite))
 
-        return self.__analytic_get_log(
-            InviteLOG,
-            conditions,
-            getattr(getattr(InviteLOG, sort_by), sort_by_direction)(),
-            limit
-        )
+        return conditions
 
     async def __analytic_get_log(
         self,
         select_items: Any,
         conditions: list,
-        order_by: Any,
+        order_by: list,
         limit: int
     ):
         """
         Common helper method universal for multiple log types.
         """
+        await self.flush()  # Include the buffered logs
         async with self.session_maker() as session:
             logs = await self._run_async(
                 session.execute,
-                select(select_items).where(*conditions).order_by(order_by).limit(limit)
+                select(select_items).where(*conditions).order_by(*order_by).limit(limit)
             )
             return list(*zip(*logs.unique().all()))
 
+    async def __analytic_get_log_page(
+        self,
+        table: Union[MessageLOG, InviteLOG],
+        conditions: list,
+        sort_by_direction: Literal["asc", "desc"],
+        limit: int,
+        cursor: Optional[str]
+    ) -> Tuple[list, Optional[str]]:
+        """
+        Returns a page of logs from the ``table`` after the ``cursor``, ordered by the timestamp and the id
+        (keyset pagination), and the cursor of the next page.
+        """
+        conditions = list(conditions)
+        if cursor is not None:
+            timestamp, id_ = self._parse_cursor(cursor)
+            if sort_by_direction == "desc":
+                position = or_(table.timestamp < timestamp, and_(table.timestamp == timestamp, table.id < id_))
+            else:
+                position = or_(table.timestamp > timestamp, and_(table.timestamp == timestamp, table.id > id_))
+
+            conditions.append(position)
+
+        order_by = [getattr(table.timestamp, sort_by_direction)(), getattr(table.id, sort_by_direction)()]
+        logs = await self.__analytic_get_log(table, conditions, order_by, limit)
+        return logs, self._make_cursor(logs, limit, lambda log: (log.timestamp, log.id))
+
     async def delete_logs(self, table: Union[MessageLOG, InviteLOG], primary_keys: List[int]):
         """
         Method used to delete log objects objects.
@@ -1261,10 +1838,56 @@ class LoggerSQL(logging.LoggerBASE):
         primary_keys: List[int]
             List of Primary Key IDs that match the rows of the table to delete.
         """
-        session: Union[AsyncSession, Session]
-        async with self.session_maker() as session:
-            await self._run_async(session.execute, delete(table).where(table.id.in_(primary_keys)))
-            await self._run_async(session.commit)
+        rollup = MessageCOUNT if table is MessageLOG else InviteCOUNT
+
+        def delete_logs(connection: "sqa.Connection"):
+            # Subtract the logs from the rollup table, removing rows that no longer count anything
+            counts = {
+                key: tuple(-count for count in counts)
+                for key, counts in self._count_logs(connection, rollup, table.id.in_(primary_keys)).items()
+            }
+            self._add_to_rollup(connection, rollup, counts)
+            if counts:
+                rollup_table = rollup.__table__
+                connection.execute(
+                    delete(rollup_table).where(
+                        *(
+                            rollup_table.c[name].in_(list({key[i] for key in counts}))
+                            for i, name in enumerate(self._get_rollup_keys(rollup))
+                        ),
+                        *(rollup_table.c[name] == 0 for name in self._get_rollup_counters(rollup))
+                    )
+                )
+
+            connection.execute(delete(table).where(table.id.in_(primary_keys)))
+
+        await self.flush()  # Buffered logs must be in the rollup tables before subtracting
+        await self._run_in_transaction(delete_logs)
+
+    async def backfill_rollups(self) -> None:
+        """
+        .. versionadded:: v4.2
+
+        Recalculates the rollup tables (:class:`~daf.logging.sql.tables.MessageCOUNT` and
+        :class:`~daf.logging.sql.tables.InviteCOUNT`), used by
+        :py:meth:`~daf.logging.sql.LoggerSQL.analytic_get_num_messages`
+        and :py:meth:`~daf.logging.sql.LoggerSQL.analytic_get_num_invites`, from all the existing logs.
+
+        The rollup tables are updated together with the logs and are automatically filled on initialization,
+        if they are empty, so this only needs to be called after the logs are changed by something
+        other than the logger.
+
+        Raises
+        ------------
+        SQLAlchemyError
+            There was a problem with the database.
+        """
+        def backfill(connection: "sqa.Connection"):
+            self._backfill_rollup(connection, MessageCOUNT)
+            self._backfill_rollup(connection, InviteCOUNT)
+
+        await self.flush()
+        await self._run_in_transaction(backfill)
 
     @async_util.with_semaphore("_mutex")
     async def update(self, **kwargs):
@@ -1292,6 +1915,7 @@ class LoggerSQL(logging.LoggerBASE):
             Raised from .initialize() method.
         """
         try:
+            await self._flush()
             await self._stop_engine()
             await async_util.update_obj_param(self, **kwargs)
         except Exception:
@@ -1,9 +1,9 @@
-from datetime import datetime
+from datetime import datetime, date
 from typing import List
 
 
 from sqlalchemy import (
-    SmallInteger, Integer, BigInteger, DateTime,
+    SmallInteger, Integer, BigInteger, DateTime, Date,
     Sequence, String, JSON, select, ForeignKey, func, case
 )
 from sqlalchemy.orm import (
@@ -190,6 +190,9 @@ class DataHISTORY(ORMBase):
     -----------
     content: str
         The JSON string representing sent data.
+    content_hash: str
+        SHA-256 (hex) of the canonical JSON representation of sent data,
+        used for finding existing data.
     """
     __tablename__ = "DataHISTORY"
 
@@ -200,9 +203,11 @@ class DataHISTORY(ORMBase):
     )
 
     content = mapped_column(JSON())
+    content_hash = mapped_column(String(64), unique=True, index=True)
 
-    def __init__(self, content: dict):
+    def __init__(self, content: dict, content_hash: str = None):
         self.content = content
+        self.content_hash = content_hash
 
     def __eq__(self, __value: object) -> bool:
         return isinstance(__value, DataHISTORY) and self.id == __value.id
@@ -284,7 +289,7 @@ class MessageLOG(ORMBase):
     # [TextMESSAGE, DirectMESSAGE]
     message_mode_id: Mapped[int] = mapped_column(ForeignKey("MessageMODE.id"), nullable=True)
     dm_reason = mapped_column(String(3072))  # [DirectMESSAGE]
-    timestamp = mapped_column(DateTime)
+    timestamp = mapped_column(DateTime, index=True)
 
     sent_data: Mapped["DataHISTORY"] = relationship(lazy="joined")
     message_type: Mapped["MessageTYPE"] = relationship(lazy="joined")
@@ -367,7 +372,7 @@ class InviteLOG(ORMBase):
 
     invite_id = mapped_column(ForeignKey("Invite.id"))
     member_id = mapped_column(ForeignKey("GuildUSER.id"))
-    timestamp = mapped_column(DateTime)
+    timestamp = mapped_column(DateTime, index=True)
 
     invite: Mapped[Invite] = relationship(lazy="joined")
     member: Mapped[GuildUSER] = relationship(lazy="joined")
@@ -382,3 +387,81 @@ class InviteLOG(ORMBase):
 
     def __hash__(self):
         return self.id
+
+
+class MessageCOUNT(ORMBase):
+    """
+    Rollup table containing the number of message logs per day, guild, author and message type.
+    It is updated together with :class:`MessageLOG` and used for message counting analytics.
+
+    Parameters
+    ------------
+    day: date
+        The day the messages were sent.
+    guild_id: int
+        Foreign key pointing to GuildUSER.id (the guild / user messages were sent to).
+    author_id: int
+        Foreign key pointing to GuildUSER.id (the author of the messages).
+    message_type_id: int
+        Foreign key pointing to MessageTYPE.id.
+    successful: int
+        Number of messages that were successfully sent (into at least one channel).
+    failed: int
+        Number of messages that failed to be sent.
+    """
+    __tablename__ = "MessageCOUNT"
+
+    day = mapped_column(Date, primary_key=True)
+    guild_id: Mapped[int] = mapped_column(ForeignKey("GuildUSER.id"), primary_key=True)
+    author_id: Mapped[int] = mapped_column(ForeignKey("GuildUSER.id"), primary_key=True)
+    message_type_id: Mapped[int] = mapped_column(ForeignKey("MessageTYPE.id"), primary_key=True)
+    successful = mapped_column(Integer, default=0)
+    failed = mapped_column(Integer, default=0)
+
+    guild: Mapped["GuildUSER"] = relationship(foreign_keys=[guild_id])
+    author: Mapped["GuildUSER"] = relationship(foreign_keys=[author_id])
+    message_type: Mapped["MessageTYPE"] = relationship()
+
+    def __init__(
+        self,
+        day: date,
+        guild_id: int,
+        author_id: int,
+        message_type_id: int,
+        successful: int = 0,
+        failed: int = 0
+    ):
+        self.day = day
+        self.guild_id = guild_id
+        self.author_id = author_id
+        self.message_type_id = message_type_id
+        self.successful = successful
+        self.failed = failed
+
+
+class InviteCOUNT(ORMBase):
+    """
+    Rollup table containing the number of invite logs (member joins) per day and invite.
+    It is updated together with :class:`InviteLOG` and used for invite counting analytics.
+
+    Parameters
+    ------------
+    day: date
+        The day the members joined.
+    invite_id: int
+        Foreign key pointing to Invite.id.
+    count: int
+        Number of members that joined.
+    """
+    __tablename__ = "InviteCOUNT"
+
+    day = mapped_column(Date, primary_key=True)
+    invite_id: Mapped[int] = mapped_column(ForeignKey("Invite.id"), primary_key=True)
+    count = mapped_column(Integer, default=0)
+
+    invite: Mapped[Invite] = relationship()
+
+    def __init__(self, day: date, invite_id: int, count: int = 0):
+        self.day = day
+        self.invite_id = invite_id
+        self.count = count
@@ -2,7 +2,8 @@
 Logical operations for keywords.
 """
 from __future__ import annotations
-from typing import List
+from typing import List, Callable, Dict, Tuple, FrozenSet, Optional
+from weakref import WeakKeyDictionary
 from abc import ABC, abstractmethod
 from typeguard import typechecked
 
@@ -20,6 +21,66 @@ __all__ = (
 )
 
 
+WORD_REGEX = re.compile(r'\w+')  # \w+ == match all words, including **bold**
+
+
+class MatchInput:
+    """
+    Text being matched by a compiled expression.
+    The text is tokenized lazily and at most once for each case sensitivity,
+    no matter how many operands the expression has.
+    """
+    __slots__ = ("text", "_words", "_words_lower")
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self._words: Optional[FrozenSet[str]] = None
+        self._words_lower: Optional[FrozenSet[str]] = None
+
+    @property
+    def words(self) -> FrozenSet[str]:
+        "Returns a set of words inside the text."
+        if self._words is None:
+            self._words = frozenset(WORD_REGEX.findall(self.text))
+
+        return self._words
+
+    @property
+    def words_lower(self) -> FrozenSet[str]:
+        "Returns a set of words inside the lower-cased text."
+        if self._words_lower is None:
+            self._words_lower = frozenset(WORD_REGEX.findall(self.text.lower()))
+
+        return self._words_lower
+
+
+Matcher = Callable[[MatchInput], bool]
+Triggers = Optional[FrozenSet[Tuple[str, bool]]]
+
+
+class CompiledLogic:
+    """
+    A :class:`BaseLogic` expression compiled into a single matcher function.
+    Use :py:meth:`BaseLogic.compile` to obtain it.
+    """
+    __slots__ = ("_matcher",)
+
+    def __init__(self, matcher: Matcher) -> None:
+        self._matcher = matcher
+
+    def check(self, input: str) -> bool:
+        "Checks if the ``input`` text matches the compiled expression."
+        return self._matcher(MatchInput(input))
+
+    def match(self, input: MatchInput) -> bool:
+        "Checks if the already wrapped ``input`` matches the compiled expression."
+        return self._matcher(input)
+
+
+# Expression => (operands the matcher was compiled from, compiled matcher)
+COMPILED_CACHE: WeakKeyDictionary[BaseLogic, Tuple[tuple, CompiledLogic]] = WeakKeyDictionary()
+
+
 class BaseLogic(ABC):
     """
     A logic interface for building keyword expressions.
@@ -28,6 +89,52 @@ class BaseLogic(ABC):
     def check(self, input: str) -> bool:
         pass
 
+    def compile(self) -> CompiledLogic:
+        """
+        .. versionadded:: 4.2
+
+        Compiles the expression into an optimized matcher.
+        The matcher tokenizes the text only once for the entire expression,
+        joins word checks into set operations and merges regex operands into a single pattern where possible.
+
+        The compiled matcher is cached and compiled again if the ``operands`` of the expression
+        (or of its nested expressions) were changed since.
+
+        Returns
+        ----------
+        CompiledLogic
+            The compiled matcher, whose ``check(input)`` method behaves like :py:meth:`BaseLogic.check`.
+        """
+        operands = self._operands_key()
+        cached = COMPILED_CACHE.get(self)
+        if cached is None or cached[0] != operands:
+            cached = COMPILED_CACHE[self] = (operands, CompiledLogic(self._compile()))
+
+        return cached[1]
+
+    def _operands_key(self) -> tuple:
+        """
+        Returns the operands of the expression and of its nested expressions.
+        A different key means the expression was modified after it was compiled.
+        """
+        return ()
+
+    def _compile(self) -> Matcher:
+        """
+        Returns a function that evaluates the expression against a :class:`MatchInput`.
+        Defaults to calling the :py:meth:`BaseLogic.check` method, so that custom expressions also work.
+        """
+        check = self.check
+        return lambda input: check(input.text)
+
+    def _triggers(self) -> Triggers:
+        """
+        Returns a set of (word, case_sensitive) pairs, of which at least one needs to be inside a text
+        for the expression to have any chance of matching it.
+        None means the expression could match any text.
+        """
+        return None
+
 
 class BooleanLogic(BaseLogic):
     """
@@ -46,6 +153,24 @@ class BooleanLogic(BaseLogic):
     ) -> None:
         self.operands: List[BaseLogic] = [*operands, *args]
 
+    def check(self, input: str) -> bool:
+        return self.compile().check(input)
+
+    def _operands_key(self) -> tuple:
+        # The operands themselves (not their IDs) are kept, so that their IDs can't be reused
+        return tuple((op, op._operands_key()) for op in self.operands)
+
+    def _flat_operands(self) -> List[BaseLogic]:
+        "Returns operands with nested operators of the same type merged into this one."
+        operands = []
+        for op in self.operands:
+            if type(op) is type(self):
+                operands.extend(op._flat_operands())
+            else:
+                operands.append(op)
+
+        return operands
+
 
 @doc_category("Text matching (logic)")
 class and_(BooleanLogic):
@@ -58,12 +183,33 @@ class and_(BooleanLogic):
         Arbitrary number of operands (either logic boolean or text operands).
     """
 
-    def check(self, input: str):
-        for op in self.operands:
-            if not op.check(input):
-                return False
+    def _compile(self) -> Matcher:
+        case_words, nocase_words = set(), set()
+        matchers: List[Matcher] = []
+        for op in self._flat_operands():
+            # All the words of all the contains operands can be checked at once
+            if type(op) is contains:
+                (case_words if op.case_sensitive else nocase_words).update(op.words)
+            else:
+                matchers.append(op._compile())
+
+        # Word checks are cheap, do them before anything else
+        if nocase_words:
+            matchers.insert(0, contains._compile_words(frozenset(nocase_words), False))
+
+        if case_words:
+            matchers.insert(0, contains._compile_words(frozenset(case_words), True))
+
+        if len(matchers) == 1:
+            return matchers[0]
+
+        matchers = tuple(matchers)
+        return lambda input: all(m(input) for m in matchers)
 
-        return True
+    def _triggers(self) -> Triggers:
+        # Any operand's triggers are enough, the one with the least alternatives is the most selective
+        triggers = [t for t in (op._triggers() for op in self.operands) if t is not None]
+        return min(triggers, key=len, default=None)
 
 
 @doc_category("Text matching (logic)")
@@ -76,12 +222,48 @@ class or_(BooleanLogic):
     args: Unpack[BaseLogic]
         Arbitrary number of operands (either logic boolean or text operands).
     """
-    def check(self, input: str):
+    def _compile(self) -> Matcher:
+        case_words, nocase_words = set(), set()
+        regex_groups: Dict[Tuple[int, bool], List[regex]] = {}
+        matchers: List[Matcher] = []
+        for op in self._flat_operands():
+            type_ = type(op)
+            # Single words of contains operands can be checked at once
+            if type_ is contains and len(op.words) == 1:
+                (case_words if op.case_sensitive else nocase_words).update(op.words)
+            elif type_ is regex:
+                regex_groups.setdefault((op.flags, op.full_match), []).append(op)
+            else:
+                matchers.append(op._compile())
+
+        for (flags, full_match), group in regex_groups.items():
+            matchers.extend(regex._compile_merged(group, flags, full_match))
+
+        # Word checks are cheap, do them before anything else
+        if nocase_words:
+            matchers.insert(0, contains._compile_any_word(frozenset(nocase_words), False))
+
+        if case_words:
+            matchers.insert(0, contains._compile_any_word(frozenset(case_words), True))
+
+        if not matchers:
+            return lambda input: False
+
+        if len(matchers) == 1:
+            return matchers[0]
+
+        matchers = tuple(matchers)
+        return lambda input: any(m(input) for m in matchers)
+
+    def _triggers(self) -> Triggers:
+        triggers = set()
         for op in self.operands:
-            if op.check(input):
-                return True
+            if (op_triggers := op._triggers()) is None:  # The operand could match anything
+                return None
+
+            triggers.update(op_triggers)
 
-        return False
+        return frozenset(triggers)
 
 
 @doc_category("Text matching (logic)")
@@ -102,8 +284,9 @@ class not_(BooleanLogic):
     def operand(self):
         return self.operands[0]
 
-    def check(self, input: str):
-        return not self.operand.check(input)
+    def _compile(self) -> Matcher:
+        matcher = self.operand._compile()
+        return lambda input: not matcher(input)
 
 
 
@@ -124,11 +307,39 @@ class contains(BaseLogic):
 
         self.keyword = keyword
 
+    @property
+    def words(self) -> FrozenSet[str]:
+        "The words that need to be inside a text message."
+        return frozenset(self.keyword.split(' '))
+
     def check(self, input: str):
         if not self.case_sensitive:
             input = input.lower()
 
-        return set(self.keyword.split(' ')).issubset(set(re.findall(r'\w+', input)))  # \w+ == match all words, including **bold**
+        return self.words.issubset(WORD_REGEX.findall(input))
+
+    def _compile(self) -> Matcher:
+        return self._compile_words(self.words, self.case_sensitive)
+
+    def _triggers(self) -> Triggers:
+        # All the words are needed, the longest one is likely the rarest
+        return frozenset({(max(self.words, key=lambda word: (len(word), word)), self.case_sensitive)})
+
+    @staticmethod
+    def _compile_words(words: FrozenSet[str], case_sensitive: bool) -> Matcher:
+        "Returns a matcher that checks if all the ``words`` are inside the text."
+        if case_sensitive:
+            return lambda input: words <= input.words
+
+        return lambda input: words <= input.words_lower
+
+    @staticmethod
+    def _compile_any_word(words: FrozenSet[str], case_sensitive: bool) -> Matcher:
+        "Returns a matcher that checks if any of the ``words`` is inside the text."
+        if case_sensitive:
+            return lambda input: not words.isdisjoint(input.words)
+
+        return lambda input: not words.isdisjoint(input.words_lower)
 
 
 @doc_category("Text matching (logic)")
@@ -172,3 +383,27 @@ class regex(BaseLogic):
 
     def check(self, input: str):
         return self._checker(self._compiled, input) is not None
+
+    def _compile(self) -> Matcher:
+        checker = self._compiled.fullmatch if self._full_match else self._compiled.search
+        return lambda input: checker(input.text) is not None
+
+    @staticmethod
+    def _compile_merged(operands: List[regex], flags: re.RegexFlag, full_match: bool) -> List[Matcher]:
+        """
+        Merges regex ``operands`` (of the same ``flags`` and ``full_match``) into a single alternation.
+        Operands that cannot be merged are returned as separate matchers.
+        Patterns with capturing groups are not merged, as their references break in the alternation
+        and saving the groups of each alternative makes the merged pattern slower than the separate ones.
+        """
+        mergeable = [op for op in operands if not op._compiled.groups]
+        matchers = [op._compile() for op in operands if op not in mergeable]
+        if len(mergeable) < 2:
+            return [op._compile() for op in mergeable] + matchers
+
+        try:
+            merged = regex('|'.join(f"(?:{op.pattern})" for op in mergeable), flags, full_match)
+        except re.error:  # Eg. inline global flags or duplicated group names
+            return [op._compile() for op in mergeable] + matchers
+
+        return [merged._compile()] + matchers
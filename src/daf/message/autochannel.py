@@ -6,6 +6,7 @@ from ..logging.tracing import trace, TraceLEVELS
 
 from ..logic import BaseLogic
 from ..logic import *
+from ..events import *
 
 import _discord as discord
 import re
@@ -43,6 +44,11 @@ class AutoCHANNEL:
             channels=daf.message.AutoCHANNEL(...)
         )
 
+    .. versionchanged:: v4.2
+
+        Found channels are now cached and only searched for again after a change to the guild's channels,
+        roles or our own member is received from Discord.
+
     Parameters
     --------------
     include_pattern: BaseLogic
@@ -54,7 +60,11 @@ class AutoCHANNEL:
         "parent",
         "removed_channels",
         "channel_getter",
-        "_cache"
+        "_cache",
+        "_cache_valid",
+        "_cache_hits",
+        "_cache_misses",
+        "_event_ctrl",
     )
 
     @typechecked
@@ -84,6 +94,10 @@ class AutoCHANNEL:
         self.channel_getter: Callable = None
         self.removed_channels: Set[int] = set()
         self._cache = []
+        self._cache_valid = False
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._event_ctrl: EventController = None
 
     def __iter__(self):
         "Returns the channel iterator."
@@ -102,31 +116,67 @@ class AutoCHANNEL:
         "Return a list of found channels"
         return self._cache[:]
 
+    @property
+    def cache_hits(self) -> int:
+        """
+        .. versionadded:: v4.2
+
+        Returns the number of times the channels were returned from cache.
+        """
+        return self._cache_hits
+
+    @property
+    def cache_misses(self) -> int:
+        """
+        .. versionadded:: v4.2
+
+        Returns the number of times the channels had to be searched for again.
+        """
+        return self._cache_misses
+
     def _get_channels(self) -> List[ChannelType]:
         """
         Property that returns a list of :class:`discord.TextChannel` or :class:`discord.VoiceChannel`
         (depends on the xMESSAGE type this is in) objects in cache.
+
+        The channels are only searched for again if the cache was invalidated
+        by a Discord event (see :py:meth:`~daf.message.AutoCHANNEL._invalidate`).
         """
+        if self._cache_valid:
+            self._cache_hits += 1
+            return self._cache
+
+        self._cache_misses += 1
         channel: ChannelType
         _found = []
+        check_name = self.include_pattern.compile().check
         for channel in self.channel_getter():
             if channel.id not in self.removed_channels:
                 if (member := channel.guild.get_member(channel._state.user.id)) is None:  # Invalid intents?
-                    return
+                    return []
 
                 perms = channel.permissions_for(member)
                 name = channel.name
                 if (
                     name is not None and
                     (perms.send_messages or (perms.connect and perms.stream and perms.speak)) and
-                    self.include_pattern.check(name)
+                    check_name(name)
                 ):
                     _found.append(channel)
 
         self._cache = _found
+        self._cache_valid = self._event_ctrl is not None  # Can't track changes without events
         return _found
 
-    async def initialize(self, parent, channel_getter: Callable):
+    def _invalidate(self, *args, **kwargs):
+        "Invalidates the cache, making the next iteration search for channels again."
+        self._cache_valid = False
+
+    def _is_own_guild(self, guild: discord.Guild) -> bool:
+        "Checks if ``guild`` is the guild this object searches channels in."
+        return guild is not None and self.parent.parent.snowflake == guild.id
+
+    async def initialize(self, parent, channel_getter: Callable, event_ctrl: Optional[EventController] = None):
         """
         Initializes async parts of the instance.
         This method should be called by ``parent``.
@@ -136,15 +186,69 @@ class AutoCHANNEL:
             Changed the channel ``channel_type`` into ``channel_getter``, which is now
             a function that can be used to get a list of all the correct channels.
 
+        .. versionchanged:: v4.2
+
+            Added ``event_ctrl`` parameter.
+
         Parameters
         -----------
         parent: message.BaseMESSAGE
             The message object this AutoCHANNEL instance is in.
-        channel_type: str
-            The channel type to look for when searching for channels
+        channel_getter: Callable
+            Function for retrieving available channels.
+        event_ctrl: Optional[EventController]
+            The ACCOUNT bound event controller, used for invalidating the channel cache.
+            If not given, channels are searched for on every iteration.
         """
+        self._close()  # In case of repeated initialization
         self.parent = parent
         self.channel_getter = channel_getter
+        self._event_ctrl = event_ctrl
+        if event_ctrl is None:
+            return
+
+        own_guild = self._is_own_guild
+        event_ctrl.add_listener(
+            EventID.discord_guild_channel_create, self._invalidate, lambda ch: own_guild(ch.guild)
+        )
+        event_ctrl.add_listener(
+            EventID.discord_guild_channel_delete, self._invalidate, lambda ch: own_guild(ch.guild)
+        )
+        event_ctrl.add_listener(
+            EventID.discord_guild_channel_update, self._invalidate, lambda before, after: own_guild(after.guild)
+        )
+        event_ctrl.add_listener(
+            EventID.discord_guild_role_create, self._invalidate, lambda role: own_guild(role.guild)
+        )
+        event_ctrl.add_listener(
+            EventID.discord_guild_role_delete, self._invalidate, lambda role: own_guild(role.guild)
+        )
+        event_ctrl.add_listener(
+            EventID.discord_guild_role_update, self._invalidate, lambda before, after: own_guild(after.guild)
+        )
+        event_ctrl.add_listener(
+            EventID.discord_member_update, self._invalidate, lambda before, after: own_guild(after.guild)
+        )
+
+    def _close(self):
+        "Removes the cache invalidation listeners."
+        event_ctrl = self._event_ctrl
+        if event_ctrl is None:  # Not initialized or already closed
+            return
+
+        for event in (
+            EventID.discord_guild_channel_create,
+            EventID.discord_guild_channel_delete,
+            EventID.discord_guild_channel_update,
+            EventID.discord_guild_role_create,
+            EventID.discord_guild_role_delete,
+            EventID.discord_guild_role_update,
+            EventID.discord_member_update,
+        ):
+            event_ctrl.remove_listener(event, self._invalidate)
+
+        self._event_ctrl = None
+        self._cache_valid = False
 
     def remove(self, channel: ChannelType):
         """
@@ -161,6 +265,7 @@ class AutoCHANNEL:
             The channel is not in cache.
         """
         self.removed_channels.add(channel.id)
+        self._cache_valid = False
 
     async def update(self, init_options = None, **kwargs):
         """
@@ -181,7 +286,9 @@ class AutoCHANNEL:
             init_options = {}
             init_options["parent"] = self.parent
             init_options["channel_getter"] = self.channel_getter
+            init_options["event_ctrl"] = self._event_ctrl
 
+        self._close()  # __init__ would otherwise lose the reference to the listeners
         if "exclude_pattern" not in kwargs: # DEPRECATED; TODO: remove in 4.2.0
             kwargs["exclude_pattern"] = None
 
@@ -565,7 +565,7 @@ class BaseChannelMessage(BaseMESSAGE):
         channel_getter = partial(channel_getter, *channel_types)
 
         if isinstance(self.channels, AutoCHANNEL):
-            await self.channels.initialize(self, channel_getter)
+            await self.channels.initialize(self, channel_getter, event_ctrl)
         else:
             for ch_i, channel in enumerate(self.channels):
                 if isinstance(channel, discord.abc.GuildChannel):
@@ -617,7 +617,9 @@ class BaseChannelMessage(BaseMESSAGE):
 
         kwargs["channels"] = channels = kwargs.get("channels", self.channels)
         if isinstance(channels, AutoCHANNEL):
-            await channels.update(init_options={"parent": self, "channel_getter": self.channel_getter})
+            await channels.update(
+                init_options={"parent": self, "channel_getter": self.channel_getter, "event_ctrl": self._event_ctrl}
+            )
 
         if _init_options is None:
             _init_options = {
@@ -631,3 +633,9 @@ class BaseChannelMessage(BaseMESSAGE):
         except Exception:
             await self.initialize(self.parent, self._event_ctrl, self.channel_getter)
             raise
+
+    async def _close(self):
+        if isinstance(self.channels, AutoCHANNEL):
+            self.channels._close()
+
+        return await super()._close()
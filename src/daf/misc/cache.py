@@ -1,13 +1,16 @@
 """
 Utility module used for caching.
 """
-from typing import Callable
+from typing import Any, Callable, Hashable, Tuple
+from collections import OrderedDict
 from functools import wraps
 import pickle
+import time
 
 
 __all__ = (
     "cache_result",
+    "TTLCache",
 )
 
 
@@ -49,3 +52,62 @@ def cache_result(max: int = 256):
         return wrapper
 
     return _decorator
+
+
+class TTLCache:
+    """
+    Cache of limited size, whose items expire after their time-to-live.
+    When the cache is full, the least recently set item is removed.
+
+    Parameters
+    --------------
+    max: int
+        The maximum number of items inside the cache.
+    """
+    __slots__ = ("max", "_items")
+
+    def __init__(self, max: int = 256) -> None:
+        self.max = max
+        self._items: OrderedDict[Hashable, Tuple[Any, float]] = OrderedDict()
+
+    def set(self, key: Hashable, ttl: float, value: Any = None):
+        """
+        Sets the ``key`` to ``value`` for ``ttl`` seconds.
+
+        Parameters
+        --------------
+        key: Hashable
+            The key of the item.
+        ttl: float
+            Seconds after which the item expires.
+        value: Any
+            The value of the item.
+        """
+        items = self._items
+        items[key] = (value, time.monotonic() + ttl)
+        items.move_to_end(key)
+        if len(items) > self.max:
+            items.popitem(last=False)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        "Returns the value of ``key`` if it exists and has not expired, otherwise ``default``."
+        item = self._items.get(key)
+        if item is None:
+            return default
+
+        value, expires = item
+        if expires <= time.monotonic():
+            del self._items[key]
+            return default
+
+        return value
+
+    def clear(self):
+        "Removes all the items."
+        self._items.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, Ellipsis) is not Ellipsis
+
+    def __len__(self) -> int:
+        return len(self._items)
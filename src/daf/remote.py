@@ -188,6 +188,49 @@ async def http_get_logger():
     return create_json_response(logger=convert.convert_object_to_semi_dict(logging.get_logger()))
 
 
+@register("/logging/logs", "GET")
+@doc.doc_category("Logging", api_type="HTTP")
+async def http_get_logs(
+    kind: Literal["message", "invite"] = "message",
+    cursor: Optional[str] = None,
+    limit: int = 500,
+    **kwargs
+):
+    """
+    .. versionadded:: v4.2
+
+    Returns one page of logs from the active logger and the cursor of the next page.
+    Responses contain at most ``limit`` logs, no matter how many logs match.
+
+    Parameters
+    -------------
+    kind: Literal["message", "invite"]
+        Type of the logs. Defaults to "message".
+    cursor: Optional[str]
+        The cursor returned with the previous page. None (default) returns the first page.
+    limit: int
+        Maximum number of logs in the page. Defaults to 500.
+    kwargs
+        Filters, passed to :py:meth:`~daf.logging.LoggerBASE.analytic_get_message_log_page`
+        or :py:meth:`~daf.logging.LoggerBASE.analytic_get_invite_log_page`.
+
+    Returns
+    ----------
+    logs: list
+        The logs of the page.
+    cursor: str | None
+        The cursor of the next page, None if there are no more logs.
+    """
+    if kind not in ("message", "invite"):
+        raise ValueError(f"Invalid log kind: {kind}")
+
+    logger = logging.get_logger()
+    logs, cursor = await getattr(logger, f"analytic_get_{kind}_log_page")(
+        **convert.convert_from_semi_dict(kwargs), limit=limit, cursor=cursor
+    )
+    return create_json_response(logs=convert.convert_object_to_semi_dict(logs), cursor=cursor)
+
+
 @register("/object", "GET")
 @doc.doc_category("Object", api_type="HTTP")
 async def http_get_object(object_id: int):
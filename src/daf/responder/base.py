@@ -1,11 +1,11 @@
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Set, Hashable, Optional
+from datetime import timedelta
 
 from .constraints import ConstraintBase
 from .actions import BaseResponse
 from ..logic import BaseLogic
-from ..events import EventID
 
 import asyncio_event_hub as aeh
 import _discord as discord
@@ -14,6 +14,11 @@ import _discord as discord
 __all__ = ("ResponderBase",)
 
 
+# Keys under which responders are routed (besides guild snowflake IDs)
+ROUTE_DM = "dm"
+ROUTE_ANY_GUILD = "guild"
+
+
 class ResponderBase(ABC):
     """
     The responder is an object capable of making automatic replies to messages based on some
@@ -30,11 +35,18 @@ class ResponderBase(ABC):
         In addition to ``condition``, constraints add additional checks that need to be fulfilled
         before performing an action.
         All of the constraints inside the ``constraints`` list need to be fulfilled.
+    cooldown: Optional[timedelta]
+        The minimal period between two responses to the same user in the same channel.
+        Messages received inside this period are ignored.
+        Regardless of the cooldown, messages received while the previous response
+        to the same user in the same channel is still pending, are ignored.
+        Defaults to None (no cooldown).
     """
     __slots__ = (
         "condition",
         "constraints",
         "action",
+        "cooldown",
         "event_ctrl",
         "client",
     )
@@ -43,29 +55,69 @@ class ResponderBase(ABC):
         self,
         condition: BaseLogic,
         action: BaseResponse,
-        constraints: List[ConstraintBase]
+        constraints: List[ConstraintBase],
+        cooldown: Optional[timedelta] = None
     ) -> None:
         self.condition = condition
         self.constraints = constraints
         self.action = action
+        self.cooldown = cooldown
         self.event_ctrl: aeh.EventController = None
         self.client: discord.Client = None
 
     async def handle_message(self, message: discord.Message):
         "Processes message and performs an action if all constraints satisfied."
-        for const in self.constraints:  # Check constraints
-            if not const.check(message, self.client):
-                return
-
         # Check keywords
-        if not self.condition.check(message.clean_content):
+        if not self.condition.compile().check(message.clean_content):
+            return
+
+        if not self._check_message(message, self.client):
+            return
+
+        if not self._check_constraints(message):
             return
 
         await self.action.perform(message)  # All constraints satisfied
 
+    def _check_constraints(self, message: discord.Message) -> bool:
+        """
+        Checks if all the constraints are satisfied.
+        The ``message`` must already be matched by the condition and
+        be checked by :py:meth:`~daf.responder.ResponderBase._check_message`.
+        """
+        for const in self.constraints:
+            if not const.check(message, self.client):
+                return False
+
+        return True
+
+    @classmethod
     @abstractmethod
-    async def initialize(self, event_ctrl: aeh.EventController, client: discord.Client):
+    def _check_message(cls, message: discord.Message, client: discord.Client) -> bool:
+        """
+        Checks if responders of this type are able to respond to the ``message`` (eg. in the correct channel type
+        and with sufficient permissions).
+        The result is the same for all the responders of the same type, so it is computed once per message.
+        """
+        pass
+
+    @abstractmethod
+    def _get_routes(self) -> Set[Hashable]:
+        """
+        Returns keys of messages that the responder could respond to.
+        A key is either ``ROUTE_DM``, ``ROUTE_ANY_GUILD`` or a snowflake ID of a guild.
+        """
         pass
 
+    async def initialize(self, event_ctrl: aeh.EventController, client: discord.Client):
+        """
+        Initializes the responder.
+        Messages are dispatched to responders by the account's responder engine.
+        """
+        self.event_ctrl = event_ctrl
+        self.client = client
+
     def close(self):
-        self.event_ctrl.remove_listener(EventID.discord_message, self.handle_message)
+        "Closes the responder."
+        self.event_ctrl = None
+        self.client = None
@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Union, Optional
 from typeguard import typechecked
 
 from .baseconstraint import ConstraintBase
@@ -15,6 +15,12 @@ class BaseGuildConstraint(ConstraintBase):
     """
     Constraint base for all guild constraints.
     """
+    def _get_guild(self) -> Optional[int]:
+        """
+        Returns the snowflake ID of the only guild in which the constraint can be fulfilled.
+        None means the constraint can be fulfilled in any guild.
+        """
+        return None
 
 @doc_category("Auto responder")
 class GuildConstraint(BaseGuildConstraint):
@@ -33,3 +39,6 @@ class GuildConstraint(BaseGuildConstraint):
 
     def check(self, message: discord.Message, client: discord.Client) -> bool:
         return message.guild and message.guild.id == self.guild
+
+    def _get_guild(self) -> Optional[int]:
+        return self.guild
@@ -1,15 +1,14 @@
 from typeguard import typechecked
-from typing import List
+from typing import List, Set, Hashable, Optional
+from datetime import timedelta
 
 from ..misc.instance_track import track_id
 from .constraints import BaseDMConstraint
 from ..misc.doc import doc_category
 from .actions import DMResponse
-from .base import ResponderBase
+from .base import ResponderBase, ROUTE_DM
 from ..logic import BaseLogic
-from ..events import EventID
 
-import asyncio_event_hub as aeh
 import _discord as discord
 
 
@@ -27,15 +26,14 @@ class DMResponder(ResponderBase):
         self,
         condition: BaseLogic,    
         action: DMResponse,
-        constraints: List[BaseDMConstraint] = [], 
+        constraints: List[BaseDMConstraint] = [],
+        cooldown: Optional[timedelta] = None,
     ) -> None:
-        super().__init__(condition, action, constraints)
-
-    async def initialize(self, event_ctrl: aeh.EventController, client: discord.Client):
-        event_ctrl.add_listener(
-            EventID.discord_message,
-            self.handle_message,
-            lambda m: isinstance(m.channel, discord.DMChannel)
-        )
-        self.event_ctrl = event_ctrl
-        self.client = client
+        super().__init__(condition, action, constraints, cooldown)
+
+    @classmethod
+    def _check_message(cls, message: discord.Message, client: discord.Client) -> bool:
+        return isinstance(message.channel, discord.DMChannel)
+
+    def _get_routes(self) -> Set[Hashable]:
+        return {ROUTE_DM}
@@ -0,0 +1,315 @@
+"""
+Implements the per-account dispatching of messages to automatic responders.
+"""
+from typing import Dict, List, Set, Hashable, Optional, Tuple
+from contextlib import contextmanager, suppress
+
+from .base import ResponderBase, ROUTE_DM, ROUTE_ANY_GUILD
+from ..logging.tracing import trace, TraceLEVELS
+from ..misc.cache import TTLCache
+from ..logic import MatchInput, Matcher, BaseLogic, regex, or_
+
+import _discord as discord
+import asyncio
+
+
+__all__ = ("ResponderEngine",)
+
+
+# Configuration
+RESPONSE_WORKERS = 4  # Number of tasks performing the responses of a single account
+RESPONSE_QUEUE_SIZE = 100  # Maximum number of responses waiting to be performed
+COOLDOWN_CACHE_SIZE = 10_000  # Maximum number of (responder, user, channel) cooldowns remembered
+RESPONSE_MAX_YIELD = 5  # Maximum number of seconds a response waits for the account's ongoing message sends
+
+
+class ResponderEngine:
+    """
+    Dispatches received messages to all the responders of an account.
+
+    Instead of each responder checking each message on its own, the engine indexes the
+    responders by the words that need to be inside the message for their condition to be able to match.
+    For each message the clean content is computed and tokenized only once, the candidate responders are found
+    by looking up the message's words inside the index and only the responders whose condition matched,
+    get their constraints checked.
+
+    Responders whose condition is a :class:`~daf.logic.regex` (or an :class:`~daf.logic.or_` of regex operands and
+    indexable operands) are indexed by their regex patterns. Patterns of the same flags are merged into a
+    single alternation, searched once per message. Only when it matches, the patterns are searched one by one, to find
+    the candidate responders. Patterns with capturing groups can't be merged and are searched on every message,
+    use non-capturing groups (``(?:...)``) instead where possible.
+    Responders whose condition can't be indexed in either way (eg. :class:`~daf.logic.not_`)
+    are checked on every message.
+
+    Responders are also indexed by the messages they can respond to (DM, any guild, specific guild),
+    so that a message is only processed by responders that can apply to it at all.
+    Checks that are common to responders of the same type (eg. permissions in the message's channel)
+    are done only once for each message.
+
+    Responses are not performed while handling the message, but are queued and performed by
+    a bounded pool of worker tasks, so a burst of triggering messages can't stall the account.
+    Messages triggering a responder for the same user in the same channel, while the response is still
+    queued or the responder's cooldown has not yet passed, are dropped before making any requests to Discord.
+    When the queue is full, new responses are dropped (with a warning).
+    Responses yield to advertisements - workers wait for the account's ongoing message sends
+    (see :py:meth:`~daf.responder.engine.ResponderEngine.advertising`) to finish first,
+    but at most :data:`RESPONSE_MAX_YIELD` seconds, so constant advertising can't hold the responses back.
+
+    Parameters
+    -------------
+    client: discord.Client
+        The client of the account the engine belongs to.
+    """
+    __slots__ = (
+        "client",
+        "_responders",
+        "_words",
+        "_words_case",
+        "_unindexed",
+        "_regexes",
+        "_routes",
+        "_queue",
+        "_workers",
+        "_pending",
+        "_cooldowns",
+        "_sends_active",
+        "_sends_idle",
+    )
+
+    def __init__(self, client: discord.Client) -> None:
+        self.client = client
+        self._responders: List[ResponderBase] = []
+        self._words: Dict[str, Set[int]] = {}
+        self._words_case: Dict[str, Set[int]] = {}
+        self._unindexed: Set[int] = set()
+        # (merged patterns, [(pattern, responder index)], responder indexes) of each regex flags group
+        self._regexes: List[Tuple[List[Matcher], List[Tuple[Matcher, int]], Set[int]]] = []
+        self._routes: Dict[Hashable, Set[int]] = {}
+        self._queue: asyncio.Queue = None
+        self._workers: List[asyncio.Task] = []
+        self._pending: Set[Tuple[ResponderBase, int, int]] = set()
+        self._cooldowns = TTLCache(COOLDOWN_CACHE_SIZE)
+        self._sends_active = 0
+        self._sends_idle: asyncio.Event = None
+
+    @property
+    def responders(self) -> List[ResponderBase]:
+        "Returns the list of responders inside the engine."
+        return self._responders[:]
+
+    def add(self, responder: ResponderBase):
+        "Adds a responder to the engine."
+        self._responders.append(responder)
+        self._rebuild()
+
+    def remove(self, responder: ResponderBase):
+        """
+        Removes a responder from the engine.
+
+        Raises
+        ---------
+        ValueError
+            The responder is not inside the engine.
+        """
+        self._responders.remove(responder)
+        self._rebuild()
+
+    def clear(self):
+        "Removes all the responders from the engine."
+        self._responders.clear()
+        self._rebuild()
+
+    def start(self):
+        "Starts the worker tasks performing the responses."
+        self._queue = asyncio.Queue(RESPONSE_QUEUE_SIZE)
+        self._sends_idle = asyncio.Event()
+        self._sends_idle.set()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(RESPONSE_WORKERS)]
+
+    async def stop(self):
+        "Stops the worker tasks and drops the responses that were not yet performed."
+        for worker in self._workers:
+            worker.cancel()
+
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        self._pending.clear()
+        self._cooldowns.clear()
+        self._queue = None
+
+    @contextmanager
+    def advertising(self):
+        """
+        Context manager that holds back responses (not yet in progress) while the account
+        is sending advertisements.
+        """
+        self._sends_active += 1
+        if self._sends_idle is not None:
+            self._sends_idle.clear()
+
+        try:
+            yield
+        finally:
+            self._sends_active -= 1
+            if not self._sends_active and self._sends_idle is not None:
+                self._sends_idle.set()
+
+    def _rebuild(self):
+        "Rebuilds the word and route indexes based on the responders' conditions and constraints."
+        words: Dict[str, Set[int]] = {}
+        words_case: Dict[str, Set[int]] = {}
+        unindexed: Set[int] = set()
+        regexes: Dict[Tuple[int, bool], List[Tuple[regex, int]]] = {}
+        routes: Dict[Hashable, Set[int]] = {}
+        for i, responder in enumerate(self._responders):
+            for route in responder._get_routes():
+                routes.setdefault(route, set()).add(i)
+
+            triggers = responder.condition._triggers()
+            if triggers is None:
+                if (split := self._split_regexes(responder.condition)) is None:
+                    unindexed.add(i)
+                    continue
+
+                triggers, operands = split
+                for op in operands:
+                    regexes.setdefault((op.flags, op.full_match), []).append((op, i))
+
+            for word, case_sensitive in triggers:
+                (words_case if case_sensitive else words).setdefault(word, set()).add(i)
+
+        self._words = words
+        self._words_case = words_case
+        self._unindexed = unindexed
+        self._regexes = []
+        for (flags, full_match), group in regexes.items():
+            merged = regex._compile_merged([op for op, _ in group], flags, full_match)
+            self._regexes.append((merged, [(op._compile(), i) for op, i in group], {i for _, i in group}))
+
+        self._routes = routes
+
+    @staticmethod
+    def _split_regexes(condition: BaseLogic) -> Optional[Tuple[Set[Tuple[str, bool]], List[regex]]]:
+        """
+        Splits a ``condition``, that can match without any specific word, into (word, case_sensitive) triggers
+        and regex operands, of which at least one needs to match for the condition to be able to match.
+        Returns None if the condition can't be split.
+        """
+        if type(condition) is regex:
+            return set(), [condition]
+
+        if type(condition) is not or_:
+            return None
+
+        triggers, operands = set(), []
+        for op in condition._flat_operands():
+            if type(op) is regex:
+                operands.append(op)
+            elif (op_triggers := op._triggers()) is not None:
+                triggers.update(op_triggers)
+            else:
+                return None
+
+        return triggers, operands
+
+    def _find_routed(self, message: discord.Message) -> Set[int]:
+        "Returns indexes of responders that can apply to the ``message`` based on where it was sent."
+        channel = message.channel
+        routes = self._routes
+        if isinstance(channel, discord.DMChannel):
+            return set(routes.get(ROUTE_DM, ()))
+
+        if isinstance(channel, discord.TextChannel):
+            return routes.get(ROUTE_ANY_GUILD, set()) | routes.get(channel.guild.id, set())
+
+        return set()
+
+    def _find_candidates(self, input: MatchInput, routed: Optional[Set[int]] = None) -> List[ResponderBase]:
+        """
+        Returns responders (in the order they were added) whose condition can possibly match the ``input``.
+        If ``routed`` is given, only responders with indexes in it are returned.
+        """
+        found = set(self._unindexed)
+        index = self._words
+        if index:
+            for word in input.words_lower:
+                if (indexes := index.get(word)) is not None:
+                    found.update(indexes)
+
+        index = self._words_case
+        if index:
+            for word in input.words:
+                if (indexes := index.get(word)) is not None:
+                    found.update(indexes)
+
+        # The merged patterns of a group rule out all of its responders at once, which is the usual case
+        for merged, operands, indexes in self._regexes:
+            if routed is not None and routed.isdisjoint(indexes):
+                continue
+
+            if any(matcher(input) for matcher in merged):
+                found.update(i for matcher, i in operands if i not in found and matcher(input))
+
+        if routed is not None:
+            found &= routed
+
+        responders = self._responders
+        return [responders[i] for i in sorted(found)]
+
+    async def handle_message(self, message: discord.Message):
+        "Processes a message by all responders that match it."
+        routed = self._find_routed(message)
+        if not routed:  # Skip everything, including the content processing
+            return
+
+        # Checks shared by responders of the same type (permissions, ...) are done once
+        responders = self._responders
+        checked: Dict[type, bool] = {}
+        for i in list(routed):
+            type_ = type(responders[i])
+            if (result := checked.get(type_)) is None:
+                checked[type_] = result = type_._check_message(message, self.client)
+
+            if not result:
+                routed.discard(i)
+
+        if not routed:
+            return
+
+        input = MatchInput(message.clean_content)
+        for responder in self._find_candidates(input, routed):
+            if responder.condition.compile().match(input) and responder._check_constraints(message):
+                self._enqueue(responder, message)
+
+    def _enqueue(self, responder: ResponderBase, message: discord.Message):
+        "Queues the response, unless it is a duplicate or the queue is full."
+        key = (responder, message.author.id, message.channel.id)
+        if key in self._pending or key in self._cooldowns:
+            return
+
+        try:
+            self._queue.put_nowait((key, message))
+        except asyncio.QueueFull:
+            trace(f"Response queue is full, dropping response to message {message.id}", TraceLEVELS.WARNING)
+            return
+
+        self._pending.add(key)
+
+    async def _worker(self):
+        "Performs the queued responses."
+        queue = self._queue
+        while True:
+            key, message = await queue.get()
+            responder = key[0]
+            try:
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._sends_idle.wait(), RESPONSE_MAX_YIELD)
+
+                if responder.client is not None:  # Not removed in the meantime
+                    await responder.action.perform(message)
+            except Exception as exc:
+                trace(f"Could not respond to message {message.id} ({responder})", TraceLEVELS.ERROR, exc)
+            finally:
+                self._pending.discard(key)
+                if responder.cooldown is not None:
+                    self._cooldowns.set(key, responder.cooldown.total_seconds())
@@ -1,15 +1,14 @@
-from typing import List
+from typing import List, Set, Hashable, Optional
+from datetime import timedelta
 from typeguard import typechecked
 
 from .constraints import BaseGuildConstraint
 from ..misc.instance_track import track_id
 from ..misc.doc import doc_category
 from .actions import BaseResponse
-from .base import ResponderBase
+from .base import ResponderBase, ROUTE_ANY_GUILD
 from ..logic import BaseLogic
-from ..events import EventID
 
-import asyncio_event_hub as aeh
 import _discord as discord
 
 
@@ -28,18 +27,24 @@ class GuildResponder(ResponderBase):
         condition: BaseLogic,
         action: BaseResponse,
         constraints: List[BaseGuildConstraint] = [],
+        cooldown: Optional[timedelta] = None,
     ) -> None:
-        super().__init__(condition, action, constraints)
-
-    async def initialize(self, event_ctrl: aeh.EventController, client: discord.Client):
-        event_ctrl.add_listener(
-            EventID.discord_message,
-            self.handle_message,
-            lambda m:
-                isinstance(m.channel, discord.TextChannel) and
-                (member := m.guild.get_member(client.user.id)) and
-                not member.pending and
-                m.channel.permissions_for(member).send_messages
+        super().__init__(condition, action, constraints, cooldown)
+
+    @classmethod
+    def _check_message(cls, message: discord.Message, client: discord.Client) -> bool:
+        return bool(
+            isinstance(message.channel, discord.TextChannel) and
+            (member := message.guild.get_member(client.user.id)) and
+            not member.pending and
+            message.channel.permissions_for(member).send_messages
         )
-        self.event_ctrl = event_ctrl
-        self.client = client
+
+    def _get_routes(self) -> Set[Hashable]:
+        guilds = None
+        for const in self.constraints:
+            if (guild := const._get_guild()) is not None:
+                # All the constraints need to be fulfilled, only the common guild can be responded in
+                guilds = {guild} if guilds is None else guilds & {guild}
+
+        return {ROUTE_ANY_GUILD} if guilds is None else guilds
@@ -29,7 +29,7 @@ class AnalyticsTab(ttk.Notebook):
 
         self.add(
             AnalyticFrame(
-                "analytic_get_message_log",
+                "analytic_get_message_log_page",
                 "analytic_get_num_messages",
                 [
                     {"text": "Date", "stretch": True},
@@ -49,7 +49,7 @@ class AnalyticsTab(ttk.Notebook):
 
         self.add(
             AnalyticFrame(
-                "analytic_get_invite_log",
+                "analytic_get_invite_log_page",
                 "analytic_get_num_invites",
                 [
                     {"text": "Date", "stretch": True},
@@ -81,19 +81,30 @@ class AnalyticFrame(ttk.Frame):
         dpi_5 = dpi_scaled(10)
 
         self.edit_mgr = edit_mgr
+        next_cursor = None
+        cursor_params = None
 
-        async def analytics_load_history():
+        async def analytics_load_history(next_page: bool = False):
+            # Logs are loaded in pages, the next page continues at the cursor returned with the previous one.
+            # The cursor only belongs to the parameters it was returned for, changed parameters start from the top.
+            nonlocal next_cursor, cursor_params
             connection = get_connection()
             logger = await connection.get_logger()
 
             param_object = combo_history.combo.get()
             param_object_params = convert_to_objects(param_object.data)
-            items = await connection.execute_method(
+            next_page = next_page and param_object_params == cursor_params
+            cursor_params = param_object_params.copy()
+            param_object_params["cursor"] = next_cursor if next_page else None
+            items, next_cursor = await connection.execute_method(
                 it.ObjectReference.from_object(logger), getter_history, **param_object_params
             )
             items = convert_to_object_info(items)
-            tae.tk_execute(lst_history.clear)
+            if not next_page:
+                tae.tk_execute(lst_history.clear)
+
             tae.tk_execute(lst_history.insert, tk.END, *items)
+            tae.tk_execute(bnt_next_page.configure, state="normal" if next_cursor is not None else "disabled")
 
         def show_log(listbox: ListBoxScrolled):
             selection = listbox.curselection()
@@ -154,6 +165,13 @@ class AnalyticFrame(ttk.Frame):
             text="Get logs",
             command=lambda: tae.async_execute(analytics_load_history(), wait=False, pop_up=True, master=self)
         ).pack(side="left", fill=tk.X)
+        bnt_next_page = ttk.Button(
+            frame_msg_history_bnts,
+            text="Load more",
+            state="disabled",
+            command=lambda: tae.async_execute(analytics_load_history(True), wait=False, pop_up=True, master=self)
+        )
+        bnt_next_page.pack(side="left", fill=tk.X)
         ttk.Button(
             frame_msg_history_bnts,
             command=lambda: show_log(lst_history),
@@ -0,0 +1,65 @@
+"""
+Benchmarks counting messages with :py:meth:`daf.logging.sql.LoggerSQL.analytic_get_num_messages` (SQLite)
+over a year of logs: by grouping the MessageLOG table (old) and from the MessageCOUNT rollup table.
+
+Run from the ``src/`` directory: ``PYTHONPATH=. python ../testing/benchmarks/bench_analytics_sql.py``.
+"""
+from datetime import datetime, timedelta
+
+import asyncio
+import tempfile
+import time
+import os
+
+from daf.logging.sql import LoggerSQL
+from daf.logging.sql.tables import MessageCOUNT
+
+import daf.logging.sql.mgr as mgr
+
+from common import contexts
+
+
+LOGS = 30_000
+DAYS = 365
+GUILDS = 20
+QUERIES = 5
+
+
+async def measure(query) -> float:
+    "Returns the average time of the ``query`` in ms."
+    start = time.perf_counter()
+    for _ in range(QUERIES):
+        await query()
+
+    return (time.perf_counter() - start) / QUERIES * 1000
+
+
+async def main():
+    mgr.SQL_FLUSH_SIZE = LOGS + 1  # Timestamps are changed before saving
+    with tempfile.TemporaryDirectory() as path:
+        logger = LoggerSQL(database=os.path.join(path, "bench"), fallback=None)
+        await logger.initialize()
+        start = datetime.now() - timedelta(days=DAYS)
+        for i in range(LOGS):
+            await logger._save_log(*contexts(i % GUILDS, i, 1 if i % 10 else 0, 1, text="Advertisement", mode="send"))
+            logger._buffer[-1] = (start + timedelta(days=DAYS) * i / LOGS, *logger._buffer[-1][1:])
+
+        await logger.flush()
+
+        async def count_logs():
+            async with logger.session_maker() as session:
+                await session.run_sync(logger._count_logs, MessageCOUNT)
+
+        raw = await measure(count_logs)
+        rollup = await measure(logger.analytic_get_num_messages)
+        partial = await measure(
+            lambda: logger.analytic_get_num_messages(after=start + timedelta(hours=12), before=datetime.now())
+        )
+        await logger._stop_engine()
+
+    print(f"Counting {LOGS} logs over {DAYS} days, grouped by day, guild and author:")
+    print(f"  MessageLOG: {raw:.1f} ms, MessageCOUNT: {rollup:.1f} ms, MessageCOUNT + partial days: {partial:.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
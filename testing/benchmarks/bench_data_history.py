@@ -0,0 +1,71 @@
+"""
+Benchmarks finding sent data inside the DataHISTORY table of :class:`daf.logging.sql.LoggerSQL` (SQLite),
+filled with a million rows: by comparing the JSON text (old) and by the content hash.
+Also measures the migration of the table to content hashes.
+
+Run from the ``src/`` directory: ``PYTHONPATH=. python ../testing/benchmarks/bench_data_history.py``.
+"""
+import asyncio
+import json
+import sqlite3
+import tempfile
+import time
+import os
+
+from sqlalchemy import select, String
+
+from daf.logging.sql import LoggerSQL
+from daf.logging.sql.tables import DataHISTORY
+
+
+ROWS = 1_000_000
+LOOKUPS = 20
+
+
+def create_legacy_database(path: str):
+    "Creates the DataHISTORY table, as created by older versions (without content hash)."
+    connection = sqlite3.connect(path)
+    connection.execute('CREATE TABLE "DataHISTORY" (id INTEGER NOT NULL, content JSON, PRIMARY KEY (id))')
+    connection.executemany(
+        'INSERT INTO "DataHISTORY" (content) VALUES (?)',
+        (
+            (json.dumps(json.dumps({"text": f"Advertisement number {i}", "embed": None, "files": []})),)
+            for i in range(ROWS)
+        )
+    )
+    connection.commit()
+    connection.close()
+
+
+async def measure_lookups(logger: LoggerSQL, condition) -> float:
+    "Returns the average time in ms of finding not existing data."
+    async with logger.session_maker() as session:
+        start = time.perf_counter()
+        for i in range(LOOKUPS):
+            data = {"text": f"Not sent {i}", "embed": None, "files": []}
+            result = await session.execute(select(DataHISTORY.id).where(condition(data)))
+            assert result.first() is None
+
+        return (time.perf_counter() - start) / LOOKUPS * 1000
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as path:
+        database = os.path.join(path, "bench")
+        start = time.perf_counter()
+        create_legacy_database(database + ".db")
+        print(f"Created {ROWS} rows in {time.perf_counter() - start:.1f} s")
+
+        logger = LoggerSQL(database=database, fallback=None)
+        start = time.perf_counter()
+        await logger.initialize()  # Migrates
+        print(f"Initialization with migration: {time.perf_counter() - start:.1f} s")
+
+        text = await measure_lookups(logger, lambda data: DataHISTORY.content.cast(String) == json.dumps(data))
+        hashed = await measure_lookups(logger, lambda data: DataHISTORY.content_hash == logger._get_data_key(data))
+        print(f"Lookup by JSON text: {text:.2f} ms, by content hash: {hashed:.3f} ms")
+        await logger._stop_engine()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
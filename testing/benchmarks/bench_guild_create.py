@@ -0,0 +1,91 @@
+"""
+Benchmarks processing of GUILD_CREATE payloads with and without lazy guilds.
+
+Run from the ``src/`` directory: ``PYTHONPATH=. python ../testing/benchmarks/bench_guild_create.py``.
+"""
+import asyncio
+import gc
+import time
+import tracemalloc
+
+import _discord as discord
+from _discord.state import ConnectionState
+
+
+GUILDS = 100
+CHANNELS = 200
+THREADS = 50
+MEMBERS = 1000
+ROLES = 50
+SELF_ID = 1
+
+
+def user(id_: int) -> dict:
+    return {"id": str(id_), "username": f"user{id_}", "discriminator": "0", "avatar": None}
+
+
+def guild_payload(g: int) -> dict:
+    base = 10_000_000 * (g + 1)
+    roles = [{"id": str(base), "name": "@everyone", "permissions": "3072", "position": 0}]
+    roles += [{"id": str(base + 1 + r), "name": f"r{r}", "permissions": "0", "position": r + 1} for r in range(ROLES)]
+    overwrites = [{"id": str(base + 1), "type": 0, "allow": "0", "deny": "2048"}]
+    channels = [
+        {"id": str(base + 1000 + c), "type": 0, "name": f"c{c}", "position": c, "permission_overwrites": overwrites}
+        for c in range(CHANNELS)
+    ]
+    threads = [
+        {
+            "id": str(base + 5000 + t), "parent_id": str(base + 1000), "type": 11, "name": f"t{t}", "owner_id": "2",
+            "thread_metadata": {
+                "archived": False, "auto_archive_duration": 60, "locked": False,
+                "archive_timestamp": "2020-01-01T00:00:00+00:00",
+            },
+        }
+        for t in range(THREADS)
+    ]
+    members = [
+        {"user": user(SELF_ID if m == 0 else base + 10_000 + m), "roles": [str(base + 1)], "joined_at": None}
+        for m in range(MEMBERS)
+    ]
+    return {
+        "id": str(base), "name": f"g{g}", "owner_id": "2", "roles": roles, "channels": channels, "threads": threads,
+        "members": members, "emojis": [], "stickers": [],
+    }
+
+
+def run(lazy: bool, payloads: list):
+    gc.collect()
+    tracemalloc.start()
+    state = ConnectionState(
+        dispatch=lambda *args: None, handlers={}, hooks={}, http=None, loop=asyncio.new_event_loop(),
+        intents=discord.Intents.all(), lazy_guilds=lazy
+    )
+    state.user = discord.ClientUser(state=state, data=user(SELF_ID))
+    start = time.perf_counter()
+    for payload in payloads:
+        state._add_guild_from_data(payload)
+    startup = time.perf_counter() - start
+
+    # What the framework needs: its own member, a few channels and their permissions
+    start = time.perf_counter()
+    for guild in state.guilds:
+        member = guild.get_member(SELF_ID)
+        for channel_id in range(guild.id + 1000, guild.id + 1005):
+            channel = state.get_channel(channel_id)
+            assert channel.permissions_for(member).read_messages
+
+    access = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"lazy={lazy!s:<6} startup {startup:>7.3f} s   first access {access:>7.3f} s   peak {peak / 1e6:>8.1f} MB")
+
+
+def main():
+    payloads = [guild_payload(g) for g in range(GUILDS)]
+    print(f"{GUILDS} guilds: {CHANNELS} channels, {THREADS} threads, {MEMBERS} members, {ROLES} roles each")
+    run(False, payloads)
+    run(True, payloads)
+
+
+if __name__ == "__main__":
+    main()
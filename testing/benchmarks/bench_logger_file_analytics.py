@@ -0,0 +1,57 @@
+"""
+Benchmarks analytics of :class:`daf.logging.LoggerJSON` (JSON Lines format) over a year of logs.
+The first query reads every file (like every query did before the summary index) and makes the summaries,
+following queries skip files by the summaries and count logs from them.
+
+Run from the ``src/`` directory: ``PYTHONPATH=. python ../testing/benchmarks/bench_logger_file_analytics.py``.
+"""
+from datetime import datetime, timedelta
+
+import asyncio
+import tempfile
+import time
+
+from daf.logging import LoggerJSON
+
+from common import write_days
+
+
+DAYS = 365
+GUILDS = 10
+LOGS = 20  # Per guild, per day
+
+
+async def measure(name: str, query):
+    start = time.perf_counter()
+    result = await query()
+    print(f"{name}: {(time.perf_counter() - start) * 1000:.1f} ms ({len(result)} results)")
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as path:
+        logger = LoggerJSON(path, json_lines=True)
+        await logger.initialize()
+        write_days(logger, datetime(2023, 1, 1, 8), DAYS, GUILDS, LOGS)
+        print(f"{DAYS * GUILDS} files, {DAYS * GUILDS * LOGS} logs")
+        week_after = datetime(2023, 6, 1, 12)
+        week_before = week_after + timedelta(days=7)
+        await measure("First query (making summaries)", logger.analytic_get_num_messages)
+        await measure("Message counts, whole year", logger.analytic_get_num_messages)
+        await measure("Message counts, month groups", lambda: logger.analytic_get_num_messages(group_by="month"))
+        await measure(
+            "Message counts, one week",
+            lambda: logger.analytic_get_num_messages(after=week_after, before=week_before)
+        )
+        await measure(
+            "Message logs, one guild, one week",
+            lambda: logger.analytic_get_message_log(guild=1001, after=week_after, before=week_before)
+        )
+        await measure(
+            "Message logs, one guild, whole year",
+            lambda: logger.analytic_get_message_log(guild=1001, limit=None)
+        )
+        await logger._close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
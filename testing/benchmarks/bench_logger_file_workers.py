@@ -0,0 +1,71 @@
+"""
+Benchmarks analytics of :class:`daf.logging.LoggerJSON` (nested JSON format) over a year of logs,
+with files read in the writer thread (old) and by worker processes.
+Summaries are removed before each run, so the first query makes them by reading all the files.
+
+Run from the ``src/`` directory: ``PYTHONPATH=. python ../testing/benchmarks/bench_logger_file_workers.py``.
+"""
+from datetime import datetime, timedelta
+
+import asyncio
+import tempfile
+import time
+import os
+
+from daf.logging import LoggerJSON
+
+import daf.logging.logger_file as logger_file
+
+from common import write_days
+
+
+DAYS = 365
+GUILDS = 10
+LOGS = 20  # Per guild, per day
+
+
+async def measure(name: str, query) -> float:
+    start = time.perf_counter()
+    await query()
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"  {name}: {elapsed:.1f} ms")
+
+
+async def run(path: str, workers: int):
+    for directory, _, files in os.walk(path):
+        if logger_file.INDEX_FILENAME in files:
+            os.remove(os.path.join(directory, logger_file.INDEX_FILENAME))
+
+    logger = LoggerJSON(path, analytic_workers=workers)
+    await logger.initialize()
+    print(f"Workers: {workers}")
+    week_after = datetime(2023, 6, 1, 12)
+    week_before = week_after + timedelta(days=7)
+    await measure("First query (making summaries)", logger.analytic_get_num_messages)
+    await measure(
+        "Message counts, whole year, 12 hour offset",
+        lambda: logger.analytic_get_num_messages(after=datetime(2023, 1, 1, 12))
+    )
+    await measure(
+        "Message logs, one week",
+        lambda: logger.analytic_get_message_log(after=week_after, before=week_before, limit=None)
+    )
+    await measure("Message logs, whole year, newest 500", logger.analytic_get_message_log)
+    await logger._close()
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as path:
+        logger = LoggerJSON(path)
+        await logger.initialize()
+        write_days(logger, datetime(2023, 1, 1, 8), DAYS, GUILDS, LOGS)
+        await logger._close()
+        print(f"{DAYS * GUILDS} files, {DAYS * GUILDS * LOGS} logs")
+        workers = min(os.cpu_count() or 1, 8)
+        await run(path, 1)
+        if workers > 1:
+            await run(path, workers)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
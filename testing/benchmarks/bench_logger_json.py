@@ -0,0 +1,70 @@
+"""
+Benchmarks the cost of saving a message log with :class:`daf.logging.LoggerJSON`,
+in the nested JSON format and in the JSON Lines format, as the day's log file grows.
+Writing is measured separately from saving, which only queues the log on the event loop.
+
+Run from the ``src/`` directory: ``PYTHONPATH=. python ../testing/benchmarks/bench_logger_json.py``.
+"""
+from datetime import datetime
+
+import asyncio
+import tempfile
+import time
+import os
+
+from daf.logging import LoggerJSON
+
+from common import contexts
+
+
+LOGS = 2000
+STEP = 250  # Number of logs measured together
+
+
+async def measure(json_lines: bool):
+    with tempfile.TemporaryDirectory() as path:
+        logger = LoggerJSON(path, json_lines=json_lines)
+        await logger.initialize()
+        writer = logger._get_writer()
+        filename = os.path.join(path, f"Benchmark guild{logger._get_write_extension()}")
+        timings = []
+        for start in range(0, LOGS, STEP):
+            logs = [(datetime.now(), *contexts(0, i), None) for i in range(start, start + STEP)]
+            begin = time.perf_counter()
+            for log in logs:  # Write one by one, as if each log was in its own batch
+                logger._write_logs(filename, [log], writer)
+
+            timings.append((time.perf_counter() - begin) / STEP * 1e6)
+
+        writer._close_handles()
+        begin = time.perf_counter()
+        for i in range(LOGS):
+            await logger._save_log(*contexts(0, i))
+
+        queued = (time.perf_counter() - begin) / LOGS * 1e6
+        await logger._close()
+        written = (time.perf_counter() - begin) * 1000
+        logger = LoggerJSON(path, json_lines=json_lines)
+        begin = time.perf_counter()
+        logs = await logger.analytic_get_message_log(limit=None)
+        read = (time.perf_counter() - begin) * 1000
+        assert len(logs) == LOGS * 2
+        await logger._close()
+
+    return timings, queued, written, read
+
+
+async def main():
+    print(f"{'logs saved':>10} {'nested [us/log]':>16} {'lines [us/log]':>15}")
+    nested, nested_queued, nested_written, nested_read = await measure(False)
+    lines, lines_queued, lines_written, lines_read = await measure(True)
+    for i, (n, l) in enumerate(zip(nested, lines)):
+        print(f"{(i + 1) * STEP:>10} {n:>16.1f} {l:>15.1f}")
+
+    print(f"Saving (event loop) [us/log]: nested {nested_queued:.1f}, lines {lines_queued:.1f}")
+    print(f"Saving {LOGS} logs in batches until written: nested {nested_written:.1f} ms, lines {lines_written:.1f} ms")
+    print(f"Reading {LOGS * 2} logs: nested {nested_read:.1f} ms, lines {lines_read:.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
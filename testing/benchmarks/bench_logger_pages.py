@@ -0,0 +1,69 @@
+"""
+Benchmarks reading message logs of :class:`daf.logging.LoggerJSON` (JSON Lines format) over a year of logs:
+the newest logs and all the logs at once (old), in a page and with the asynchronous generator,
+reporting the time and the peak memory use.
+
+Run from the ``src/`` directory: ``PYTHONPATH=. python ../testing/benchmarks/bench_logger_pages.py``.
+"""
+from datetime import datetime
+
+import tracemalloc
+import asyncio
+import tempfile
+import time
+
+from daf.logging import LoggerJSON
+
+from common import write_days
+
+
+DAYS = 365
+GUILDS = 10
+LOGS = 20  # Per guild, per day
+PAGE_SIZE = 500
+
+
+async def measure(name: str, query):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = await query()
+    elapsed = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name}: {elapsed:.1f} ms, peak memory {peak / 2**20:.1f} MiB ({result} logs)")
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as path:
+        logger = LoggerJSON(path, json_lines=True)
+        await logger.initialize()
+        write_days(logger, datetime(2023, 1, 1, 8), DAYS, GUILDS, LOGS)
+        await logger.analytic_get_num_messages()  # Makes the summaries
+        print(f"{DAYS * GUILDS} files, {DAYS * GUILDS * LOGS} logs")
+
+        async def newest():
+            return len(await logger.analytic_get_message_log(limit=PAGE_SIZE))
+
+        async def newest_page():
+            logs, _ = await logger.analytic_get_message_log_page(limit=PAGE_SIZE)
+            return len(logs)
+
+        async def all_logs():
+            return len(await logger.analytic_get_message_log(limit=None))
+
+        async def all_iter():
+            count = 0
+            async for _ in logger.analytic_iter_message_log():
+                count += 1
+
+            return count
+
+        await measure(f"Newest {PAGE_SIZE} logs", newest)
+        await measure(f"Newest {PAGE_SIZE} logs, page", newest_page)
+        await measure("All logs", all_logs)
+        await measure("All logs, iterator", all_iter)
+        await logger._close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,70 @@
+"""
+Benchmarks compressing a year of :class:`daf.logging.LoggerJSON` logs (JSON Lines format) into
+archives of days (``compress_after_days``): the disk usage, number of files and directories,
+the time of compressing and analytics over the plain and the compressed logs.
+
+Run from the ``src/`` directory: ``PYTHONPATH=. python ../testing/benchmarks/bench_logger_retention.py``.
+"""
+from datetime import datetime, timedelta
+
+import asyncio
+import tempfile
+import time
+import os
+
+from daf.logging import LoggerJSON
+
+from common import write_days
+
+
+DAYS = 365
+GUILDS = 10
+LOGS = 20  # Per guild, per day
+
+
+def disk_usage(path: str):
+    "Returns the size in MiB, the number of files and the number of directories."
+    size = files = directories = 0
+    for directory, dirs, names in os.walk(path):
+        directories += len(dirs)
+        files += len(names)
+        size += sum(os.path.getsize(os.path.join(directory, name)) for name in names)
+
+    return size / 2 ** 20, files, directories
+
+
+async def measure(logger: LoggerJSON, path: str):
+    size, files, directories = disk_usage(path)
+    print(f"  Disk: {size:.1f} MiB, {files} files, {directories} directories")
+    for name, query in (
+        ("Message counts, whole year", logger.analytic_get_num_messages),
+        ("Newest 500 message logs", logger.analytic_get_message_log),
+        ("Message logs, one guild, whole year", lambda: logger.analytic_get_message_log(guild=1001, limit=None)),
+    ):
+        await query()  # Makes the summaries
+        start = time.perf_counter()
+        result = await query()
+        print(f"  {name}: {(time.perf_counter() - start) * 1000:.1f} ms ({len(result)} results)")
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as path:
+        logger = LoggerJSON(path, json_lines=True)
+        await logger.initialize()
+        write_days(logger, datetime.now().replace(hour=8) - timedelta(days=DAYS), DAYS, GUILDS, LOGS)
+        print(f"{DAYS * GUILDS} files, {DAYS * GUILDS * LOGS} logs")
+        print("Plain:")
+        await measure(logger, path)
+        await logger._close()
+
+        logger = LoggerJSON(path, json_lines=True, compress_after_days=1)
+        begin = time.perf_counter()
+        await logger.apply_retention()
+        print(f"Compressing: {time.perf_counter() - begin:.1f} s")
+        print("Compressed:")
+        await measure(logger, path)
+        await logger._close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,54 @@
+"""
+Benchmarks saving message logs with :class:`daf.logging.sql.LoggerSQL` (SQLite),
+reporting the time until all the logs are in the database and the SQL statements executed per log.
+
+Run from the ``src/`` directory: ``PYTHONPATH=. python ../testing/benchmarks/bench_logger_sql.py``.
+"""
+from collections import Counter
+
+import asyncio
+import tempfile
+import time
+import os
+
+from sqlalchemy import event
+
+from daf.logging.sql import LoggerSQL
+
+from common import contexts
+
+
+LOGS = 2000
+GUILDS = 20
+CHANNELS = 5  # Per guild
+DATA = 10  # Different sent data
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as path:
+        logger = LoggerSQL(database=os.path.join(path, "bench"), fallback=None)
+        await logger.initialize()
+        statements = Counter()
+
+        def count(conn, cursor, statement: str, parameters, context, executemany):
+            statements[statement.split(" ", 1)[0]] += 1
+
+        event.listen(logger.engine.sync_engine, "before_cursor_execute", count)
+        start = time.perf_counter()
+        for i in range(LOGS):
+            await logger._save_log(
+                *contexts(i % GUILDS, i, CHANNELS - 1, 1, text=f"Advertisement {i % DATA}", mode="send")
+            )
+
+        await logger.flush()
+        elapsed = time.perf_counter() - start
+        logs = await logger.analytic_get_message_log(limit=None)
+        assert len(logs) == LOGS
+        await logger._stop_engine()
+
+    print(f"{LOGS} logs: {elapsed:.2f} s ({elapsed / LOGS * 1e6:.0f} us/log)")
+    print("Statements per log: " + ", ".join(f"{name} {count / LOGS:.2f}" for name, count in statements.items()))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
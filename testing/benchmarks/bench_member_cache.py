@@ -0,0 +1,64 @@
+"""
+Benchmarks the memory used by the member cache of each :class:`daf.client.MemberCachePolicy`.
+
+Run from the ``src/`` directory: ``PYTHONPATH=. python ../testing/benchmarks/bench_member_cache.py``.
+"""
+import asyncio
+import gc
+import tracemalloc
+
+import _discord as discord
+from _discord.state import ConnectionState
+from daf.client import ACCOUNT, MemberCachePolicy
+
+
+GUILDS = 100
+MEMBERS = 1000
+JOINS = 1000
+SELF_ID = 1
+
+
+def user(id_: int) -> dict:
+    return {"id": str(id_), "username": f"user{id_}", "discriminator": "0", "avatar": None, "global_name": None}
+
+
+def member(id_: int) -> dict:
+    return {"user": user(id_), "roles": [], "joined_at": "2020-01-01T00:00:00+00:00", "nick": None}
+
+
+def run(policy: MemberCachePolicy):
+    options = ACCOUNT("x", member_cache=policy, intents=discord.Intents.all())._get_cache_options()
+    gc.collect()
+    tracemalloc.start()
+    state = ConnectionState(
+        dispatch=lambda *args: None, handlers={}, hooks={}, http=None, loop=asyncio.new_event_loop(),
+        intents=discord.Intents.all(), **options
+    )
+    state.user = discord.ClientUser(state=state, data=user(SELF_ID))
+    for g in range(GUILDS):
+        members = [member(SELF_ID)] + [member(100 + g * MEMBERS + m) for m in range(MEMBERS)]
+        state._add_guild_from_data(
+            {
+                "id": str(10_000_000 + g), "name": "g", "roles": [], "channels": [], "members": members,
+                "emojis": [], "stickers": []
+            }
+        )
+
+    for j in range(JOINS):
+        state.parse_guild_member_add({"guild_id": str(10_000_000 + j % GUILDS), **member(1_000_000 + j)})
+
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    cached = sum(len(guild._members) for guild in state.guilds)
+    print(f"{policy.name:<16} {cached:>8} members cached {current / 1e6:>10.2f} MB")
+    assert all(guild.get_member(SELF_ID) is not None for guild in state.guilds)
+
+
+def main():
+    print(f"{GUILDS} guilds, {MEMBERS} members each, {JOINS} joins")
+    for policy in MemberCachePolicy:
+        run(policy)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmarks the (channel, member) permission cache of guilds with many roles and overwrites.
+
+Run from the ``src/`` directory: ``PYTHONPATH=. python ../testing/benchmarks/bench_permissions.py``.
+"""
+from timeit import timeit
+
+import asyncio
+import random
+
+import _discord as discord
+from _discord.state import ConnectionState
+
+
+ROLES = 500
+OVERWRITES = 300
+MEMBER_ROLES = 50
+CHANNELS = 50
+ITERATIONS = 20
+
+
+def make_guild(state: ConnectionState) -> discord.Guild:
+    rnd = random.Random(0)
+    roles = [{"id": "1", "name": "@everyone", "permissions": str(0x400 | 0x800), "position": 0}]
+    roles += [
+        {"id": str(100 + i), "name": f"r{i}", "permissions": str(rnd.getrandbits(40) & ~0x8), "position": i + 1}
+        for i in range(ROLES)
+    ]
+    channels = []
+    for c in range(CHANNELS):
+        overwrites = [{"id": "1", "type": 0, "allow": "0", "deny": "0"}]
+        overwrites += [
+            {
+                "id": str(100 + rnd.randrange(ROLES)), "type": 0,
+                "allow": str(rnd.getrandbits(40)), "deny": str(rnd.getrandbits(40))
+            }
+            for _ in range(OVERWRITES)
+        ]
+        channels.append(
+            {"id": str(10_000 + c), "type": 0, "name": f"c{c}", "position": c, "permission_overwrites": overwrites}
+        )
+
+    member = {
+        "user": {"id": "5", "username": "me", "discriminator": "0", "avatar": None},
+        "roles": [str(100 + i) for i in rnd.sample(range(ROLES), MEMBER_ROLES)],
+        "joined_at": "2020-01-01T00:00:00+00:00",
+    }
+    return state._add_guild_from_data(
+        {
+            "id": "1", "name": "guild", "owner_id": "2", "roles": roles, "channels": channels,
+            "members": [member], "emojis": [], "stickers": [],
+        }
+    )
+
+
+def main():
+    loop = asyncio.new_event_loop()
+    state = ConnectionState(
+        dispatch=lambda *args: None, handlers={}, hooks={}, http=None, loop=loop, intents=discord.Intents.all()
+    )
+    guild = make_guild(state)
+    member = guild.get_member(5)
+    channels = guild.text_channels
+    for channel in channels:
+        uncached_perms = channel.permissions_for(member)
+        assert channel.permissions_for(member) == uncached_perms
+
+    def resolve():
+        for channel in channels:
+            guild._invalidate_permissions()
+            channel.permissions_for(member)
+
+    def cached():
+        for channel in channels:
+            channel.permissions_for(member)
+
+    uncached_t = timeit(resolve, number=ITERATIONS) / ITERATIONS / CHANNELS
+    cached()  # Fill the cache
+    cached_t = timeit(cached, number=ITERATIONS) / ITERATIONS / CHANNELS
+    print(f"{ROLES} roles, {OVERWRITES} overwrites per channel, {MEMBER_ROLES} member roles")
+    print(f"Uncached: {uncached_t * 1e6:.2f} us / call")
+    print(f"Cached:   {cached_t * 1e6:.2f} us / call ({uncached_t / cached_t:.1f}x)")
+
+    # Invalidation
+    everyone = {"id": "1", "name": "@everyone", "position": 0}
+    state.parse_guild_role_update({"guild_id": "1", "role": {**everyone, "permissions": "8"}})
+    assert channels[0].permissions_for(member).manage_guild, "Role update was not applied"
+    state.parse_guild_role_update({"guild_id": "1", "role": {**everyone, "permissions": "3072"}})
+    state.parse_guild_member_update(
+        {"guild_id": "1", "user": {"id": "5", "username": "me", "discriminator": "0", "avatar": None}, "roles": []}
+    )
+    state.parse_channel_update(
+        {
+            "id": str(channels[0].id), "guild_id": "1", "type": 0, "name": "c0", "position": 0,
+            "permission_overwrites": [{"id": "1", "type": 0, "allow": "0", "deny": str(0x800)}]
+        }
+    )
+    perms = channels[0].permissions_for(member)
+    assert perms.read_messages and not perms.send_messages, "Member or overwrite update was not applied"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmarks the REST rate limiter against a simulated Discord bucket,
+shared by two routes (same bucket hash).
+
+Run from the ``src/`` directory: ``PYTHONPATH=. python ../testing/benchmarks/bench_ratelimit.py``.
+"""
+import asyncio
+import json
+import time
+
+from _discord.http import HTTPClient, Route
+
+
+REQUESTS = 50
+LIMIT = 5  # Uses of the bucket per window
+WINDOW = 0.5  # Seconds
+LATENCY = 0.05  # Seconds per request
+
+
+class Bucket:
+    "Discord's side of a rate limit bucket."
+    def __init__(self):
+        self.reset_at = 0
+        self.used = 0
+        self.rate_limited = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def use(self) -> int:
+        now = time.monotonic()
+        if now >= self.reset_at:
+            self.reset_at = now + WINDOW
+            self.used = 0
+
+        self.used += 1
+        if self.used > LIMIT:
+            self.rate_limited += 1
+            return 429
+
+        return 200
+
+
+class Response:
+    def __init__(self, bucket: Bucket, status: int):
+        self.status = status
+        reset_after = bucket.reset_at - time.monotonic()
+        self.data = {"retry_after": reset_after, "global": False} if status == 429 else {}
+        self.headers = {
+            "content-type": "application/json",
+            "Via": "1.1 google",
+            "X-Ratelimit-Bucket": "hash",
+            "X-Ratelimit-Limit": str(LIMIT),
+            "X-Ratelimit-Remaining": str(max(LIMIT - bucket.used, 0)),
+            "X-Ratelimit-Reset-After": f"{reset_after:.3f}",
+        }
+
+    async def text(self, encoding=None):
+        return json.dumps(self.data)
+
+
+class Session:
+    def __init__(self, bucket: Bucket):
+        self.bucket = bucket
+
+    def request(self, method, url, **kwargs):
+        return self
+
+    async def __aenter__(self):
+        bucket = self.bucket
+        bucket.in_flight += 1
+        bucket.max_in_flight = max(bucket.max_in_flight, bucket.in_flight)
+        await asyncio.sleep(LATENCY)
+        bucket.in_flight -= 1
+        return Response(bucket, bucket.use())
+
+    async def __aexit__(self, *args):
+        pass
+
+
+async def main():
+    bucket = Bucket()
+    http = HTTPClient(loop=asyncio.get_running_loop())
+    http._HTTPClient__session = Session(bucket)
+    routes = [
+        Route("POST", "/channels/{channel_id}/messages", channel_id=1),
+        Route("PATCH", "/channels/{channel_id}/messages/{message_id}", channel_id=1, message_id=2),
+    ]
+    start = time.perf_counter()
+    await asyncio.gather(*(http.request(routes[i % len(routes)]) for i in range(REQUESTS)))
+    elapsed = time.perf_counter() - start
+    ideal = (REQUESTS - 1) // LIMIT * WINDOW + LATENCY
+    print(f"{REQUESTS} requests, {LIMIT} per {WINDOW} s: {elapsed:.2f} s (ideal {ideal:.2f} s)")
+    print(f"429 responses: {bucket.rate_limited}   max parallel requests: {bucket.max_in_flight}")
+    for key, stats in http.ratelimit_stats.items():
+        print(f"  {key}: {stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
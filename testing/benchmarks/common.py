@@ -0,0 +1,54 @@
+"""
+Log contexts and log files shared by the logging benchmarks.
+"""
+from datetime import datetime, timedelta
+
+import os
+
+from daf.logging import LoggerJSON
+
+
+def contexts(guild_id: int, i: int, successful: int = 1, failed: int = 0, text: str = None, mode: str = None):
+    """
+    Returns the guild, message and author contexts of the ``i``-th message log of guild ``guild_id``,
+    as passed to the loggers' ``_save_log``.
+    The message is sent to ``successful`` channels of the guild and fails to send into ``failed`` channels.
+    """
+    guild = {"name": f"Guild {guild_id}", "id": 1000 + guild_id, "type": "GUILD"}
+    channels = [
+        {"name": f"channel {c}", "id": 100_000 + guild_id * 100 + c} for c in range(successful + failed)
+    ]
+    message = {
+        "type": "TextMESSAGE",
+        "sent_data": {"text": f"Advertisement number {i}" if text is None else text},
+        "channels": {
+            "successful": channels[:successful],
+            "failed": [{**channel, "reason": "Forbidden"} for channel in channels[successful:]],
+        },
+    }
+    if mode is not None:
+        message["mode"] = mode
+
+    author = {"name": "Account", "id": 3}
+    return guild, message, author
+
+
+def write_days(logger: LoggerJSON, start: datetime, days: int, guilds: int, logs: int):
+    """
+    Writes ``logs`` message logs of each of the ``guilds`` guilds for ``days`` days from ``start``,
+    directly into the logger's ``Year/Month/Day`` folders, one file per guild and day, a minute apart.
+    """
+    writer = logger._get_writer()
+    extension = logger._get_write_extension()
+    for day in range(days):
+        timestruct = start + timedelta(days=day)
+        directory = os.path.join(logger.path, *timestruct.strftime("%Y-%m-%d").split("-"))
+        for guild_id in range(guilds):
+            filename = os.path.join(directory, f"Guild {guild_id}{extension}")
+            logger._write_logs(
+                filename,
+                [(timestruct + timedelta(minutes=i), *contexts(guild_id, i), None) for i in range(logs)],
+                writer
+            )
+
+    writer._close_handles()
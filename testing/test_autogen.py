@@ -5,6 +5,7 @@ works as expected.
 """
 from datetime import timedelta
 from typing import List
+from types import SimpleNamespace
 
 from daf.events import *
 
@@ -35,6 +36,87 @@ async def test_autoguild(guilds, accounts: List[daf.ACCOUNT]):
     await account.remove_server(auto_guild)
 
 
+async def test_autochannel_cache():
+    """
+    Tests if AutoCHANNEL caches found channels and searches for them again after changes to the guild.
+    """
+    member = SimpleNamespace(id=1)
+    guild = SimpleNamespace(id=10, get_member=lambda id_: member)
+    other_guild = SimpleNamespace(id=11, get_member=lambda id_: member)
+    state = SimpleNamespace(user=member)
+    can_send = {}  # Channel ID -> permission to send messages
+
+    def make_channel(id_: int, name: str, guild_=guild):
+        can_send[id_] = True
+        return SimpleNamespace(
+            id=id_, name=name, guild=guild_, _state=state,
+            permissions_for=lambda member_: SimpleNamespace(
+                send_messages=can_send[id_], connect=False, stream=False, speak=False
+            )
+        )
+
+    guild_channels = [make_channel(1, "testpy-1"), make_channel(2, "testpy-2"), make_channel(3, "other")]
+    event_ctrl = daf.EventController()
+    event_ctrl.start()
+    auto_channel = daf.message.AutoCHANNEL(daf.regex("testpy-[0-9]"))
+    parent = SimpleNamespace(parent=SimpleNamespace(snowflake=guild.id))
+    await auto_channel.initialize(parent, lambda: guild_channels, event_ctrl)
+
+    def found() -> List[int]:
+        return [channel.id for channel in auto_channel]
+
+    async def emit(event: EventID, *args):
+        await event_ctrl.emit(event, *args)
+
+    try:
+        assert found() == [1, 2]
+        assert found() == [1, 2]
+        assert (auto_channel.cache_hits, auto_channel.cache_misses) == (1, 1)
+
+        # Events of other guilds keep the cache
+        guild_channels.append(make_channel(4, "testpy-4", other_guild))
+        await emit(EventID.discord_guild_channel_create, guild_channels[-1])
+        assert found() == [1, 2]
+        assert (auto_channel.cache_hits, auto_channel.cache_misses) == (2, 1)
+        guild_channels.pop()
+
+        guild_channels.append(make_channel(5, "testpy-5"))
+        await emit(EventID.discord_guild_channel_create, guild_channels[-1])
+        assert found() == [1, 2, 5]
+
+        guild_channels[2].name = "testpy-3"
+        await emit(EventID.discord_guild_channel_update, guild_channels[2], guild_channels[2])
+        assert found() == [1, 2, 3, 5]
+
+        deleted = guild_channels.pop(0)
+        await emit(EventID.discord_guild_channel_delete, deleted)
+        assert found() == [2, 3, 5]
+
+        can_send[2] = False
+        role = SimpleNamespace(guild=guild)
+        await emit(EventID.discord_guild_role_update, role, role)
+        assert found() == [3, 5]
+
+        can_send[2] = True
+        await emit(EventID.discord_member_update, SimpleNamespace(guild=guild), SimpleNamespace(guild=guild))
+        assert found() == [2, 3, 5]
+
+        auto_channel.remove(guild_channels[0])
+        assert found() == [3, 5]
+        assert (auto_channel.cache_hits, auto_channel.cache_misses) == (2, 7)
+        assert found() == [3, 5]
+        assert (auto_channel.cache_hits, auto_channel.cache_misses) == (3, 7)
+
+        # Without the event listeners, channels are searched for on every iteration
+        auto_channel._close()
+        found()
+        found()
+        assert (auto_channel.cache_hits, auto_channel.cache_misses) == (3, 9)
+    finally:
+        auto_channel._close()
+        event_ctrl.stop()
+
+
 async def test_autochannel(guilds, channels, accounts):
     """
     Tests if AutoCHANNEL functions properly.
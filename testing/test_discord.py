@@ -0,0 +1,492 @@
+from _discord.gateway import DiscordWebSocket
+from _discord.state import ConnectionState
+from _discord.http import RateLimitBucket
+from _discord.guild import _LazyMapping
+from types import SimpleNamespace
+
+import _discord.gateway
+import _discord.abc
+import _discord as discord
+import asyncio
+import time
+import daf
+import threading
+import pytest
+import json
+import os
+import zlib
+
+
+SELF_ID = 1
+GUILD_ID = 10
+
+
+def user_payload(id_: int) -> dict:
+    return {"id": str(id_), "username": f"user{id_}", "discriminator": "0", "avatar": None, "global_name": None}
+
+
+def channel_payload(id_: int) -> dict:
+    return {
+        "id": str(id_), "type": 0, "name": f"c{id_}", "position": 0,
+        "guild_id": str(GUILD_ID), "permission_overwrites": []
+    }
+
+
+def thread_payload(id_: int, parent_id: int) -> dict:
+    return {
+        "id": str(id_), "type": 11, "name": f"t{id_}", "guild_id": str(GUILD_ID), "parent_id": str(parent_id),
+        "owner_id": str(SELF_ID), "member_count": 1, "message_count": 0,
+        "thread_metadata": {
+            "archived": False, "auto_archive_duration": 60,
+            "archive_timestamp": "2020-01-01T00:00:00+00:00", "locked": False
+        },
+    }
+
+
+def member_payload(id_: int) -> dict:
+    return {
+        "user": user_payload(id_), "roles": [], "joined_at": "2020-01-01T00:00:00+00:00", "deaf": False, "mute": False
+    }
+
+
+def role_payload(id_: int, permissions: int = 0) -> dict:
+    return {"id": str(id_), "name": f"r{id_}", "permissions": str(permissions), "position": 0}
+
+
+def guild_payload(channels: list = (), threads: list = (), members: list = ()) -> dict:
+    return {
+        "id": str(GUILD_ID), "name": "guild", "roles": [], "channels": list(channels), "threads": list(threads),
+        "members": list(members), "emojis": [], "stickers": []
+    }
+
+
+def message_payload(id_: int, channel_id: int) -> dict:
+    return {
+        "id": str(id_), "channel_id": str(channel_id), "guild_id": str(GUILD_ID), "author": user_payload(SELF_ID),
+        "content": f"Message {id_}", "timestamp": "2020-01-01T00:00:00+00:00", "edited_timestamp": None,
+        "tts": False, "mention_everyone": False, "mentions": [], "mention_roles": [], "attachments": [],
+        "embeds": [], "pinned": False, "type": 0
+    }
+
+
+def make_state(**options) -> ConnectionState:
+    "Returns a connection state of a logged in user, not connected to Discord."
+    state = ConnectionState(
+        dispatch=lambda *args: None, handlers={}, hooks={}, http=None, loop=asyncio.get_running_loop(),
+        intents=discord.Intents.all(), **options
+    )
+    state.user = discord.ClientUser(state=state, data=user_payload(SELF_ID))
+    return state
+
+
+def make_websocket(state: ConnectionState, parsed: list) -> DiscordWebSocket:
+    "Returns a websocket, not connected to Discord, that records the events it parses into ``parsed``."
+    ws = DiscordWebSocket(None, loop=asyncio.get_running_loop())
+    ws.shard_id = None
+    ws._discord_parsers = {event: lambda data, event=event: parsed.append(event) for event in state.parsers}
+    ws._dispatch_allowlist = state.dispatch_allowlist
+    ws._skipped_events = state.skipped_events
+    ws._decode_latency = state.decode_latency
+    return ws
+
+
+def make_response(status: int = 200, **headers) -> SimpleNamespace:
+    "Returns an object with the attributes of a response, read by the rate limiter."
+    return SimpleNamespace(status=status, headers={f"X-Ratelimit-{name}": value for name, value in headers.items()})
+
+
+@pytest.mark.parametrize("status", [500, 502, 404])
+async def test_ratelimit_bucket_no_headers(status: int):
+    "Test if a response without rate limit headers keeps the known limits of the bucket"
+    bucket = RateLimitBucket()
+    assert await bucket.acquire() == 0
+    bucket.update(make_response(Limit="2", Remaining="1", **{"Reset-After": "10"}), use_clock=False)
+    bucket.release()
+    reset_at = bucket.reset_at
+
+    assert await bucket.acquire() == 0
+    bucket.update(make_response(status), use_clock=False)
+    bucket.release()
+    assert (bucket.limit, bucket.remaining, bucket.reset_at) == (2, 0, reset_at)
+    assert bucket._try_reserve() is not None  # Waits for the reset instead of sending
+
+    # Unknown limits of a new bucket stay unknown, one request is sent at a time
+    bucket = RateLimitBucket()
+    assert await bucket.acquire() == 0
+    bucket.update(make_response(status), use_clock=False)
+    assert bucket._try_reserve() == float("inf")
+    bucket.release()
+
+
+async def test_ratelimit_bucket_not_limited():
+    "Test if a successful response without rate limit headers marks the bucket as not rate limited"
+    bucket = RateLimitBucket()
+    assert await bucket.acquire() == 0
+    bucket.update(make_response(), use_clock=False)
+    for _ in range(5):
+        assert await bucket.acquire() == 0
+
+    assert bucket.remaining is None
+
+
+async def test_channel_index():
+    "Test if channels and threads are found by ID after they are created, deleted and their guild is replaced"
+    state = make_state()
+    state._add_guild_from_data(guild_payload([channel_payload(100), channel_payload(101)], [thread_payload(200, 100)]))
+    assert [state.get_channel(id_).name for id_ in (100, 101, 200)] == ["c100", "c101", "t200"]
+
+    state.parse_channel_create(channel_payload(102))
+    state.parse_thread_create(thread_payload(201, 101))
+    assert state.get_channel(102).name == "c102" and state.get_channel(201).name == "t201"
+
+    state.parse_channel_delete(channel_payload(100))
+    state.parse_thread_delete({"id": "201", "guild_id": str(GUILD_ID), "parent_id": "101", "type": 11})
+    assert state.get_channel(100) is None and state.get_channel(201) is None
+    guild = state._get_guild(GUILD_ID)
+    assert state._guild_channels == {**guild._channels, **guild._threads}
+
+    # A new guild object (eg. after the guild becomes available again) replaces the channels of the old one
+    state._add_guild_from_data(guild_payload([channel_payload(101), channel_payload(103)]))
+    new_guild = state._get_guild(GUILD_ID)
+    assert state.get_channel(101).guild is new_guild and state.get_channel(103).guild is new_guild
+    assert state.get_channel(102) is None and state.get_channel(200) is None
+    guild._add_channel(guild.get_channel(102))  # Changes to the old guild aren't indexed
+    assert state.get_channel(102) is None
+
+    state._remove_guild(new_guild)
+    assert state.get_channel(101) is None and state._guild_channels == {}
+
+
+async def test_permissions_cache(monkeypatch: pytest.MonkeyPatch):
+    "Test if cached member permissions are resolved again after the roles, overwrites, timeout or owner change"
+    perms = discord.Permissions
+    state = make_state()
+    guild_data = guild_payload([channel_payload(100), channel_payload(101), channel_payload(102)])
+    guild_data["roles"] = [role_payload(GUILD_ID, perms(view_channel=True, send_messages=True).value), role_payload(20)]
+    member_data = member_payload(2)
+    member_data["roles"] = ["20", "21"]  # Role 21 doesn't exist yet
+    guild_data["members"] = [member_data]
+    state._add_guild_from_data(guild_data)
+    guild = state._get_guild(GUILD_ID)
+    channel = guild.get_channel(100)
+    member = guild.get_member(2)
+
+    resolved = []
+    resolve = _discord.abc.GuildChannel._resolve_permissions
+
+    def record_resolve(self, obj):
+        resolved.append(obj.id)
+        return resolve(self, obj)
+
+    monkeypatch.setattr(_discord.abc.GuildChannel, "_resolve_permissions", record_resolve)
+    last = channel.permissions_for(member)
+    assert last == perms(view_channel=True, send_messages=True)
+    assert channel.permissions_for(member) == last and len(resolved) == 1  # Cached
+
+    def changed() -> bool:
+        nonlocal last
+        count = len(resolved)
+        current = channel.permissions_for(member)
+        is_changed = len(resolved) == count + 1 and current != last
+        last = current
+        return is_changed
+
+    role_data = role_payload(20, perms(manage_messages=True).value)
+    state.parse_guild_role_update({"guild_id": str(GUILD_ID), "role": role_data})
+    assert changed() and last.manage_messages
+
+    role_data = role_payload(21, perms(add_reactions=True).value)
+    state.parse_guild_role_create({"guild_id": str(GUILD_ID), "role": role_data})
+    assert changed() and last.add_reactions
+
+    state.parse_guild_role_delete({"guild_id": str(GUILD_ID), "role_id": "21"})
+    assert changed() and not last.add_reactions
+
+    channel._fill_overwrites(
+        {"permission_overwrites": [{"id": "2", "type": 1, "allow": "0", "deny": str(perms(send_messages=True).value)}]}
+    )
+    assert changed() and not last.send_messages
+
+    member_data["roles"] = []
+    state.parse_guild_member_update({"guild_id": str(GUILD_ID), **member_data})
+    assert changed() and not last.manage_messages
+
+    # The timeout is not applied by the permission resolution, but replaces the cached entry
+    count = len(resolved)
+    state.parse_guild_member_update(
+        {"guild_id": str(GUILD_ID), **member_data, "communication_disabled_until": "2100-01-01T00:00:00+00:00"}
+    )
+    assert channel.permissions_for(member) == last and len(resolved) == count + 1
+
+    state.parse_guild_update({"id": str(GUILD_ID), "name": "guild", "roles": guild_data["roles"], "owner_id": "2"})
+    assert guild.get_channel(100) is channel and guild.get_member(2) is member
+    assert changed() and last.administrator
+
+    # The cache is cleared once it's full
+    monkeypatch.setattr(_discord.abc, "PERMISSIONS_CACHE_SIZE", 2)
+    guild._invalidate_permissions()
+    for channel_id in (100, 101, 102):
+        guild.get_channel(channel_id).permissions_for(member)
+
+    assert list(guild._permissions_cache) == [(102, 2)]
+
+
+async def test_message_cache():
+    "Test if the message cache evicts the least recently used messages and removes messages of deleted channels"
+    state = make_state(max_messages=3)
+    state._add_guild_from_data(guild_payload([channel_payload(100), channel_payload(101)]))
+    for id_, channel_id in ((1, 100), (2, 101), (3, 100)):
+        state.parse_message_create(message_payload(id_, channel_id))
+
+    assert [message.id for message in state._messages] == [1, 2, 3]
+    assert state._get_message(1).content == "Message 1"  # Fetching makes the message the most recently used
+    assert [message.id for message in state._messages] == [2, 3, 1]
+
+    state.parse_message_create(message_payload(4, 101))
+    assert [message.id for message in state._messages] == [3, 1, 4]
+    assert state._get_message(2) is None
+    assert state._messages[-1].id == 4 and len(state._messages) == 3
+
+    state.parse_message_delete({"id": "3", "channel_id": "100", "guild_id": str(GUILD_ID)})
+    assert [message.id for message in state._messages] == [1, 4]
+
+    state.parse_message_create(message_payload(5, 100))
+    state.parse_channel_delete(channel_payload(100))
+    assert [message.id for message in state._messages] == [4]
+    assert state._messages._channels.keys() == {101}
+
+
+async def test_joined_member_ttl():
+    "Test if joined members are cached until the TTL since their last join passes, except the account's own member"
+    state = make_state(joined_member_ttl=0.4)
+    state._add_guild_from_data(guild_payload([channel_payload(100)]))
+    guild = state._get_guild(GUILD_ID)
+    for id_ in (SELF_ID, 2, 3):
+        state.parse_guild_member_add({"guild_id": str(GUILD_ID), **member_payload(id_)})
+
+    assert sorted(guild._members) == [SELF_ID, 2, 3]
+    await asyncio.sleep(0.3)
+    state.parse_guild_member_add({"guild_id": str(GUILD_ID), **member_payload(2)})  # Rejoined, expires later
+    await asyncio.sleep(0.2)
+    assert sorted(guild._members) == [SELF_ID, 2]
+    await asyncio.sleep(0.4)
+    assert sorted(guild._members) == [SELF_ID] and guild.me is not None
+    assert not state._joined_members and not state._joined_deadlines and state._joined_expiry is None
+
+
+async def test_dispatch_allowlist():
+    "Test if events outside of the dispatch allowlist are skipped and the events needed for the connection are not"
+    state = make_state(dispatch_allowlist=["MESSAGE_CREATE"])
+    parsed = []
+    ws = make_websocket(state, parsed)
+    for sequence, event in enumerate(("MESSAGE_CREATE", "TYPING_START", "GUILD_CREATE", "TYPING_START", "RESUMED")):
+        await ws.received_message(json.dumps({"op": 0, "t": event, "s": sequence, "d": {}}))
+
+    assert parsed == ["MESSAGE_CREATE", "GUILD_CREATE", "RESUMED"]
+    assert state.skipped_events == {"TYPING_START": 2}
+    assert ws.sequence == 4  # Skipped events still count in the session's sequence
+
+    state = make_state()
+    parsed = []
+    ws = make_websocket(state, parsed)
+    await ws.received_message(json.dumps({"op": 0, "t": "TYPING_START", "s": 1, "d": {}}))
+    assert parsed == ["TYPING_START"] and not state.skipped_events
+
+
+@pytest.mark.parametrize("lazy_guilds", [False, True])
+async def test_lazy_guilds(lazy_guilds: bool):
+    "Test if guilds built lazily from GUILD_CREATE contain the same channels, threads, members and voice states"
+    state = make_state(lazy_guilds=lazy_guilds)
+    voice_data = {**channel_payload(102), "type": 2, "bitrate": 64000, "user_limit": 0}
+    guild_data = guild_payload(
+        [channel_payload(100), channel_payload(101), voice_data, channel_payload(104)],
+        [thread_payload(200, 100), thread_payload(201, 101)],
+        [member_payload(SELF_ID), member_payload(2), member_payload(3)],
+    )
+    guild_data["roles"] = [role_payload(GUILD_ID)]
+    guild_data["voice_states"] = [
+        {
+            "user_id": "2", "channel_id": "102", "session_id": "session", "deaf": False, "mute": False,
+            "self_deaf": False, "self_mute": False, "self_video": False, "suppress": False,
+        }
+    ]
+    state.parse_guild_create(guild_data)
+    guild = state._get_guild(GUILD_ID)
+    assert isinstance(guild._channels, _LazyMapping) is lazy_guilds
+    assert guild._voice_states[2].channel.id == 102
+
+    # Looked up before the rest is built
+    assert state.get_channel(101).name == "c101" and guild.get_thread(201).parent is guild.get_channel(101)
+    assert guild.get_member(3).name == "user3" and guild.get_member(4) is None and state.get_channel(300) is None
+    if lazy_guilds:
+        assert guild._channels._pending.keys() == {100, 104} and guild._members._pending.keys() == {2}
+
+    state.parse_channel_create(channel_payload(103))
+    state.parse_channel_delete(channel_payload(104))  # Never built
+    assert state.get_channel(103).name == "c103" and state.get_channel(104) is None
+    assert guild.get_member(2).voice.channel is guild.get_channel(102)
+
+    assert sorted(channel.id for channel in guild.channels) == [100, 101, 102, 103]
+    assert sorted(thread.id for thread in guild.threads) == [200, 201]
+    assert sorted(member.id for member in guild.members) == [SELF_ID, 2, 3]
+    assert all(state.get_channel(id_).guild is guild for id_ in (100, 101, 102, 103, 200, 201))
+    assert guild.me is not None and {id_: vs.channel.id for id_, vs in guild._voice_states.items()} == {2: 102}
+    assert state._guild_channels == {**guild._channels, **guild._threads}
+
+
+async def test_decode_offload(monkeypatch: pytest.MonkeyPatch):
+    "Test if large gateway payloads are decoded in a thread, keeping the order of the compressed stream"
+    monkeypatch.setattr(_discord.gateway, "DECODE_OFFLOAD_COMPRESSED_SIZE", 200)
+    monkeypatch.setattr(_discord.gateway, "DECODE_OFFLOAD_SIZE", 500)
+    state = make_state()
+    parsed = []
+    ws = make_websocket(state, parsed)
+    decoded_in = []
+    decode = ws._decode
+
+    def record_decode(msg):
+        decoded_in.append(threading.get_ident() == threading.main_thread().ident)
+        return decode(msg)
+
+    ws._decode = record_decode
+    compress = zlib.compressobj()
+    sequences = []
+    ws._discord_parsers["MESSAGE_CREATE"] = lambda data: sequences.append(data["content"])
+    for sequence, size in enumerate((10, 5000, 10, 5000)):
+        payload = json.dumps({"op": 0, "t": "MESSAGE_CREATE", "s": sequence, "d": {"content": os.urandom(size).hex()}})
+        data = compress.compress(payload.encode()) + compress.flush(zlib.Z_SYNC_FLUSH)
+        # Received in two parts, only the last one ends with the zlib suffix
+        await ws.received_message(data[:len(data) // 2])
+        await ws.received_message(data[len(data) // 2:])
+        assert ws.sequence == sequence and len(sequences[-1]) == size * 2
+
+    assert decoded_in == [True, False, True, False]  # Small in the event loop's thread, large in a worker thread
+    await ws.received_message(json.dumps({"op": 0, "t": "MESSAGE_CREATE", "s": 4, "d": {"content": "x" * 600}}))
+    assert decoded_in[-1] is False and sequences[-1] == "x" * 600  # Large uncompressed payload
+    assert sum(state.decode_latency.counts) == 5
+
+
+@pytest.mark.parametrize(
+    ("shard_ids", "max_concurrency", "groups"),
+    [
+        (None, 1, [[0], [1], [2], [3], [4]]),
+        (None, 2, [[0, 1], [2, 3], [4]]),
+        (None, 16, [[0, 1, 2, 3, 4]]),
+        # Shards of the same rate limit bucket (shard_id % max_concurrency) identify in different groups
+        ([0, 2, 4, 1], 2, [[0, 1], [2], [4]]),
+    ]
+)
+async def test_shard_groups(shard_ids: list, max_concurrency: int, groups: list):
+    "Test if shards are launched in groups, which identify concurrently, by max_concurrency"
+    client = discord.AutoShardedClient(shard_count=5, shard_ids=shard_ids, max_concurrency=max_concurrency)
+    launched = []  # Groups of (shard IDs, initial)
+    launching = set()
+
+    async def get_gateway():
+        return "wss://gateway"
+
+    async def launch_shard(gateway: str, shard_id: int, *, initial: bool = False):
+        if not launching:  # Shards launched while others are still launching are in the same group
+            launched.append(([], initial))
+
+        launched[-1][0].append(shard_id)
+        launching.add(shard_id)
+        await asyncio.sleep(0)
+        launching.remove(shard_id)
+
+    client.http.get_gateway = get_gateway
+    client.launch_shard = launch_shard
+    await client.launch_shards()
+    assert [shards for shards, _ in launched] == groups
+    assert [initial for _, initial in launched] == [True] + [False] * (len(groups) - 1)
+
+
+async def test_session_snapshot():
+    "Test if the guilds are restored from a snapshot with their channels, threads and cached members"
+    state = make_state()
+    state._add_guild_from_data(
+        guild_payload(
+            [channel_payload(100)], [thread_payload(200, 100)], [member_payload(SELF_ID), member_payload(2)]
+        )
+    )
+    snapshot = json.loads(json.dumps(state.snapshot()))
+
+    restored = make_state()
+    assert restored.restore_snapshot(snapshot)
+    guild = restored._get_guild(GUILD_ID)
+    assert restored.get_channel(100).name == "c100" and restored.get_channel(200).name == "t200"
+    assert restored.get_channel(200).parent is restored.get_channel(100)
+    assert sorted(guild._members) == [SELF_ID, 2] and guild.me is not None
+
+    snapshot["user_id"] = 2  # Made by a different user
+    assert not make_state().restore_snapshot(snapshot)
+
+
+@pytest.mark.parametrize("outcome", ["resumed", "ready", "failed"])
+async def test_session_resume(outcome: str, tmp_path, monkeypatch: pytest.MonkeyPatch):
+    """
+    Test if servers of an account resuming a session are initialized after the gateway resumes it,
+    with the guilds of READY if it can't be resumed, and that connection failures are raised.
+    """
+    state = make_state()
+    state._add_guild_from_data(guild_payload([channel_payload(100)]))
+    server = daf.GUILD(GUILD_ID)
+    account = daf.ACCOUNT("token", servers=[server], session_path=str(tmp_path / "session.json"))
+    with open(account.session_path, "w", encoding="utf-8") as file:
+        json.dump(
+            {
+                "owner": account._get_session_owner(),
+                "intents": account.intents.value,
+                "saved_at": time.time(),
+                "session": {"session_id": "old", "sequence": 10, "resume_gateway_url": "wss://gateway"},
+                "cache": state.snapshot(),
+            },
+            file
+        )
+
+    async def login(self: discord.Client, token: str, bot: bool):
+        self._connection.user = discord.ClientUser(state=self._connection, data=user_payload(SELF_ID))
+
+    async def connect(self: discord.Client, *, reconnect: bool = True, session: dict = None):
+        assert session["session_id"] == "old"
+        restored.append(self.get_guild(GUILD_ID))
+        connection = self._connection
+        connection.guild_ready_timeout = 0.01
+        await asyncio.sleep(0.05)  # Servers wait for the gateway
+        assert server.apiobject == GUILD_ID  # Not initialized yet
+        if outcome == "failed":
+            raise discord.GatewayNotFound()
+
+        session_id = "old" if outcome == "resumed" else "new"  # An invalid session is replaced by identifying
+        self.ws = SimpleNamespace(session_id=session_id, sequence=20, resume_gateway_url="wss://gateway", open=False)
+        if outcome == "resumed":
+            connection.parse_resumed({})
+        else:
+            guilds = [{"id": str(GUILD_ID), "unavailable": True}]
+            connection.parse_ready({"user": user_payload(SELF_ID), "guilds": guilds})
+            connection.parse_guild_create(guild_payload([channel_payload(101)]))
+
+        while not self.is_closed():
+            await asyncio.sleep(0.01)
+
+    restored = []
+    monkeypatch.setattr(discord.Client, "login", login)
+    monkeypatch.setattr(discord.Client, "connect", connect)
+    if outcome == "failed":
+        assert isinstance(await account.initialize(), discord.GatewayNotFound)
+        await account._client.close()
+        return
+
+    assert await account.initialize() is None
+    try:
+        guild = account.client.get_guild(GUILD_ID)
+        assert server.apiobject is guild
+        if outcome == "resumed":
+            assert guild is restored[0] and guild.get_channel(100) is not None
+        else:  # The restored guild was replaced
+            assert guild is not restored[0] and guild.get_channel(101) is not None and guild.get_channel(100) is None
+    finally:
+        await account._close()
+
+    with open(account.session_path, "r", encoding="utf-8") as file:
+        assert json.load(file)["session"]["session_id"] == ("old" if outcome == "resumed" else "new")
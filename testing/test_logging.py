@@ -1,10 +1,17 @@
 from datetime import timedelta, datetime
 from typing import List
 
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+from concurrent.futures.process import BrokenProcessPool
+
 from daf.events import *
 
+import threading
+import asyncio
 import pytest
 import daf
+import sqlite3
 import shutil
 import os
 import pathlib
@@ -24,7 +31,7 @@ async def TEXT_MESSAGE(channels, guilds, accounts: List[daf.ACCOUNT]):
     await accounts[0].remove_server(guild)
 
 
-async def test_logging_json(TEXT_MESSAGE: daf.TextMESSAGE):
+async def test_logging_json(TEXT_MESSAGE: daf.TextMESSAGE, monkeypatch: pytest.MonkeyPatch):
     "Test if json logging works"
     tm = TEXT_MESSAGE
     try:
@@ -70,6 +77,7 @@ async def test_logging_json(TEXT_MESSAGE: daf.TextMESSAGE):
             await tm.update(data=d)
             message_ctx = await tm._send() 
             await daf.logging.save_log(guild_context, message_ctx, account_context)
+            await json_logger.flush()
             check_json_results(message_ctx)
 
         # Simulate member join without checking data
@@ -77,10 +85,325 @@ async def test_logging_json(TEXT_MESSAGE: daf.TextMESSAGE):
             guild_context,
             invite_context={"id": "ABCDE", "member": {"id": 123456789, "name": "test"}}
         )
+
+        # Counted from the summary index
+        counts = await json_logger.analytic_get_num_messages()
+        assert sum(successful + failed for _, successful, failed, *_ in counts) == len(data)
+        counts = await json_logger.analytic_get_num_invites()
+        assert [count for _, count, *_ in counts] == [1]
+
+        # Pages
+        logs, cursor = await json_logger.analytic_get_message_log_page(limit=2)
+        assert len(logs) == 2 and cursor is not None
+        next_logs, cursor = await json_logger.analytic_get_message_log_page(limit=2, cursor=cursor)
+        assert len(next_logs) == 1 and cursor is None
+        indexes = [log["index"] async for log in json_logger.analytic_iter_message_log(page_size=1)]
+        assert indexes == [log["index"] for log in logs + next_logs]
+
+        # Read by worker processes
+        monkeypatch.setattr(json_logger, "analytic_workers", 2)
+        monkeypatch.setattr(daf.logging.logger_file, "ANALYTIC_MIN_FILES", 1)
+        logs = await json_logger.analytic_get_message_log(before=datetime.now() + timedelta(hours=1))
+        assert [log["index"] for log in logs] == indexes
+        counts = await json_logger.analytic_get_num_invites(after=datetime.now() - timedelta(hours=1))
+        assert [count for _, count, *_ in counts] == [1]
+
+        # Read from the archive of a compressed day
+        directory = os.path.join(json_logger.path, *datetime.now().strftime("%Y-%m-%d").split("-"))
+        await json_logger._run_file_task(json_logger._compress_day, directory)
+        assert not os.path.exists(directory) and os.path.isfile(directory + ".tar.gz")
+        logs = await json_logger.analytic_get_message_log()
+        assert [log["index"] for log in logs] == indexes
+        counts = await json_logger.analytic_get_num_invites()
+        assert [count for _, count, *_ in counts] == [1]
+        await json_logger._close()
     finally:
         shutil.rmtree("./History", ignore_errors=True)
 
 
+def make_log(timestruct: datetime, guild_id: int, i: int, invite: bool = False) -> tuple:
+    "Returns a log, as queued for writing by the file loggers."
+    guild = {"name": f"G{guild_id}", "id": guild_id, "type": "GUILD"}
+    message = {
+        "type": "TextMESSAGE",
+        "sent_data": {"text": f"Text {i}"},
+        "channels": {"successful": [{"name": "general", "id": 5}], "failed": []},
+    }
+    author = {"name": "Account", "id": 3}
+    invite_context = {"id": "ABCDE", "member": {"id": 123456789, "name": "test"}} if invite else None
+    return timestruct, guild, message, author, invite_context
+
+
+async def test_logging_file_writer(monkeypatch: pytest.MonkeyPatch):
+    "Test if logs are written in batches, saving waits for a full queue and failed logs are saved to the fallback"
+    path = "./HistoryWriter"
+    try:
+        json_logger = daf.LoggerJSON(path, json_lines=True, flush_size=5, flush_interval=0.5)
+        await json_logger.initialize()
+        batches = []
+        write_logs = json_logger._write_logs
+
+        def record_write_logs(filename: str, logs: list, writer):
+            batches.append(len(logs))
+            write_logs(filename, logs, writer)
+
+        monkeypatch.setattr(json_logger, "_write_logs", record_write_logs)
+        for i in range(7):
+            await json_logger._save_log(*make_log(datetime.now(), 0, i)[1:])
+
+        await asyncio.sleep(0.2)  # Written once flush_size logs are queued
+        assert batches == [5] and json_logger.write_stats["queued"] == 2
+        await asyncio.sleep(0.5)  # The rest after flush_interval
+        stats = json_logger.write_stats
+        assert batches == [5, 2] and stats["written"] == 7 and stats["batches"] == 2 and stats["queued"] == 0
+
+        await json_logger._close()
+
+        # Saving waits for the writer once WRITE_QUEUE_SIZE logs are queued
+        monkeypatch.setattr(daf.logging.logger_file, "WRITE_QUEUE_SIZE", 6)
+        json_logger = daf.LoggerJSON(path, json_lines=True, flush_interval=10)
+        await json_logger.initialize()
+        for i in range(6):
+            await json_logger._save_log(*make_log(datetime.now(), 0, i)[1:])
+
+        task = asyncio.create_task(json_logger._save_log(*make_log(datetime.now(), 0, 6)[1:]))
+        await asyncio.sleep(0.1)
+        assert not task.done() and json_logger.write_stats["blocked"] == 1
+        await json_logger.flush()
+        await task
+        stats = json_logger.write_stats
+        assert stats["max_queued"] == 6 and stats["blocked_time"] > 0 and stats["queued"] == 1
+
+        # Queued logs are written when closing
+        await json_logger._close()
+        json_logger = daf.LoggerJSON(path, json_lines=True)
+        await json_logger.initialize()
+        assert len(await json_logger.analytic_get_message_log(limit=None)) == 14
+        await json_logger._close()
+
+        # Logs that can't be written are saved to the fallback
+        fallback = daf.LoggerJSON(os.path.join(path, "Fallback"), json_lines=True, flush_interval=0.1)
+        json_logger = daf.LoggerJSON(os.path.join(path, "Failing"), fallback=fallback, flush_interval=0.1)
+        await json_logger.initialize()
+
+        def fail_write_logs(filename: str, logs: list, writer):
+            raise OSError("Disk is full")
+
+        monkeypatch.setattr(json_logger, "_write_logs", fail_write_logs)
+        for i in range(3):
+            await json_logger._save_log(*make_log(datetime.now(), 0, i)[1:])
+
+        while json_logger.write_stats["failed"] < 3:
+            await asyncio.sleep(0.05)
+
+        await asyncio.sleep(0.05)  # Saved to the fallback by a task
+        assert json_logger.write_stats["written"] == 0
+        assert len(await fallback.analytic_get_message_log(limit=None)) == 3
+        await json_logger._close()
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+async def test_logging_json_convert(monkeypatch: pytest.MonkeyPatch):
+    "Test if converting nested JSON logs, split into multiple files, to JSON Lines keeps the logs"
+    monkeypatch.setattr(daf.logging.logger_json, "C_FILE_MAX_SIZE", 2000)
+    path = "./HistoryConvert"
+    try:
+        json_logger = daf.LoggerJSON(path)
+        await json_logger.initialize()
+        writer = json_logger._get_writer()
+        directory = os.path.join(path, "2024", "01", "24")
+        for i in range(20):
+            for guild_id in range(2):
+                log = make_log(datetime(2024, 1, 24, 8, i), guild_id, i, invite=i % 4 == 0)
+                json_logger._write_logs(os.path.join(directory, f"G{guild_id}.json"), [log], writer)
+
+        # Logs already in the JSON Lines format, ending with a partially written line
+        json_logger.json_lines = True
+        log = make_log(datetime(2024, 1, 24, 9), 0, 20)
+        json_logger._write_logs(os.path.join(directory, "G0.jsonl"), [log], writer)
+        writer._close_handles()
+        with open(os.path.join(directory, "G0.jsonl"), "a", encoding="utf-8") as file:
+            file.write('{"kind": "message", "type": "TextMES')
+
+        assert {"G01.json", "G11.json"} <= set(os.listdir(directory))  # Split by size
+        messages = await json_logger.analytic_get_message_log(limit=None)
+        invites = await json_logger.analytic_get_invite_log(limit=None)
+        counts = sorted(await json_logger.analytic_get_num_messages())
+        invite_counts = sorted(await json_logger.analytic_get_num_invites())
+        assert len(messages) == 41 and len(invites) == 10
+
+        await json_logger.convert_to_json_lines()
+        assert sorted(os.listdir(directory)) == [".daf_index", "G0.jsonl", "G1.jsonl"]
+        by_index = lambda log: log["index"]
+        converted = await json_logger.analytic_get_message_log(limit=None)
+        assert sorted(converted, key=by_index) == sorted(messages, key=by_index)
+        converted = await json_logger.analytic_get_invite_log(limit=None)
+        assert sorted(converted, key=by_index) == sorted(invites, key=by_index)
+        assert sorted(await json_logger.analytic_get_num_messages()) == counts
+        assert sorted(await json_logger.analytic_get_num_invites()) == invite_counts
+
+        # Deleting skips a partially written line
+        await json_logger._run_file_task(writer._close_handles)
+        with open(os.path.join(directory, "G0.jsonl"), "a", encoding="utf-8") as file:
+            file.write('{"kind": "message", "type": "TextMES')
+
+        await json_logger.delete_logs(await json_logger.analytic_get_message_log(limit=2))
+        await json_logger.delete_logs(await json_logger.analytic_get_invite_log(limit=1))
+        assert len(await json_logger.analytic_get_message_log(limit=None)) == 39
+        assert len(await json_logger.analytic_get_invite_log(limit=None)) == 9
+        with open(os.path.join(directory, "G0.jsonl"), "r", encoding="utf-8") as file:
+            assert file.read().endswith('{"kind": "message", "type": "TextMES')
+
+        await json_logger._close()
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def test_logging_file_summary_range():
+    "Test if the time range of a file summary contains the logs, so that files aren't counted without reading them"
+    summary_index = daf.logging.logger_file._SummaryIndex
+    summary = summary_index.new()
+    guild = {"name": "G0", "id": 0, "type": "GUILD"}
+    author = {"name": "Account", "id": 3}
+    summary_index.add_message(summary, datetime(2024, 1, 24, 8, 0, 0, 700_000), guild, author, "TextMESSAGE", True)
+    summary_index.add_invite(summary, datetime(2024, 1, 24, 7, 59, 59, 300_000), guild, "ABCDE")
+    assert summary["first"] == "2024-01-24 07:59:59" and summary["last"] == "2024-01-24 08:00:01"
+    assert not summary_index.is_within(summary, datetime(2024, 1, 24), datetime(2024, 1, 24, 8, 0, 0, 500_000))
+    assert summary_index.is_within(summary, datetime(2024, 1, 24), datetime(2024, 1, 24, 8, 0, 1))
+    assert summary_index.get_rows(summary, "messages", datetime(2024, 1, 24, 8, 0, 0, 900_000), datetime.max)
+
+
+async def test_logging_file_retention():
+    "Test if old days of file logs are compressed and deleted and if analytics still read the compressed days"
+    path = "./HistoryRetention"
+    try:
+        json_logger = daf.LoggerJSON(path, json_lines=True)
+        writer = json_logger._get_writer()
+        directories = {}
+        for age in (0, 2, 5, 10):
+            timestruct = datetime.now().replace(hour=0, minute=0) - timedelta(days=age)
+            directories[age] = directory = os.path.join(path, *timestruct.strftime("%Y-%m-%d").split("-"))
+            for guild_id in range(2):
+                logs = [make_log(timestruct + timedelta(minutes=i), guild_id, i, invite=i == 0) for i in range(3)]
+                json_logger._write_logs(os.path.join(directory, f"G{guild_id}.jsonl"), logs, writer)
+
+        writer._close_handles()
+        deleted_after = datetime.now().replace(hour=0, minute=0) - timedelta(days=9)
+        messages = await json_logger.analytic_get_message_log(after=deleted_after, limit=None)
+        invites = await json_logger.analytic_get_invite_log(after=deleted_after, limit=None)
+        counts = sorted(await json_logger.analytic_get_num_messages(after=deleted_after))
+        invite_counts = sorted(await json_logger.analytic_get_num_invites(after=deleted_after))
+        assert len(messages) == 18 and len(invites) == 6
+        await json_logger._close()
+
+        # Days 2 and 5 days old are compressed, the day 10 days old is deleted and today is kept as is
+        json_logger = daf.LoggerJSON(path, json_lines=True, compress_after_days=2, delete_after_days=7)
+        await json_logger.apply_retention()
+        assert os.path.isdir(directories[0])
+        for age in (2, 5):
+            assert not os.path.exists(directories[age]) and os.path.isfile(directories[age] + ".tar.gz")
+
+        assert not os.path.exists(directories[10]) and not os.path.exists(directories[10] + ".tar.gz")
+        assert await json_logger.analytic_get_message_log(limit=None) == messages
+        assert await json_logger.analytic_get_invite_log(limit=None) == invites
+        assert sorted(await json_logger.analytic_get_num_messages()) == counts
+        assert sorted(await json_logger.analytic_get_num_invites()) == invite_counts
+
+        # Applying the retention again changes nothing
+        await json_logger.apply_retention()
+        assert await json_logger.analytic_get_message_log(limit=None) == messages
+
+        # Logs of compressed days are deleted from the archives
+        archive = directories[5] + ".tar.gz"
+        compressed_day = (datetime.now() - timedelta(days=5)).date()
+        deleted_messages = [log for log in messages if log["timestamp"].date() == compressed_day][:2]
+        deleted_invites = [log for log in invites if log["timestamp"].date() == compressed_day][:1]
+        await json_logger.delete_logs(deleted_messages)
+        await json_logger.delete_logs(deleted_invites)
+        assert await json_logger.analytic_get_message_log(limit=None) == [
+            log for log in messages if log not in deleted_messages
+        ]
+        assert await json_logger.analytic_get_invite_log(limit=None) == [
+            log for log in invites if log not in deleted_invites
+        ]
+        assert sum(row[1] for row in await json_logger.analytic_get_num_messages()) == len(messages) - 2
+        assert json_logger._index.get_archived(archive, os.stat(archive)) is not None  # Summaries were updated
+        await json_logger._close()
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+async def test_logging_file_workers(monkeypatch: pytest.MonkeyPatch):
+    "Test if analytics read by the worker processes match analytics read by the writer thread"
+    monkeypatch.setattr(daf.logging.logger_file, "ANALYTIC_MIN_FILES", 1)
+    path = "./HistoryWorkers"
+    try:
+        json_logger = daf.LoggerJSON(path, json_lines=True)
+        writer = json_logger._get_writer()
+        for age in range(4):
+            timestruct = datetime.now().replace(hour=0, minute=0) - timedelta(days=age)
+            directory = os.path.join(path, *timestruct.strftime("%Y-%m-%d").split("-"))
+            for guild_id in range(3):
+                logs = [
+                    make_log(timestruct + timedelta(minutes=i), guild_id, i, invite=i % 2 == 0) for i in range(4)
+                ]
+                json_logger._write_logs(os.path.join(directory, f"G{guild_id}.jsonl"), logs, writer)
+
+        writer._close_handles()
+        await json_logger._close()
+
+        async def read_analytics(json_logger: daf.LoggerJSON) -> tuple:
+            pages = []
+            cursor = None
+            while True:
+                page, cursor = await json_logger.analytic_get_message_log_page(limit=5, cursor=cursor)
+                pages.append(page)
+                if cursor is None:
+                    break
+
+            return (
+                await json_logger.analytic_get_message_log(limit=None),
+                await json_logger.analytic_get_message_log(guild=1, sort_by_direction="asc", limit=7),
+                await json_logger.analytic_get_invite_log(limit=None),
+                sorted(await json_logger.analytic_get_num_messages()),
+                sorted(await json_logger.analytic_get_num_invites(group_by="month")),
+                pages,
+            )
+
+        results = []
+        for analytic_workers in (1, 2):
+            for root, _, names in os.walk(path):  # Summarized again by the workers
+                if daf.logging.logger_file.INDEX_FILENAME in names:
+                    os.remove(os.path.join(root, daf.logging.logger_file.INDEX_FILENAME))
+
+            json_logger = daf.LoggerJSON(path, json_lines=True, analytic_workers=analytic_workers)
+            await json_logger.initialize()
+            results.append(await read_analytics(json_logger))
+            assert (json_logger._pool is not None) == (analytic_workers > 1)
+            await json_logger._close()
+
+        assert results[0] == results[1]
+        assert len(results[0][0]) == 48 and len(results[0][2]) == 24 and len(results[0][5]) == 10
+
+        # Files are read by the writer thread when the worker processes stop
+        class BrokenPool:
+            def submit(self, *args):
+                raise BrokenProcessPool("A worker process terminated")
+
+            def shutdown(self, wait: bool = True):
+                pass
+
+        json_logger = daf.LoggerJSON(path, json_lines=True, analytic_workers=2)
+        await json_logger.initialize()
+        json_logger._pool = BrokenPool()
+        assert await json_logger.analytic_get_message_log(limit=None) == results[0][0]
+        assert json_logger._pool is None
+        await json_logger._close()
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
 async def test_logging_sql(TEXT_MESSAGE: daf.TextMESSAGE):
     """
     Tests if SQL logging works(only sqlite).
@@ -112,6 +435,155 @@ async def test_logging_sql(TEXT_MESSAGE: daf.TextMESSAGE):
             guild_context,
             invite_context={"id": "ABCDE", "member": {"id": 123456789, "name": "test"}}
         )
+        await sql_logger.flush()
+
+        # Counted from the rollup tables
+        counts = await sql_logger.analytic_get_num_messages()
+        assert sum(successful + failed for _, successful, failed, *_ in counts) == len(data)
+        counts = await sql_logger.analytic_get_num_invites()
+        assert [count for _, count, *_ in counts] == [1]
+
+        # Pages
+        logs, cursor = await sql_logger.analytic_get_message_log_page(sort_by_direction="asc", limit=2)
+        assert len(logs) == 2 and cursor is not None
+        next_logs, cursor = await sql_logger.analytic_get_message_log_page(
+            sort_by_direction="asc", limit=2, cursor=cursor
+        )
+        assert len(next_logs) == 1 and cursor is None
+        assert [log.sent_data.content for log in logs + next_logs] == [
+            log.sent_data.content async for log in sql_logger.analytic_iter_message_log(sort_by_direction="asc")
+        ]
+        invites, cursor = await sql_logger.analytic_get_invite_log_page()
+        assert len(invites) == 1 and cursor is None
     finally:
         os.remove("./testdb.db")
         daf.logging._logging._set_logger(None)
+
+
+async def test_logging_sql_sync(monkeypatch: pytest.MonkeyPatch):
+    "Test if calls of dialects without async connectors are made from the logger's threads, not the event loop's"
+    monkeypatch.setattr(daf.logging.sql.mgr, "SQL_SYNC_DIALECTS", ("sqlite",))
+    monkeypatch.setitem(daf.logging.sql.mgr.DIALECT_CONN_MAP, "sqlite", "pysqlite")
+    threads = set()
+    for name in ("execute", "commit"):
+        def record_thread(self, *args, _method=getattr(Session, name), **kwargs):
+            threads.add(threading.current_thread().name)
+            return _method(self, *args, **kwargs)
+
+        monkeypatch.setattr(Session, name, record_thread)
+
+    try:
+        sql_logger = daf.LoggerSQL(database="testdb_sync", fallback=None)
+        await sql_logger.initialize()
+        assert not sql_logger.is_async
+        for i in range(3):
+            await sql_logger._save_log(*make_log(datetime.now(), 0, i)[1:4])
+
+        assert len(await sql_logger.analytic_get_message_log()) == 3
+        assert threads and all(name.startswith("LoggerSQL") for name in threads)
+        executor = sql_logger._executor
+        await sql_logger._close()
+        assert sql_logger._executor is None and executor._shutdown
+    finally:
+        os.remove("./testdb_sync.db")
+
+
+async def test_logging_sql_data_history_migration():
+    "Test if sent data of databases without content hashes, which can contain duplicates, is migrated"
+    try:
+        sql_logger = daf.LoggerSQL(database="testdb_migration", fallback=None)
+        await sql_logger.initialize()
+        for i in range(4):
+            await sql_logger._save_log(*make_log(datetime.now(), 0, i % 2)[1:4])
+
+        await sql_logger.flush()
+        assert sql_logger._flush_task is None  # The timer is cancelled once the buffer is saved
+        await sql_logger._stop_engine()
+
+        # Database of older versions, where the same data could be saved more than once
+        connection = sqlite3.connect("./testdb_migration.db")
+        for name, in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'DataHISTORY'"
+        ).fetchall():
+            connection.execute(f'DROP INDEX "{name}"')
+
+        connection.execute('ALTER TABLE "DataHISTORY" DROP COLUMN content_hash')
+        max_id, = connection.execute('SELECT MAX(id) FROM "DataHISTORY"').fetchone()
+        connection.execute(
+            'INSERT INTO "DataHISTORY" (id, content) SELECT id + ?, content FROM "DataHISTORY"', (max_id,)
+        )
+        connection.execute('UPDATE "MessageLOG" SET sent_data_id = sent_data_id + ? WHERE id % 2 = 0', (max_id,))
+        connection.commit()
+        connection.close()
+
+        sql_logger = daf.LoggerSQL(database="testdb_migration", fallback=None)
+        await sql_logger.initialize()  # Migrates
+        logs = await sql_logger.analytic_get_message_log(sort_by_direction="asc")
+        assert [json.loads(log.sent_data.content)["text"] for log in logs] == ["Text 0", "Text 1", "Text 0", "Text 1"]
+        await sql_logger._stop_engine()
+
+        connection = sqlite3.connect("./testdb_migration.db")
+        assert connection.execute('SELECT COUNT(*) FROM "DataHISTORY"').fetchone() == (2,)
+        assert {id_ for id_, in connection.execute('SELECT sent_data_id FROM "MessageLOG"')} <= {1, 2}
+        with pytest.raises(sqlite3.IntegrityError):  # Unique index on content_hash
+            connection.execute(
+                'INSERT INTO "DataHISTORY" (content, content_hash) SELECT content, content_hash FROM "DataHISTORY"'
+            )
+
+        connection.close()
+    finally:
+        os.remove("./testdb_migration.db")
+
+
+async def test_logging_sql_rollups():
+    "Test if the rollup tables, which message and invite counts are read from, follow saved and deleted logs"
+    try:
+        sql_logger = daf.LoggerSQL(database="testdb_rollups", fallback=None)
+        await sql_logger.initialize()
+        for i in range(12):
+            _, guild, message, author, invite = make_log(datetime.now(), i % 2, i, invite=i % 3 == 0)
+            if i % 4 == 0:
+                message["channels"] = {
+                    "successful": [], "failed": [{"name": "no access", "id": 6, "reason": "Forbidden"}]
+                }
+
+            await sql_logger._save_log(guild, message, author)
+            if invite is not None:
+                await sql_logger._save_log(guild, invite_context=invite)
+
+        def totals(counts: list) -> dict:
+            "Returns the numbers of successful and failed messages by guild id."
+            result = {}
+            for _, successful, failed, guild_id, *_ in counts:
+                total = result.setdefault(guild_id, [0, 0])
+                total[0] += successful
+                total[1] += failed
+
+            return result
+
+        assert totals(await sql_logger.analytic_get_num_messages()) == {0: [3, 3], 1: [6, 0]}
+        assert sum(count for _, count, *_ in await sql_logger.analytic_get_num_invites()) == 4
+
+        # Deleted logs are subtracted
+        logs = await sql_logger.analytic_get_message_log(guild=0)
+        await sql_logger.delete_logs(daf.logging.sql.MessageLOG, [log.id for log in logs if log.success_rate < 100])
+        invites = await sql_logger.analytic_get_invite_log()
+        await sql_logger.delete_logs(daf.logging.sql.InviteLOG, [invite.id for invite in invites[:1]])
+        counts = await sql_logger.analytic_get_num_messages()
+        assert totals(counts) == {0: [3, 0], 1: [6, 0]}
+        invite_counts = await sql_logger.analytic_get_num_invites()
+        assert sum(count for _, count, *_ in invite_counts) == 3
+
+        # Recalculated from the logs
+        async with sql_logger.session_maker() as session:
+            await session.execute(delete(daf.logging.sql.MessageCOUNT))
+            await session.execute(delete(daf.logging.sql.InviteCOUNT))
+            await session.commit()
+
+        assert await sql_logger.analytic_get_num_messages() == []
+        await sql_logger.backfill_rollups()
+        assert sorted(await sql_logger.analytic_get_num_messages()) == sorted(counts)
+        assert sorted(await sql_logger.analytic_get_num_invites()) == sorted(invite_counts)
+        await sql_logger._stop_engine()
+    finally:
+        os.remove("./testdb_rollups.db")
@@ -4,9 +4,16 @@ from daf.logic import and_, or_, not_, regex, contains, BaseLogic
 from daf.responder.actions import DMResponse, GuildResponse
 from daf.responder import GuildResponder, DMResponder
 from daf.messagedata import TextMessageData
+from daf.responder.engine import ResponderEngine
+from daf.logic import MatchInput
+from daf.responder.base import ROUTE_DM, ROUTE_ANY_GUILD
 from daf.client import ACCOUNT
+from datetime import timedelta
+from types import SimpleNamespace
 
+import asyncio
 import pytest
+import daf
 import re
 
 
@@ -122,5 +129,217 @@ def test_responder_conditions(condition: BaseLogic, input: str, should_match: bo
     assert condition.check(input) == should_match, "Condition failed"
 
 
+@pytest.mark.parametrize(
+    ("condition", "input", "should_match"),
+    [
+        (or_(*[contains(f"word{i}") for i in range(50)]), "There is WORD42 in here", True),
+        (or_(*[contains(f"word{i}") for i in range(50)]), "There is word50 in here", False),
+        (or_(contains("buy car"), contains("sell")), "I want to buy a Car", True),
+        (or_(contains("buy car"), contains("sell")), "I want to buy a boat", False),
+        (or_(contains("Car", case_sensitive=True), contains("nft")), "I want to buy a car", False),
+        (or_(regex("shill.*nft"), regex("^advertise"), regex("dragon")), "Where do I advertise my dragon?", True),
+        (or_(regex("shill.*nft"), regex("^advertise")), "Where do I advertise my NFT?", False),
+        (or_(regex("buy", full_match=True), regex("buy nft", full_match=True)), "buy nft", True),
+        (or_(regex(r"(a)\1"), regex("(b)")), "aa", True),
+        (or_(regex(r"(a)\1"), regex("(b)")), "ab", True),
+        (or_(regex(r"(a)\1"), regex("(c)")), "ab", False),
+        (or_(), "anything", False),
+        (and_(), "anything", True),
+        (and_(contains("buy"), and_(contains("nft"), not_(regex("sell")))), "buy NFT", True),
+        (and_(contains("buy"), and_(contains("nft"), not_(regex("sell")))), "buy NFT to sell", False),
+        (and_(contains("buy"), contains("NFT", case_sensitive=True)), "buy nft", False),
+    ]
+)
+def test_compiled_conditions(condition: BaseLogic, input: str, should_match: bool):
+    """
+    Tests the compiled text-matching condition logic.
+    """
+    assert condition.compile().check(input) == should_match, "Compiled condition failed"
+    assert condition.check(input) == should_match, "Condition failed"
+
+
+def test_compiled_conditions_modified():
+    """
+    Tests that conditions are compiled again after their operands are modified.
+    """
+    inner = or_(contains("buy"))
+    condition = and_(inner, contains("nft"))
+    assert condition.check("buy nft") and not condition.check("sell nft")
+    compiled = condition.compile()
+    assert condition.compile() is compiled  # Cached
+
+    inner.operands.append(contains("sell"))
+    assert condition.check("sell nft") and condition.compile() is not compiled
+    condition.operands[1] = contains("car")
+    assert condition.check("sell car") and not condition.check("sell nft")
+    condition.operands.pop()
+    assert condition.check("sell") and not or_().check("sell")
+
+
+def test_responder_engine_candidates():
+    """
+    Tests that the responder engine only selects responders that can match the text.
+    """
+    action = DMResponse(TextMessageData("Hello"))
+    keyword_responders = [DMResponder(contains(f"word{i}"), action) for i in range(300)]
+    regex_responder = DMResponder(regex("buy.*nft"), action)
+    multi_responder = DMResponder(and_(contains("buy cars"), not_(contains("sell"))), action)
+    sensitive_responder = DMResponder(or_(contains("Car", case_sensitive=True), contains("nft")), action)
+    engine = ResponderEngine(None)
+    for responder in [*keyword_responders, regex_responder, multi_responder, sensitive_responder]:
+        engine.add(responder)
+
+    assert engine._find_candidates(MatchInput("WORD5 and word299")) == [keyword_responders[5], keyword_responders[299]]
+    assert engine._find_candidates(MatchInput("I want to buy cars")) == [multi_responder]
+    assert engine._find_candidates(MatchInput("I want a Car")) == [sensitive_responder]
+    assert engine._find_candidates(MatchInput("buy an NFT")) == [regex_responder, sensitive_responder]
+
+    engine.remove(regex_responder)
+    assert engine._find_candidates(MatchInput("Nothing here")) == []
+
+
+def test_responder_engine_regex_candidates():
+    """
+    Tests that the responder engine selects responders with regex conditions by their merged patterns.
+    """
+    action = DMResponse(TextMessageData("Hello"))
+    regex_responders = [DMResponder(regex(f"item{i}[0-9]+"), action) for i in range(50)]
+    full_responder = DMResponder(regex("item1[0-9]+", full_match=True), action)
+    case_responder = DMResponder(regex("Item2", flags=re.MULTILINE), action)
+    backreference_responder = DMResponder(regex(r"(a+)-\1"), action)
+    or_responder = DMResponder(or_(regex("price [0-9]+"), contains("cost")), action)
+    not_responder = DMResponder(not_(regex("item")), action)
+    engine = ResponderEngine(None)
+    responders = [
+        *regex_responders, full_responder, case_responder, backreference_responder, or_responder, not_responder
+    ]
+    for responder in responders:
+        engine.add(responder)
+
+    assert not engine._unindexed - {responders.index(not_responder)}
+    assert len(engine._regexes) == 3  # Groups of flags and full_match
+    # The capturing group's pattern is searched separately of the other merged patterns
+    assert [len(merged) for merged, _, _ in engine._regexes] == [2, 1, 1]
+    assert engine._find_candidates(MatchInput("Nothing here")) == [not_responder]
+    assert engine._find_candidates(MatchInput("item15 or ITEM30")) == [
+        regex_responders[1], regex_responders[3], not_responder
+    ]
+    assert engine._find_candidates(MatchInput("item15")) == [regex_responders[1], full_responder, not_responder]
+    assert engine._find_candidates(MatchInput("item15 or Item2")) == [
+        regex_responders[1], case_responder, not_responder
+    ]
+    assert engine._find_candidates(MatchInput("aa-aa")) == [backreference_responder, not_responder]
+    assert engine._find_candidates(MatchInput("The price is 15")) == [not_responder]
+    assert engine._find_candidates(MatchInput("price 15")) == [or_responder, not_responder]
+    assert engine._find_candidates(MatchInput("What's the cost?")) == [or_responder, not_responder]
+
+    # Routing
+    routed = {responders.index(or_responder)}
+    assert engine._find_candidates(MatchInput("item15 price 1"), routed) == [or_responder]
+
+    # Candidates match the same as the conditions alone would
+    for text in ("item15 or ITEM30", "item15", "Item2", "aa-aa", "price 15 cost", "nothing"):
+        input = MatchInput(text)
+        candidates = engine._find_candidates(input)
+        assert [r for r in responders if r.condition.compile().match(input)] == [
+            r for r in candidates if r.condition.compile().match(input)
+        ]
+
+
+def test_responder_engine_routes():
+    """
+    Tests that the responder engine routes responders based on their constraints.
+    """
+    action = GuildResponse(TextMessageData("Hello"))
+    any_guild = GuildResponder(contains("nft"), action)
+    guild_1 = GuildResponder(contains("nft"), action, [GuildConstraint(1)])
+    guild_2 = GuildResponder(contains("nft"), action, [GuildConstraint(2)])
+    guild_none = GuildResponder(contains("nft"), action, [GuildConstraint(1), GuildConstraint(2)])
+    dm = DMResponder(contains("nft"), DMResponse(TextMessageData("Hello")))
+    engine = ResponderEngine(None)
+    for responder in [any_guild, guild_1, guild_2, guild_none, dm]:
+        engine.add(responder)
+
+    assert any_guild._get_routes() == {ROUTE_ANY_GUILD}
+    assert guild_1._get_routes() == {1}
+    assert guild_none._get_routes() == set()
+    assert dm._get_routes() == {ROUTE_DM}
+    assert engine._routes[1] == {1}
+    assert engine._routes[2] == {2}
+    assert engine._routes[ROUTE_ANY_GUILD] == {0}
+    assert engine._routes[ROUTE_DM] == {4}
+    assert engine._find_candidates(MatchInput("nft"), engine._routes[2] | engine._routes[ROUTE_ANY_GUILD]) == [
+        any_guild, guild_2
+    ]
+
+
+async def test_responder_engine_queue():
+    """
+    Tests that the responder engine drops duplicated responses and respects the cooldown.
+    """
+    performed = []
+
+    class RecordResponse(DMResponse):
+        async def perform(self, message):
+            performed.append(message.id)
+
+    responder = DMResponder(contains("nft"), RecordResponse(TextMessageData("Hello")), cooldown=timedelta(seconds=0.2))
+    responder.client = object()  # Mark as initialized
+    engine = ResponderEngine(None)
+    engine.add(responder)
+    engine.start()
+
+    def make_message(id_: int, author: int):
+        return SimpleNamespace(id=id_, author=SimpleNamespace(id=author), channel=SimpleNamespace(id=1))
+
+    try:
+        with engine.advertising():  # Responses are held back while advertising
+            for i in range(5):  # Only the first response to the same user is queued
+                engine._enqueue(responder, make_message(i, 1))
+
+            engine._enqueue(responder, make_message(5, 2))
+            await asyncio.sleep(0.05)
+            assert performed == []
+
+        await asyncio.sleep(0.05)
+        assert performed == [0, 5]
+
+        engine._enqueue(responder, make_message(6, 1))  # Cooldown
+        await asyncio.sleep(0.25)
+        engine._enqueue(responder, make_message(7, 1))
+        await asyncio.sleep(0.05)
+        assert performed == [0, 5, 7]
+    finally:
+        await engine.stop()
+
+
+async def test_responder_engine_yield_limit(monkeypatch: pytest.MonkeyPatch):
+    """
+    Tests that responses made while the account is constantly sending messages are still performed.
+    """
+    monkeypatch.setattr(daf.responder.engine, "RESPONSE_MAX_YIELD", 0.1)
+    performed = []
+
+    class RecordResponse(DMResponse):
+        async def perform(self, message):
+            performed.append(message.id)
+
+    responder = DMResponder(contains("nft"), RecordResponse(TextMessageData("Hello")))
+    responder.client = object()  # Mark as initialized
+    engine = ResponderEngine(None)
+    engine.add(responder)
+    engine.start()
+    try:
+        with engine.advertising():
+            message = SimpleNamespace(id=0, author=SimpleNamespace(id=1), channel=SimpleNamespace(id=1))
+            engine._enqueue(responder, message)
+            await asyncio.sleep(0.05)
+            assert performed == []  # Yields to the sends
+            await asyncio.sleep(0.1)
+            assert performed == [0]  # But not for longer than RESPONSE_MAX_YIELD
+    finally:
+        await engine.stop()
+
+
 async def test_guild_responder():
     ...  # Can't test guild responders as the second account is not joined in